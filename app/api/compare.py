@@ -1,11 +1,52 @@
-from fastapi import APIRouter
-from app.store.memory import profiles, jobs
+from fastapi import APIRouter, HTTPException, Query
+from app.store import get_store
 from app.core.scoring import score_profile_against_job
 
 router = APIRouter(prefix="/compare")
 
+# Registered before /{job_id}/{candidate_id} so "rank" is not read as a candidate id
+@router.post("/{job_id}/rank")
+def rank_candidates(
+    job_id: str,
+    top_k: int = Query(10, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    min_score: float = Query(0.0, ge=0.0, le=100.0)
+):
+    """
+    Rank every stored profile against one job.
+    Returns one page (offset, top_k) of results sorted by fit score.
+    """
+    job = get_store().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    total, ranked = get_store().rank(job, limit=offset + top_k, min_score=min_score)
+    page = ranked[offset:]
+
+    return {
+        "job_id": job_id,
+        "total": total,
+        "offset": offset,
+        "top_k": top_k,
+        "results": [score_profile_against_job(profile, job) for _, profile in page]
+    }
+
 @router.post("/{job_id}/{candidate_id}")
 def compare(job_id: str, candidate_id: str):
-    profile = profiles[candidate_id]
-    job = jobs[job_id]
+    profile, job = load_pair(job_id, candidate_id)
     return score_profile_against_job(profile, job)
+
+
+def load_pair(job_id: str, candidate_id: str):
+    """Fetch (profile, job) from the store or raise 404."""
+    store = get_store()
+
+    job = store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    profile = store.get_profile(candidate_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
+
+    return profile, job
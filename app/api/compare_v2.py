@@ -1,15 +1,20 @@
+from functools import lru_cache
 from fastapi import APIRouter
-from app.store.memory import profiles, jobs
+from starlette.concurrency import run_in_threadpool
+from app.api.compare import load_pair
 from app.core.evaluator import Phase2Evaluator
 
 router = APIRouter(prefix="/compare_v2")
 
-evaluator = Phase2Evaluator()
+
+@lru_cache(maxsize=None)
+def get_evaluator() -> Phase2Evaluator:
+    """Built on first use rather than at import, keeping worker start-up light."""
+    return Phase2Evaluator()
 
 
 @router.post("/{job_id}/{candidate_id}")
-def compare_v2(job_id: str, candidate_id: str):
-    return evaluator.evaluate(
-        profiles[candidate_id],
-        jobs[job_id]
-    )
+async def compare_v2(job_id: str, candidate_id: str):
+    # Store reads are blocking (sqlite): keep them off the event loop
+    profile, job = await run_in_threadpool(load_pair, job_id, candidate_id)
+    return await get_evaluator().aevaluate(profile, job)
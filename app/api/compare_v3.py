@@ -82,10 +82,19 @@
 
 # app/api/compare_v3.py
 
-from fastapi import APIRouter, HTTPException
+import json
+
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from app.core.alignment import compute_alignment
 from app.core.prompts.alignment_prompts import ALIGNMENT_QA_PROMPT
-from app.core.llm_client import GeminiClient
+from app.core.llm_backend import get_llm_backend
+from app.core.prompt_budget import prompt_site
+from app.core.rate_limit import INTERACTIVE, llm_priority
+from app.api.compare import load_pair
+from app.store import get_store
 
 router = APIRouter(prefix="/compare_v3")
 
@@ -124,29 +133,11 @@ def normalize_resume_skills(raw_skills):
 # API endpoint
 # -----------------------------
 
-@router.post("/{job_id}/{candidate_id}/ask")
-def ask_alignment_question(
-    job_id: str,
-    candidate_id: str,
-    question: str
-):
-    """
-    Answer alignment-related questions such as:
-    - What skills am I missing?
-    - How does my experience align with the job?
-    """
-
-    # 🔹 Load stored data (in-memory for now)
-    from app.store.memory import jobs, profiles, transferable_store
-
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-
-    if candidate_id not in profiles:
-        raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
+def build_alignment_context(job_id: str, candidate_id: str) -> dict:
+    """Deterministic alignment facts for a stored (job, candidate) pair."""
 
-    job = jobs[job_id]
-    profile = profiles[candidate_id]
+    # 🔹 Load stored data
+    profile, job = load_pair(job_id, candidate_id)
 
     # -----------------------------
     # Build resume data for alignment
@@ -174,36 +165,102 @@ def ask_alignment_question(
     # Transferable skills (Phase 2 output)
     # -----------------------------
 
-    transferable_skills = transferable_store.get(
-        (candidate_id, job_id),
-        []
-    )
+    transferable_skills = get_store().get_transferable(candidate_id, job_id)
 
     # -----------------------------
     # Step 1: Compute alignment facts
     # -----------------------------
 
-    alignment_context = compute_alignment(
+    return compute_alignment(
         resume=resume_data,
         job=job_data,
         transferable_skills=transferable_skills
     )
 
+
+@router.post("/{job_id}/{candidate_id}/ask")
+async def ask_alignment_question(
+    job_id: str,
+    candidate_id: str,
+    question: str
+):
+    """
+    Answer alignment-related questions such as:
+    - What skills am I missing?
+    - How does my experience align with the job?
+    """
+
+    # Store reads are blocking (sqlite): keep them off the event loop
+    alignment_context = await run_in_threadpool(build_alignment_context, job_id, candidate_id)
+
     # -----------------------------
     # Step 2: Explain using LLM
     # -----------------------------
 
-    llm = GeminiClient()
+    llm = get_llm_backend()
 
     prompt = ALIGNMENT_QA_PROMPT.format(
         alignment_context=alignment_context,
         question=question
     )
 
-    answer = llm.generate(prompt)
+    # A user is waiting on this answer: served ahead of extraction/batch calls
+    with llm_priority(INTERACTIVE), prompt_site("alignment.ask"):
+        answer = await llm.agenerate(prompt)
 
     return {
         "question": question,
         "answer": answer,
         "alignment_context": alignment_context
     }
+
+
+@router.post("/{job_id}/{candidate_id}/ask/stream")
+async def ask_alignment_question_stream(
+    job_id: str,
+    candidate_id: str,
+    question: str
+):
+    """
+    Streaming variant of /ask as Server-Sent Events:
+    - `context`: the alignment facts, sent before the LLM is called
+    - `token`:   answer chunks as they are generated
+    - `done`:    the full answer (or `error` if generation failed)
+    """
+
+    # Computed before the stream starts, so a missing pair is still a 404
+    alignment_context = await run_in_threadpool(build_alignment_context, job_id, candidate_id)
+    prompt = ALIGNMENT_QA_PROMPT.format(
+        alignment_context=alignment_context,
+        question=question
+    )
+    llm = get_llm_backend()
+
+    async def events():
+        yield _sse("context", {
+            "question": question,
+            "alignment_context": jsonable_encoder(alignment_context),
+        })
+
+        chunks = []
+        try:
+            with llm_priority(INTERACTIVE), prompt_site("alignment.ask_stream"):
+                async for chunk in llm.agenerate_stream(prompt):
+                    chunks.append(chunk)
+                    yield _sse("token", {"text": chunk})
+        except Exception as e:
+            print(f"❌ Streaming answer failed: {e}")
+            yield _sse("error", {"detail": str(e)})
+            return
+
+        yield _sse("done", {"answer": "".join(chunks)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
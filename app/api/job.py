@@ -1,14 +1,14 @@
 from fastapi import APIRouter
 from app.core.models import JobRequirement
-from app.store.memory import jobs
+from app.store import get_store
 
 router = APIRouter(prefix="/jobs")
 
 @router.post("/")
 def create_job(job: JobRequirement):
-    jobs[job.job_id] = job
+    get_store().save_job(job)
     return {"status": "stored", "job_id": job.job_id}
 
 @router.get("/")
 def list_jobs():
-    return list(jobs.values())
+    return get_store().list_jobs()
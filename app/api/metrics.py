@@ -0,0 +1,54 @@
+from fastapi import APIRouter
+from app.api.compare_v2 import get_evaluator
+from app.core.llm_client import response_cache, llm_flights, client_health
+from app.core.rate_limit import llm_scheduler
+from app.core.ingestion_pool import get_ingestion_pool
+from app.core.pre_extraction import pre_extraction_stats
+from app.core.prompt_budget import prompt_ledger
+from app.pipelines.bulk import get_ingestion_queue
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/llm")
+def llm_metrics():
+    """Cache, request-coalescing, rate-limit/retry, pre-extraction and prompt-size counters for LLM-backed calls."""
+    engine = get_evaluator().transfer_engine
+    return {
+        "response_cache": response_cache.info(),
+        "generate_single_flight": llm_flights.stats(),
+        "scheduler": llm_scheduler.stats(),
+        "pre_extraction": pre_extraction_stats.stats(),
+        "prompts": prompt_ledger.stats(),
+        "transferable": {
+            "inference_cache": engine.cache.info(),
+            "single_flight": engine.flights.stats(),
+        },
+    }
+
+
+@router.get("/llm/health")
+def llm_health(ping: bool = False):
+    """
+    Health of every pooled LLM client. Passive by default (derived from
+    recent calls); ping=true also makes a cheap round-trip per client.
+    """
+    clients = client_health(ping=ping)
+    statuses = {c["status"] for c in clients}
+    if "unhealthy" in statuses:
+        overall = "unhealthy"
+    elif "degraded" in statuses:
+        overall = "degraded"
+    else:
+        overall = "ok"
+    return {"status": overall, "clients": clients}
+
+
+@router.get("/ingestion")
+def ingestion_metrics():
+    """Text-extraction process pool and bulk ingestion queue counters."""
+    pool = get_ingestion_pool()
+    return {
+        "process_pool": pool.stats() if pool is not None else None,
+        "bulk_queue": get_ingestion_queue().stats(),
+    }
@@ -13,87 +13,122 @@
 
 # api/resume.py
 
-from fastapi import APIRouter, UploadFile, File
-import tempfile
+from pathlib import Path
+from typing import List
+
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from starlette.concurrency import run_in_threadpool
 import shutil
-import uuid
 
-from app.pipelines.resume_pipeline import ResumeExtractionPipeline
-from app.core.llm_client import GeminiClient
-from app.core.models import ProfessionalProfile, Skill, Experience
-from app.store.memory import profiles
+from app.pipelines.resume_pipeline import ResumeExtractionPipeline, resume_to_profile
+from app.pipelines.bulk import StagingDiskFull, get_ingestion_queue, stage_uploads
+from app.core.llm_backend import get_llm_backend
+from app.store import get_store
 
 router = APIRouter()
 
 
 @router.post("/resume/extract")
-def extract_resume(file: UploadFile = File(...)):
+async def extract_resume(file: UploadFile = File(...)):
     """
     Upload a resume (PDF/DOCX) and return structured resume JSON.
     """
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file.filename) as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = tmp.name
-
-    llm = GeminiClient()
+    llm = get_llm_backend()
     pipeline = ResumeExtractionPipeline(llm)
 
-    # Extract structured data
-    result = pipeline.run(tmp_path)
-    
+    # Extract structured data straight from the upload buffer (Starlette keeps
+    # it in memory up to 1 MB and spools larger files to an unnamed temp file)
+    try:
+        result = await pipeline.arun(file.file, suffix=Path(file.filename or "").suffix)
+    finally:
+        await file.close()
+
     # Convert to ProfessionalProfile format
-    candidate_id = f"candidate_{uuid.uuid4().hex[:8]}"
-    
-    # Convert skills
-    skills = []
-    for skill_name in result.skills.programming + result.skills.ml + result.skills.tools:
-        skills.append(Skill(name=skill_name, level="intermediate"))  # Default level
-    
-    # Convert experience
-    experiences = []
-    for exp in result.experience:
-        # Calculate duration years from start/end dates
-        duration_years = None
-        try:
-            if exp.start_date and exp.end_date:
-                # Simple year calculation - could be improved
-                start_year = int(exp.start_date.split('/')[-1]) if '/' in exp.start_date else 0
-                if exp.end_date.lower() == 'current':
-                    import datetime
-                    end_year = datetime.datetime.now().year
-                else:
-                    end_year = int(exp.end_date.split('/')[-1]) if '/' in exp.end_date else 0
-                duration_years = max(0, end_year - start_year)
-        except:
-            pass
-        
-        experiences.append(Experience(
-            title=exp.role or "Unknown Role",
-            company=exp.company or "Unknown Company",
-            duration_years=duration_years,
-            skills_used=exp.tech_stack or [],
-            description="; ".join(exp.responsibilities[:3]) if exp.responsibilities else ""
-        ))
-    
-    # Create profile
-    profile = ProfessionalProfile(
-        candidate_id=candidate_id,
-        name=result.personal.name or "Unknown Name",
-        email=result.personal.email or "",
-        phone=result.personal.phone or "",
-        title=result.experience[0].role if result.experience and result.experience[0].role else "Professional",
-        total_experience_years=len(result.experience),  # Simple count as placeholder
-        skills=skills,
-        experiences=experiences,
-        summary=result.personal.location or ""  # Using location as summary for now
-    )
-    
-    # Store in memory
-    profiles[candidate_id] = profile
+    profile = resume_to_profile(result)
+    candidate_id = profile.candidate_id
+
+    # Persist via the configured store (blocking for sqlite: off the event loop)
+    await run_in_threadpool(get_store().save_profile, profile)
     
     return {
         "candidate_id": candidate_id,
         "profile": profile.dict(),
         "extracted_data": result.dict()
     }
+
+
+# -----------------------------
+# Bulk ingestion
+# -----------------------------
+
+@router.post("/resume/bulk", status_code=202)
+async def bulk_ingest(files: List[UploadFile] = File(...)):
+    """
+    Upload many resumes at once (PDF/DOCX files and/or zip archives of
+    them). Files are processed in the background; poll the batch status.
+    """
+
+    try:
+        staging_dir, staged, skipped = await run_in_threadpool(
+            stage_uploads, [(f.filename or "", f.file) for f in files]
+        )
+    except StagingDiskFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "60"})
+    if not staged:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "No PDF/DOCX resumes found in upload", "skipped": skipped}
+        )
+
+    batch = get_ingestion_queue().submit(staged, staging_dir, skipped)
+    return {
+        "batch_id": batch.batch_id,
+        "total": len(staged),
+        "skipped": skipped,
+        "status_url": f"/resume/bulk/{batch.batch_id}",
+        "results_url": f"/resume/bulk/{batch.batch_id}/results",
+    }
+
+
+@router.get("/resume/bulk/{batch_id}")
+def bulk_status(batch_id: str):
+    """Progress of a bulk batch: counts per status, throughput, elapsed time."""
+    return _get_batch(batch_id).progress()
+
+
+@router.get("/resume/bulk/{batch_id}/results")
+def bulk_results(batch_id: str, offset: int = 0, limit: int = 100, status: str | None = None):
+    """
+    Per-file results of a batch (paginated). Finished files carry their
+    stored profile and extracted data; failed ones their error.
+    """
+    batch = _get_batch(batch_id)
+    items = [i for i in batch.items if status is None or i.status == status]
+    page = items[max(offset, 0):max(offset, 0) + max(limit, 0)]
+
+    store = get_store()
+    results = []
+    for item in page:
+        result = item.as_dict()
+        if item.status == "done":
+            profile = store.get_profile(item.candidate_id)
+            result["profile"] = profile.model_dump() if profile else None
+            result["extracted_data"] = item.extracted
+        results.append(result)
+
+    return {
+        "batch_id": batch_id,
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "results": results,
+    }
+
+
+def _get_batch(batch_id: str):
+    batch = get_ingestion_queue().get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return batch
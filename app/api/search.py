@@ -0,0 +1,30 @@
+from typing import List
+from fastapi import APIRouter, Query
+from app.store import get_store
+
+router = APIRouter(prefix="/search")
+
+
+# ?all=python&all=sql&any=aws&any=gcp&none=java
+# -> has python AND sql AND (aws OR gcp) AND NOT java
+
+@router.get("/candidates")
+def search_candidates(
+    all_of: List[str] = Query([], alias="all"),
+    any_of: List[str] = Query([], alias="any"),
+    none_of: List[str] = Query([], alias="none")
+):
+    """Candidate ids matching a boolean skill filter (AND / OR / NOT)."""
+    ids = get_store().search_candidates(all_of=all_of, any_of=any_of, none_of=none_of)
+    return {"count": len(ids), "candidate_ids": sorted(ids)}
+
+
+@router.get("/jobs")
+def search_jobs(
+    all_of: List[str] = Query([], alias="all"),
+    any_of: List[str] = Query([], alias="any"),
+    none_of: List[str] = Query([], alias="none")
+):
+    """Job ids whose required/preferred skills match a boolean skill filter."""
+    ids = get_store().search_jobs(all_of=all_of, any_of=any_of, none_of=none_of)
+    return {"count": len(ids), "job_ids": sorted(ids)}
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+_MISSING = object()
+
+
+def make_cache_key(model_name: str, generation_config: Dict, prompt: str) -> str:
+    """
+    Content-addressed key for an LLM call: sha256 over
+    (model name, generation config, prompt).
+    """
+    payload = json.dumps(
+        [model_name, generation_config, prompt],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Counters
+# -----------------------------
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# -----------------------------
+# In-memory tier
+# -----------------------------
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with optional TTL and size-based eviction.
+
+    max_entries bounds the number of items; max_bytes (when set) bounds the
+    sum of sizeof(value) across items.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = lambda value: len(value),
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._items.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            self._items.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value) -> None:
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "tier": "memory",
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            **self.stats.as_dict(),
+        }
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._items.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._items and (
+            len(self._items) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._items.popitem(last=False)
+            self._bytes -= size
+            self.stats.evictions += 1
+
+
+# -----------------------------
+# On-disk tier
+# -----------------------------
+
+class SqliteCache:
+    """
+    Persistent string cache backed by a single sqlite file.
+    Survives restarts; entries older than ttl are treated as misses.
+    Oldest entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: Optional[float] = None,
+        max_entries: int = 100_000,
+    ):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache(created_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats.misses += 1
+                return default
+
+            value, created_at = row
+            if self.ttl and created_at + self.ttl <= time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    " SELECT key FROM llm_cache ORDER BY created_at LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "tier": "sqlite",
+            "path": self.path,
+            "entries": len(self),
+            **self.stats.as_dict(),
+        }
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+# -----------------------------
+# Tiered cache (memory → disk)
+# -----------------------------
+
+class TieredCache:
+    """
+    Reads check memory first, then disk (promoting disk hits into memory).
+    Writes go to every tier.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SqliteCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                return value
+
+        return default
+
+    def set(self, key: str, value) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def info(self) -> Dict[str, Any]:
+        tiers = [self.memory.info()]
+        if self.disk is not None:
+            tiers.append(self.disk.info())
+        return {"tiers": tiers}
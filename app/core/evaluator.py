@@ -1,7 +1,14 @@
-from app.core.models import ProfessionalProfile, JobRequirement
+import asyncio
+from typing import List
+from app.core.models import ProfessionalProfile, JobRequirement, MatchResult
 from app.core.scoring import score_profile_against_job
 from app.core.transferable import TransferableSkillEngine
-from app.core.reasoning_models import MatchSummary, ReasoningTrace, ExperienceAlignment
+from app.core.reasoning_models import (
+    MatchSummary,
+    ReasoningTrace,
+    ExperienceAlignment,
+    TransferableSkillInference,
+)
 
 
 class Phase2Evaluator:
@@ -21,7 +28,6 @@ class Phase2Evaluator:
         print("📊 Step 1: Calculating baseline score...")
         baseline = score_profile_against_job(profile, job)
         print(f"✅ Baseline score: {baseline.fit_score}%")
-        already_matched = set(s.lower() for s in baseline.breakdown.exact_skill_matches)
 
         print(f"🧠 Step 2: Inferring transferable skills...")
         print(f"   Candidate skills: {[s.name for s in profile.skills]}")
@@ -31,6 +37,39 @@ class Phase2Evaluator:
             candidate_skills=[s.name for s in profile.skills],
             job_skills=job.required_skills
         )
+        result = self._summarize(profile, job, baseline, transferable)
+        self._save_transferable(result)
+        return result
+
+    async def aevaluate(
+        self,
+        profile: ProfessionalProfile,
+        job: JobRequirement
+    ) -> MatchSummary:
+        """Same as evaluate(), awaiting the transferable-skill LLM call."""
+
+        print(f"🚀 Starting Phase 2 evaluation for candidate: {profile.candidate_id}, job: {job.job_id}")
+        baseline = score_profile_against_job(profile, job)
+        print(f"✅ Baseline score: {baseline.fit_score}%")
+
+        transferable = await self.transfer_engine.ainfer(
+            candidate_skills=[s.name for s in profile.skills],
+            job_skills=job.required_skills
+        )
+        result = self._summarize(profile, job, baseline, transferable)
+        # The store may be sqlite: write off the event loop
+        await asyncio.to_thread(self._save_transferable, result)
+        return result
+
+    def _summarize(
+        self,
+        profile: ProfessionalProfile,
+        job: JobRequirement,
+        baseline: MatchResult,
+        transferable: List[TransferableSkillInference]
+    ) -> MatchSummary:
+        already_matched = set(s.lower() for s in baseline.breakdown.exact_skill_matches)
+
         # Filter out transferable skills that are the same as required skills
         original_count = len(transferable)
         # transferable = [
@@ -73,9 +112,11 @@ class Phase2Evaluator:
         )
         
         print(f"🎉 Phase 2 evaluation complete! Final score: {result.fit_score}%")
-        
-        # Store transferable skills for later use in compare_v3
-        from app.store.memory import transferable_store
-        transferable_store[(profile.candidate_id, job.job_id)] = transferable
-        
         return result
+
+    def _save_transferable(self, result: MatchSummary) -> None:
+        """Store transferable skills for later use in compare_v3."""
+        from app.store import get_store
+        get_store().save_transferable(
+            result.candidate_id, result.job_id, result.reasoning.transferable_inferences
+        )
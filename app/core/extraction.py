@@ -1,142 +1,448 @@
-from typing import Dict
-import json
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional, Tuple
+import time
+from app.core.json_stream import salvage_json
+from app.core.pre_extraction import PreExtraction, fill_experience_dates, merge_sections
+from app.core.prompt_budget import estimate_tokens, fit_extraction_input, prompt_site
 from app.core.prompts.resume_prompts import (
     PERSONAL_PROMPT,
     EXPERIENCE_PROMPT,
     EDUCATION_PROMPT,
     SKILLS_PROMPT,
+    personal_prompt,
+)
+from app.core.rate_limit import llm_deadline
+from app.core.segmentation import HEADER_SECTION, split_roles
+
+
+# Seconds each section's extraction may take once it starts (concurrent
+# paths); calls still running then are stopped, not just abandoned
+SECTION_TIMEOUT = float(os.getenv("EXTRACTION_SECTION_TIMEOUT", "60"))
+
+# Fill personal fields and missing role dates by rules, asking the LLM only
+# for what they miss (EXTRACTION_RULES=0 sends the whole resume, as before)
+EXTRACTION_RULES = os.getenv("EXTRACTION_RULES", "1") not in ("0", "false", "no")
+
+# Largest experience answer (estimated tokens) asked for in one call. A
+# section whose answer could grow past it is split at role boundaries and
+# extracted in parallel, so no answer nears max_output_tokens (0: one call)
+EXPERIENCE_ANSWER_TOKENS = int(os.getenv("EXTRACTION_ANSWER_TOKENS", "2048"))
+
+# The experience JSON restates every line of its roles with keys and
+# quotes: about 1.7x the input's tokens. 2 errs high.
+ANSWER_TOKENS_PER_INPUT_TOKEN = 2
+
+# Shared, bounded pool so concurrent uploads cannot spawn unbounded threads
+_extraction_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("EXTRACTION_MAX_WORKERS", "16")),
+    thread_name_prefix="extraction",
 )
 
 
 def extract_resume_structured(
     sections: Dict[str, str],
-    llm_client
+    llm_client,
+    concurrent: bool = True,
+    section_timeout: float | None = SECTION_TIMEOUT
 ) -> Dict:
     """
     Extract structured resume data from segmented sections using LLM.
 
+    With concurrent=True the four section prompts are fanned out to a
+    thread pool, so latency is roughly that of the slowest call. Every
+    section (each piece of a split one) must finish within
+    section_timeout seconds of a pool worker picking it up, or falls back
+    to its empty default (keeping the pieces it finished). Its LLM calls
+    run under the same llm_deadline, so the client stops them then and
+    their pool threads are freed.
+
+    Personal fields that rules can find (see pre_extraction) are filled
+    without the LLM, which only sees the header region for the rest.
+
     Returns raw (unvalidated) JSON-compatible dict.
     """
 
+    pre = _pre_extract(sections)
+    jobs = _section_jobs(sections, pre)
+
+    if not concurrent:
+        extracted = {}
+        for name, (prompt, text, default) in jobs.items():
+            pieces, changed = _fit_input(name, prompt, text)
+            extracted[name] = _merge_pieces(name, [
+                _parse_json_response(_extract_piece(llm_client, name, prompt, piece, changed), default)
+                for piece in pieces
+            ], default)
+        return _complete(extracted, sections, pre)
+
+    # Each worker runs in a copy of the caller's context (e.g. its LLM priority);
+    # a section over the prompt budget is one call per piece
+    futures = {}
+    for name, (prompt, text, _) in jobs.items():
+        pieces, changed = _fit_input(name, prompt, text)
+        futures[name] = []
+        for piece in pieces:
+            clock = _PieceClock(section_timeout)
+            future = _extraction_pool.submit(
+                contextvars.copy_context().run,
+                clock.run, _extract_piece, llm_client, name, prompt, piece, changed
+            )
+            futures[name].append((future, clock))
+
     extracted = {}
+    for name, pieces in futures.items():
+        default = jobs[name][2]
+        results = []
+        for future, clock in pieces:
+            # Time spent queued behind other uploads' calls does not count
+            clock.started.wait()
+            try:
+                raw = future.result(timeout=clock.time_left())
+            except Exception as e:
+                # The client gives up at the deadline too: its error is a timeout here
+                if not isinstance(e, FutureTimeout) and not clock.expired():
+                    raise
+                print(f"⏱️ {name} extraction timed out after {section_timeout}s, using default")
+                continue
+            results.append(_parse_json_response(raw, default))
 
-    # Personal info is often spread across entire resume
-    personal_raw = llm_client.extract(
-        prompt=PERSONAL_PROMPT,
-        input_text=_merge_sections(sections)
-    )
-    extracted["personal"] = _parse_json_response(personal_raw, {})
+        extracted[name] = _merge_pieces(name, results, default)
 
-    experience_raw = llm_client.extract(
-        prompt=EXPERIENCE_PROMPT,
-        input_text=sections.get("experience", "")
-    )
-    extracted["experience"] = _parse_json_response(experience_raw, [])
+    return _complete(extracted, sections, pre)
 
-    education_raw = llm_client.extract(
-        prompt=EDUCATION_PROMPT,
-        input_text=sections.get("education", "")
-    )
-    extracted["education"] = _parse_json_response(education_raw, [])
 
-    skills_raw = llm_client.extract(
-        prompt=SKILLS_PROMPT,
-        input_text=sections.get("skills", "")
-    )
-    extracted["skills"] = _parse_json_response(skills_raw, {})
+async def aextract_resume_structured(
+    sections: Dict[str, str],
+    llm_client,
+    section_timeout: float | None = SECTION_TIMEOUT
+) -> Dict:
+    """
+    asyncio variant of extract_resume_structured: the four section prompts
+    run concurrently on the event loop via llm_client.aextract.
+    """
 
-    return extracted
+    pre = _pre_extract(sections)
+    jobs = _section_jobs(sections, pre)
 
+    results = await asyncio.gather(*(
+        _aextract_section(llm_client, name, prompt, text, default, section_timeout)
+        for name, (prompt, text, default) in jobs.items()
+    ))
+    return _complete(dict(zip(jobs, results)), sections, pre)
 
-def _parse_json_response(response: str, default):
-    """Parse JSON response from LLM, with fallback to default."""
+
+class IncrementalExtraction:
+    """
+    aextract_resume_structured() for sections that close one at a time
+    (see segmentation.IncrementalSegmenter).
+
+    section_closed() starts the LLM call for a section right away, and the
+    personal call (for fields the rules missed) as soon as the header
+    region above the first section closes; without rules the personal
+    prompt needs the whole resume, so it waits for finish().
+    finish() takes the final sections and reuses every early call whose
+    input still matches, restarting the rest (a header seen twice, or the
+    single-block fallback), so the result equals the batch path's.
+    Must be used from within a running event loop.
+    """
+
+    # Section -> output key whose input is that section alone
+    EARLY_SECTIONS = {
+        HEADER_SECTION: "personal",
+        "experience": "experience",
+        "education": "education",
+        "skills": "skills",
+    }
+
+    def __init__(self, llm_client, section_timeout: float | None = SECTION_TIMEOUT):
+        self.llm = llm_client
+        self.section_timeout = section_timeout
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._inputs: Dict[str, str] = {}
+        self.started_early = 0
+        self.restarted = 0
+
+    def section_closed(self, name: str, text: str) -> None:
+        key = self.EARLY_SECTIONS.get(name)
+        if key is None or (key == "personal" and not EXTRACTION_RULES):
+            return
+        job = _section_jobs({name: text}).get(key)
+        if job is None:
+            # The rules found every personal field
+            return
+        if key in self._tasks:
+            if self._inputs[key] == job[1]:
+                return
+            self._tasks[key].cancel()
+            self.restarted += 1
+        self.started_early += 1
+        self._start(key, job)
+
+    async def finish(self, sections: Dict[str, str]) -> Dict:
+        pre = _pre_extract(sections)
+        jobs = _section_jobs(sections, pre)
+        for name in set(self._tasks) - set(jobs):
+            self._tasks.pop(name).cancel()
+            self.restarted += 1
+        for name, job in jobs.items():
+            task = self._tasks.get(name)
+            if task is not None and self._inputs[name] == job[1]:
+                continue
+            if task is not None:
+                task.cancel()
+                self.restarted += 1
+            self._start(name, job)
+
+        results = await asyncio.gather(*(self._tasks[name] for name in jobs))
+        return _complete(dict(zip(jobs, results)), sections, pre)
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+
+    def _start(self, name: str, job: tuple) -> None:
+        prompt, text, default = job
+        self._inputs[name] = text
+        self._tasks[name] = asyncio.ensure_future(
+            _aextract_section(self.llm, name, prompt, text, default, self.section_timeout)
+        )
+
+
+async def _aextract_section(llm_client, name: str, prompt: str, text: str, default, section_timeout):
+    pieces, changed = _fit_input(name, prompt, text)
+    tasks = [
+        asyncio.ensure_future(_aextract_piece(llm_client, name, prompt, piece, changed))
+        for piece in pieces
+    ]
     try:
-        # Clean response - remove markdown code blocks if present
-        cleaned = response.strip()
-        if cleaned.startswith('```json'):
-            cleaned = cleaned[7:]  # Remove ```json
-        if cleaned.startswith('```'):
-            cleaned = cleaned[3:]   # Remove ```
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]  # Remove trailing ```
-        cleaned = cleaned.strip()
-        
-        # Try to parse JSON
-        return json.loads(cleaned)
-    except Exception as e:
-        print(f"⚠️ Failed to parse JSON response: {e}")
-        print(f"   Raw response: {response[:200]}...")
-        
-        # Try to repair incomplete JSON
-        try:
-            return _repair_json(cleaned, default)
-        except:
-            return default
-
-
-def _repair_json(json_str: str, default):
-    """Attempt to repair incomplete JSON."""
-    print(f"🔧 Raw truncated response: {json_str[:200]}...")
-    
-    # If it's clearly truncated, return default
-    if '...' in json_str or json_str.rstrip().endswith('[') or json_str.rstrip().endswith('{'):
-        print("🔧 Response appears truncated, using default")
+        done, pending = await asyncio.wait(tasks, timeout=section_timeout)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if pending:
+        kept = "using default" if not done else f"keeping {len(done)} of {len(tasks)} pieces"
+        print(f"⏱️ {name} extraction timed out after {section_timeout}s, {kept}")
+    return _merge_pieces(name, [
+        _parse_json_response(task.result(), default) for task in tasks if task in done
+    ], default)
+
+
+def _fit_input(name: str, prompt: str, text: str) -> Tuple[List[str], bool]:
+    """
+    Pieces of a section's input, one LLM call each. Experience whose
+    answer could outgrow EXPERIENCE_ANSWER_TOKENS is split into groups of
+    whole roles, as few as keep each answer within it. Every piece fits
+    PROMPT_TOKEN_BUDGET: personal info sits at the top of a resume, so its
+    input is trimmed; other sections are split further.
+    """
+    trim = name == "personal"
+    units = [text]
+    if name == "experience" and 0 < EXPERIENCE_ANSWER_TOKENS < _answer_tokens(text):
+        roles = split_roles(text)
+        units = _group_roles(roles)
+
+    pieces: List[str] = []
+    changed = len(units) > 1
+    for unit in units:
+        unit_pieces, unit_changed = fit_extraction_input(prompt, unit, trim=trim)
+        pieces.extend(unit_pieces)
+        changed = changed or unit_changed
+
+    if len(units) > 1:
+        print(f"👥 {name} split into {len(roles)} roles over {len(pieces)} calls")
+    elif changed:
+        action = "trimmed" if trim else f"split into {len(pieces)} calls"
+        print(f"✂️ {name} input {action} to fit the prompt token budget")
+    return pieces, changed
+
+
+def _answer_tokens(text: str) -> int:
+    return estimate_tokens(text) * ANSWER_TOKENS_PER_INPUT_TOKEN
+
+
+def _group_roles(roles: List[str]) -> List[str]:
+    """Consecutive roles packed into groups whose answers stay within EXPERIENCE_ANSWER_TOKENS."""
+    groups: List[List[str]] = []
+    used = 0
+    for role in roles:
+        cost = _answer_tokens(role)
+        if not groups or used + cost > EXPERIENCE_ANSWER_TOKENS:
+            groups.append([])
+            used = 0
+        groups[-1].append(role)
+        used += cost
+    return ["\n\n".join(group) for group in groups]
+
+
+class _PieceClock:
+    """
+    A queued piece's deadline, which starts when a pool worker picks it
+    up: under load, waiting for a worker is not the model timing out.
+    """
+
+    def __init__(self, timeout: float | None):
+        self.timeout = timeout
+        self.deadline: float | None = None
+        self.started = threading.Event()
+
+    def run(self, fn, *args):
+        """Run fn(*args, deadline) in the worker, starting the clock."""
+        if self.timeout is not None:
+            self.deadline = time.monotonic() + self.timeout
+        self.started.set()
+        return fn(*args, self.deadline)
+
+    def time_left(self) -> float | None:
+        return None if self.deadline is None else max(self.deadline - time.monotonic(), 0)
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+def _extract_piece(llm_client, name: str, prompt: str, text: str, changed: bool, deadline: float | None = None) -> str:
+    with _prompt_site(name, changed), llm_deadline(deadline):
+        return llm_client.extract(prompt=prompt, input_text=text)
+
+
+async def _aextract_piece(llm_client, name: str, prompt: str, text: str, changed: bool) -> str:
+    with _prompt_site(name, changed):
+        return await llm_client.aextract(prompt=prompt, input_text=text)
+
+
+def _prompt_site(name: str, changed: bool):
+    """Ledger site for one section's calls; the backend records them if the model runs."""
+    trimmed = changed and name == "personal"
+    return prompt_site(f"resume.{name}", trimmed=trimmed, chunked=changed and not trimmed)
+
+
+def _merge_pieces(name: str, results: list, default):
+    """
+    One section's answer from the answers for its pieces: lists are
+    concatenated, dicts merged key by key; identical list items are kept
+    once, and experience entries for the same role are combined.
+    """
+    if len(results) == 1:
+        return results[0]
+    if not results:
         return default
-    
-    # Fix incomplete strings - look for unclosed quotes
-    lines = json_str.split('\n')
-    repaired_lines = []
-    for line_num, line in enumerate(lines):
-        # Skip lines that are clearly truncated
-        if '...' in line or line.rstrip().endswith('...'):
-            print(f"🔧 Skipping truncated line {line_num}: {line[:50]}...")
+    if name == "experience":
+        return _merge_roles(results)
+    if isinstance(default, list):
+        items = []
+        for result in results:
+            if isinstance(result, list):
+                _extend_unique(items, result)
+        return items
+
+    merged: Dict = {}
+    for result in results:
+        if not isinstance(result, dict):
             continue
-            
-        # Count quotes to detect unclosed strings
-        quote_count = line.count('"')
-        if quote_count % 2 != 0:  # Odd number = unclosed quote
-            # Find the last quote and close the string properly
-            last_quote_pos = line.rfind('"')
-            if last_quote_pos != -1:
-                # Close the string and remove any trailing comma
-                before_quote = line[:last_quote_pos + 1]
-                after_quote = line[last_quote_pos + 1:].rstrip().rstrip(',')
-                line = before_quote + after_quote
-                print(f"🔧 Fixed unclosed quote in line {line_num}")
-        
-        # Remove trailing commas from incomplete lines
-        if line.strip().endswith(','):
-            line = line.rstrip(',')
-            
-        repaired_lines.append(line)
-    
-    repaired = '\n'.join(repaired_lines)
-    
-    # Ensure array/object is closed properly
-    open_brackets = repaired.count('[') - repaired.count(']')
-    open_braces = repaired.count('{') - repaired.count('}')
-    
-    if open_brackets > 0:
-        repaired += ']' * open_brackets
-        print(f"🔧 Added {open_brackets} closing brackets")
-    if open_braces > 0:
-        repaired += '}' * open_braces
-        print(f"🔧 Added {open_braces} closing braces")
-    
-    try:
-        result = json.loads(repaired)
-        print(f"✅ Successfully repaired JSON")
-        return result
-    except Exception as e:
-        print(f"🔧 JSON repair failed: {e}")
-        print(f"🔧 Final repaired string: {repaired[:200]}...")
-        return default
+        for key, value in result.items():
+            if isinstance(value, list):
+                _extend_unique(merged.setdefault(key, []), value)
+            elif merged.get(key) in (None, ""):
+                merged[key] = value
+    return merged
+
+
+def _merge_roles(results: list) -> List[Dict]:
+    """
+    Experience entries from every piece, in order. Entries with the same
+    company and role and no conflicting dates (e.g. one role whose
+    bullets were split across pieces) become one.
+    """
+    roles: List[Dict] = []
+    for result in results:
+        if not isinstance(result, list):
+            continue
+        for entry in result:
+            if not isinstance(entry, dict):
+                continue
+            same = next((kept for kept in roles if _same_role(kept, entry)), None)
+            if same is None:
+                roles.append(dict(entry))
+                continue
+            for key, value in entry.items():
+                if isinstance(value, list) and isinstance(same.get(key), list):
+                    _extend_unique(same[key], value)
+                elif not same.get(key):
+                    same[key] = value
+    return roles
+
+
+def _same_role(a: Dict, b: Dict) -> bool:
+    def norm(value) -> str:
+        return " ".join(str(value).lower().split()) if value else ""
+
+    if not (norm(a.get("company")) or norm(a.get("role"))):
+        return False
+    for key in ("company", "role"):
+        if norm(a.get(key)) != norm(b.get(key)):
+            return False
+    for key in ("start_date", "end_date"):
+        if a.get(key) and b.get(key) and norm(a[key]) != norm(b[key]):
+            return False
+    return True
+
+
+def _extend_unique(items: list, values: list) -> None:
+    for value in values:
+        if value not in items:
+            items.append(value)
+
+
+def _pre_extract(sections: Dict[str, str]) -> Optional[PreExtraction]:
+    return PreExtraction(sections) if EXTRACTION_RULES else None
+
+
+def _section_jobs(sections: Dict[str, str], pre: Optional[PreExtraction] = None) -> Dict[str, tuple]:
+    """
+    Map each output key to (prompt, input_text, default). With rules on,
+    personal asks only for the fields they missed, from the header
+    region, and is left out when nothing is missing.
+    """
+    if not EXTRACTION_RULES:
+        # Personal info is often spread across entire resume
+        personal = {"personal": (PERSONAL_PROMPT, merge_sections(sections), {})}
+    else:
+        pre = pre or PreExtraction(sections)
+        personal = {"personal": (personal_prompt(pre.missing), pre.header, {})} if pre.missing else {}
+
+    return {
+        **personal,
+        "experience": (EXPERIENCE_PROMPT, sections.get("experience", ""), []),
+        "education": (EDUCATION_PROMPT, sections.get("education", ""), []),
+        "skills": (SKILLS_PROMPT, sections.get("skills", ""), {}),
+    }
 
 
-def _merge_sections(sections: Dict[str, str]) -> str:
+def _complete(extracted: Dict, sections: Dict[str, str], pre: Optional[PreExtraction]) -> Dict:
+    """Merge rule-found fields into the LLM results and report the savings."""
+    if pre is None:
+        return extracted
+    pre.dates_filled = fill_experience_dates(extracted.get("experience"), sections.get("experience", ""))
+    pre.report()
+    return {**extracted, "personal": pre.merge(extracted.get("personal"))}
+
+
+def _parse_json_response(response: str, default):
     """
-    Used for personal info extraction where data may appear anywhere.
+    Parse JSON response from LLM. A truncated or malformed response keeps
+    every element that was complete; default if it holds no JSON at all.
     """
-    return "\n\n".join(
-        value for value in sections.values() if value
-    )
+    try:
+        value, intact = salvage_json(response)
+    except ValueError as e:
+        print(f"⚠️ Failed to parse JSON response: {e}")
+        print(f"   Raw response: {response[:200]}...")
+        return default
+
+    if not intact:
+        print(f"🔧 Kept the complete elements of a truncated/malformed response: {response[:200]}...")
+    return value
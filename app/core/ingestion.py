@@ -1,59 +1,224 @@
 # core/ingestion.py
 
+import io
+import os
+import threading
+import unicodedata
 from pathlib import Path
-from typing import Union
+from typing import BinaryIO, Iterator, Optional, Union
 import pdfplumber
+import pypdfium2 as pdfium
 from docx import Document
 
 
-def extract_text(file_path: Union[str, Path]) -> str:
-    """
-    Extract raw text from a resume file.
-    Supported formats: PDF, DOCX
+# PDF text engine: "auto" (pdfium, falling back to pdfplumber when its text
+# is empty or garbled), "pdfium" or "pdfplumber"
+PDF_ENGINES = ("auto", "pdfium", "pdfplumber")
+PDF_TEXT_ENGINE = os.getenv("PDF_TEXT_ENGINE", "auto")
 
-    Returns:
-        Plain text with line breaks preserved
-    """
-    file_path = Path(file_path)
+# Share of non-whitespace characters that may be replacement/control/
+# unassigned code points before fast-path text counts as garbled
+GARBLED_RATIO = 0.05
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
+# PDFium is not thread-safe; calls from threads in one process are serialized
+_pdfium_lock = threading.Lock()
 
-    suffix = file_path.suffix.lower()
+# A path to a resume, or its content (e.g. an upload) as bytes or a binary file object
+Source = Union[str, Path, bytes, BinaryIO]
 
-    if suffix == ".pdf":
-        return _extract_pdf_text(file_path)
-    elif suffix == ".docx":
-        return _extract_docx_text(file_path)
-    else:
-        raise ValueError(f"Unsupported resume format: {suffix}")
 
+class ExtractedText:
+    """Plain text of one document, plus which engine produced it."""
 
-def _extract_pdf_text(file_path: Path) -> str:
-    text_chunks = []
+    def __init__(self, text: str, engine: str, pages: int = 1):
+        self.text = text
+        self.engine = engine
+        self.pages = pages
 
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_chunks.append(page_text)
 
-    if not text_chunks:
-        raise ValueError("No text could be extracted from PDF")
+def extract_text(source: Source, max_pages: Optional[int] = None, suffix: Optional[str] = None) -> str:
+    """
+    Extract raw text from a resume file, given as a path or as its content
+    (bytes or a binary file object such as an upload's SpooledTemporaryFile;
+    `suffix` then names the format, e.g. ".pdf").
+    Supported formats: PDF, DOCX (PDFs are read up to max_pages pages)
 
-    return "\n".join(text_chunks)
+    Returns:
+        Plain text with line breaks preserved
+    """
+    return extract_document(source, max_pages, suffix=suffix).text
 
 
-def _extract_docx_text(file_path: Path) -> str:
-    doc = Document(file_path)
+def extract_document(
+    source: Source,
+    max_pages: Optional[int] = None,
+    engine: Optional[str] = None,
+    suffix: Optional[str] = None
+) -> ExtractedText:
+    """extract_text(), also reporting the engine used ("pdfium", "pdfplumber" or "docx")."""
+    stream = DocumentStream(source, max_pages, engine, suffix)
+    text = "\n".join(stream)
+    return ExtractedText(text, stream.engine, stream.pages)
 
-    text_chunks = [
-        para.text.strip()
-        for para in doc.paragraphs
-        if para.text and para.text.strip()
-    ]
 
-    if not text_chunks:
-        raise ValueError("No text could be extracted from DOCX")
+class DocumentStream:
+    """
+    A document's text one piece at a time: a page of a PDF or a paragraph
+    of a DOCX, each made of whole lines. Joining the pieces with newlines
+    gives extract_text(). Only the current page is held in memory.
+
+    `engine` and `pages` describe what has been read so far; once the
+    stream is exhausted they describe the whole document. In "auto" mode
+    a garbled pdfium page switches the rest of the document to pdfplumber
+    (engine "pdfium+pdfplumber", or "pdfplumber" from the first page on).
+    """
 
-    return "\n".join(text_chunks)
+    def __init__(
+        self,
+        source: Source,
+        max_pages: Optional[int] = None,
+        engine: Optional[str] = None,
+        suffix: Optional[str] = None
+    ):
+        if isinstance(source, (str, Path)):
+            self.file_path: Optional[Path] = Path(source)
+            self.data: Optional[bytes] = None
+            if not self.file_path.exists():
+                raise FileNotFoundError(f"File not found: {self.file_path}")
+            self.name = self.file_path.name
+            suffix = suffix or self.file_path.suffix
+        else:
+            # In-memory content is read once: pdfium and pdfplumber each get their own view of it
+            self.file_path = None
+            if not isinstance(source, bytes):
+                source.seek(0)
+                source = source.read()
+            self.data = source
+            self.name = f"<{len(self.data)} byte upload>"
+
+        self.suffix = (suffix or "").lower()
+        if self.suffix not in (".pdf", ".docx"):
+            raise ValueError(f"Unsupported resume format: {self.suffix or 'none'}")
+
+        self.requested_engine = engine or PDF_TEXT_ENGINE
+        if self.suffix == ".pdf" and self.requested_engine not in PDF_ENGINES:
+            raise ValueError(
+                f"Unknown PDF text engine: {self.requested_engine} "
+                f"(expected one of {', '.join(PDF_ENGINES)})"
+            )
+
+        self.max_pages = max_pages
+        self.engine: Optional[str] = None
+        self.pages = 0
+        self._chunks = 0
+
+    def __iter__(self) -> Iterator[str]:
+        if self.suffix == ".docx":
+            return self._iter_docx()
+        return self._iter_pdf()
+
+    # -----------------------------
+    # PDF
+    # -----------------------------
+
+    def _iter_pdf(self) -> Iterator[str]:
+        if self.requested_engine == "pdfplumber":
+            yield from self._iter_pdfplumber(0)
+            return
+
+        auto = self.requested_engine == "auto"
+        try:
+            with _pdfium_lock:
+                pdf = pdfium.PdfDocument(self.data if self.data is not None else self.file_path)
+        except pdfium.PdfiumError as e:
+            if not auto:
+                raise
+            self._fall_back(f"pdfium error: {e}")
+            yield from self._iter_pdfplumber(0)
+            return
+
+        try:
+            total = min(len(pdf), self.max_pages) if self.max_pages else len(pdf)
+            for index in range(total):
+                page_text = _pdfium_page_text(pdf, index)
+                if auto and page_text.strip():
+                    problem = _text_problem(page_text)
+                    if problem is not None:
+                        self._fall_back(f"page {index + 1}: {problem}")
+                        yield from self._iter_pdfplumber(index)
+                        return
+                self.engine = "pdfium"
+                self.pages += 1
+                if page_text.strip():
+                    self._chunks += 1
+                    yield page_text
+        finally:
+            with _pdfium_lock:
+                pdf.close()
+
+        if not self._chunks:
+            if not auto:
+                raise ValueError("No text could be extracted from PDF")
+            self._fall_back("no text")
+            self.pages = 0
+            yield from self._iter_pdfplumber(0)
+
+    def _iter_pdfplumber(self, first_page: int) -> Iterator[str]:
+        self.engine = "pdfium+pdfplumber" if self.pages else "pdfplumber"
+
+        with pdfplumber.open(self._open()) as pdf:
+            for page in pdf.pages[first_page:self.max_pages]:
+                page_text = page.extract_text()
+                # Drop this page's cached layout objects before the next one
+                page.close()
+                self.pages += 1
+                if page_text:
+                    self._chunks += 1
+                    yield page_text
+
+        if not self._chunks:
+            raise ValueError("No text could be extracted from PDF")
+
+    def _fall_back(self, problem: str) -> None:
+        print(f"↩️ Falling back to pdfplumber for {self.name}: {problem}")
+
+    def _open(self) -> Union[Path, BinaryIO]:
+        return io.BytesIO(self.data) if self.data is not None else self.file_path
+
+    # -----------------------------
+    # DOCX
+    # -----------------------------
+
+    def _iter_docx(self) -> Iterator[str]:
+        doc = Document(self._open())
+        self.engine = "docx"
+        self.pages = 1
+
+        for para in doc.paragraphs:
+            if para.text and para.text.strip():
+                self._chunks += 1
+                yield para.text.strip()
+
+        if not self._chunks:
+            raise ValueError("No text could be extracted from DOCX")
+
+
+def _pdfium_page_text(pdf, index: int) -> str:
+    with _pdfium_lock:
+        page = pdf[index]
+        textpage = page.get_textpage()
+        page_text = textpage.get_text_bounded()
+        textpage.close()
+        page.close()
+    return page_text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _text_problem(text: str) -> Optional[str]:
+    """Why fast-path text is unusable (empty or garbled), or None if it looks fine."""
+    chars = [c for c in text if not c.isspace()]
+    if not chars:
+        return "no text"
+    bad = sum(1 for c in chars if c == "\ufffd" or unicodedata.category(c) in ("Cc", "Co", "Cs", "Cn"))
+    if bad / len(chars) > GARBLED_RATIO:
+        return f"garbled text ({bad}/{len(chars)} unreadable characters)"
+    return None
@@ -0,0 +1,301 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from app.core.ingestion import DocumentStream, ExtractedText, Source
+
+
+class IngestionTimeout(TimeoutError):
+    """A file took longer than the per-file limit; its worker was killed."""
+
+
+class IngestionWorkerCrashed(RuntimeError):
+    """The worker process died while handling a file."""
+
+
+# Cold start of a spawned worker (interpreter + pdfplumber/docx imports);
+# not counted against the per-file timeout
+STARTUP_TIMEOUT = 60.0
+
+
+def _worker_main(conn) -> None:
+    """
+    Worker process: for each (path or bytes, max_pages, suffix) received, send the
+    document's pieces as ("chunk", text), then ("ok", engine, pages) or
+    ("error", exception).
+    """
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+
+        source, max_pages, suffix = job
+        try:
+            stream = DocumentStream(source, max_pages, suffix=suffix)
+            for chunk in stream:
+                conn.send(("chunk", chunk))
+            reply = ("ok", stream.engine, stream.pages)
+        except Exception as e:
+            reply = ("error", e)
+        try:
+            conn.send(reply)
+        except Exception:
+            # Exception that does not pickle: send its description instead
+            conn.send(("error", RuntimeError(f"{type(reply[1]).__name__}: {reply[1]}")))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self) -> None:
+        if self.ready:
+            return
+        if not self.conn.poll(STARTUP_TIMEOUT):
+            raise IngestionWorkerCrashed(f"Ingestion worker did not start within {STARTUP_TIMEOUT}s")
+        self.conn.recv()
+        self.ready = True
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class IngestionPool:
+    """
+    Dedicated worker processes for PDF/DOCX text extraction.
+
+    pdfplumber's layout analysis is pure Python and holds the GIL, so it
+    runs here instead of in the API process. Each file gets `timeout`
+    seconds; a worker that overruns (e.g. on a pathological PDF) is killed
+    and replaced, instead of hanging the pool. PDFs are read up to
+    `max_pages` pages.
+
+    Callers block (or await) until a worker is free, so the pool size is
+    also the bound on concurrent parsing.
+    """
+
+    def __init__(self, processes: int = 2, timeout: float = 30.0, max_pages: Optional[int] = 20):
+        self.processes = processes
+        self.timeout = timeout
+        self.max_pages = max_pages
+        # spawn, not fork: the API process holds threads and gRPC state
+        self._ctx = multiprocessing.get_context("spawn")
+        # Idle workers; None is a slot whose worker could not be restarted
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._workers: list = []
+        self._lock = threading.Lock()
+        self._started = False
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.engines: Dict[str, int] = {}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            workers = [_Worker(self._ctx) for _ in range(self.processes)]
+            for worker in workers:
+                worker.wait_ready()
+                self._workers.append(worker)
+                self._idle.put(worker)
+            self._started = True
+
+    def close(self) -> None:
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle = queue.Queue()
+            self._started = False
+
+    def extract_text(self, source: Source, suffix: Optional[str] = None) -> str:
+        """Same contract as ingestion.extract_text, run in a worker process."""
+        return self.extract_document(source, suffix).text
+
+    def extract_document(self, source: Source, suffix: Optional[str] = None) -> ExtractedText:
+        """Same contract as ingestion.extract_document, run in a worker process."""
+        stream = self.iter_document(source, suffix)
+        text = "\n".join(stream)
+        return ExtractedText(text, stream.engine, stream.pages)
+
+    def iter_document(self, source: Source, suffix: Optional[str] = None) -> "PooledDocumentStream":
+        """
+        Same contract as ingestion.DocumentStream; pieces arrive as the
+        worker reads them. In-memory content is sent to the worker over
+        its pipe, paths are opened by the worker.
+        """
+        return PooledDocumentStream(self, source, suffix)
+
+    def _stream(self, stream: "PooledDocumentStream") -> Iterator[str]:
+        self.start()
+        worker = self._take()
+        name = stream.name
+        finished = False
+        try:
+            try:
+                worker.wait_ready()
+                worker.conn.send((stream.source, self.max_pages, stream.suffix))
+            except (ConnectionError, OSError, IngestionWorkerCrashed) as e:
+                self._count("crashes")
+                raise IngestionWorkerCrashed(f"Ingestion worker died on {name}") from e
+
+            # Only time spent waiting on the worker counts against the timeout
+            budget = self.timeout
+            while True:
+                started = time.monotonic()
+                message = self._receive(worker, name, budget)
+                budget -= time.monotonic() - started
+
+                if message[0] == "chunk":
+                    yield message[1]
+                    continue
+
+                finished = True
+                if message[0] == "error":
+                    self._count("failed")
+                    raise message[1]
+                _, stream.engine, stream.pages = message
+                self._count("completed")
+                with self._lock:
+                    self.engines[stream.engine] = self.engines.get(stream.engine, 0) + 1
+                return
+        finally:
+            # A worker that timed out, crashed or was abandoned mid-document is not reusable
+            self._idle.put(worker if finished else self._replace(worker))
+
+    def _take(self) -> _Worker:
+        """Wait for an idle worker; an empty slot (None) gets a fresh one."""
+        worker = self._idle.get()
+        if worker is None:
+            try:
+                worker = self._spawn()
+            except BaseException:
+                self._idle.put(None)
+                raise
+        return worker
+
+    def _receive(self, worker: _Worker, name: str, budget: float):
+        try:
+            ready = worker.conn.poll(max(budget, 0))
+            if ready:
+                return worker.conn.recv()
+        except (EOFError, ConnectionError, OSError) as e:
+            self._count("crashes")
+            raise IngestionWorkerCrashed(f"Ingestion worker died on {name}") from e
+        self._count("timeouts")
+        raise IngestionTimeout(f"Text extraction exceeded {self.timeout}s for {name}")
+
+    async def aextract_text(self, source: Source, suffix: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.extract_text, source, suffix)
+
+    def stats(self) -> Dict:
+        return {
+            "processes": self.processes,
+            "idle": self._idle.qsize(),
+            "timeout": self.timeout,
+            "max_pages": self.max_pages,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "engines": dict(self.engines),
+        }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _replace(self, worker: _Worker) -> Optional[_Worker]:
+        """
+        Kill `worker` and start another in its slot. If that fails the slot
+        is returned empty (None) rather than lost, so the pool never shrinks
+        and waiters are not blocked; the next caller retries the start.
+        """
+        print(f"🔪 Replacing ingestion worker pid={worker.process.pid}")
+        with self._lock:
+            self._workers = [w for w in self._workers if w is not worker]
+        try:
+            worker.kill()
+            return self._spawn()
+        except Exception as e:
+            print(f"❌ Could not start a replacement ingestion worker: {e}")
+            return None
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+
+class PooledDocumentStream:
+    """DocumentStream whose pieces are read in an IngestionPool worker process."""
+
+    def __init__(self, pool: IngestionPool, source: Source, suffix: Optional[str] = None):
+        if isinstance(source, (str, Path)):
+            self.source: Union[str, bytes] = str(source)
+            self.name = Path(source).name
+        else:
+            if not isinstance(source, bytes):
+                source.seek(0)
+                source = source.read()
+            self.source = source
+            self.name = f"<{len(source)} byte upload>"
+        self.suffix = suffix
+        self.engine: Optional[str] = None
+        self.pages = 0
+        self._pool = pool
+
+    def __iter__(self) -> Iterator[str]:
+        return self._pool._stream(self)
+
+
+@lru_cache(maxsize=1)
+def get_ingestion_pool() -> Optional[IngestionPool]:
+    """
+    Process-wide pool from INGEST_PROCESSES / INGEST_FILE_TIMEOUT /
+    INGEST_MAX_PAGES. INGEST_PROCESSES=0 disables it (extract in-process).
+    """
+    processes = int(os.getenv("INGEST_PROCESSES", str(min(os.cpu_count() or 2, 4))))
+    if processes <= 0:
+        return None
+    return IngestionPool(
+        processes=processes,
+        timeout=float(os.getenv("INGEST_FILE_TIMEOUT", "30")),
+        max_pages=get_max_pages(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_max_pages() -> Optional[int]:
+    """INGEST_MAX_PAGES (0 reads all); applies with or without the pool."""
+    max_pages = int(os.getenv("INGEST_MAX_PAGES", "20"))
+    return max_pages if max_pages > 0 else None
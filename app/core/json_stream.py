@@ -0,0 +1,231 @@
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+
+# -----------------------------
+# Tokens
+# -----------------------------
+
+# Anything before the document (prose, a ```json fence) is skipped
+_ROOT_START = re.compile(r"[\[{]")
+_NON_SPACE = re.compile(r"\S")
+_STRING_STOP = re.compile(r'["\\]')
+# Numbers, literals, and the junk LLMs put where a value belongs ("...")
+_SCALAR = re.compile(r'[^\s\[\]{}",:]+')
+
+_LITERALS = {"true": True, "false": False, "null": None}
+
+# Raw newlines and tabs inside strings are common in LLM output
+_DECODER = json.JSONDecoder(strict=False)
+
+
+class _Frame:
+    """An open array or object and the children completed so far."""
+
+    __slots__ = ("value", "key", "after_colon", "keep")
+
+    def __init__(self, is_object: bool, keep: bool):
+        self.value = {} if is_object else []
+        self.key: Optional[str] = None
+        self.after_colon = False
+        # Kept when the output stops inside it: only member values are, an
+        # unfinished array element is dropped whole
+        self.keep = keep
+
+
+# -----------------------------
+# Parser
+# -----------------------------
+
+class JSONStreamParser:
+    """
+    Incremental parser for JSON written by an LLM, fed as it streams.
+
+    feed() returns the elements of the top-level array that completed in
+    that chunk, so they can be validated before generation ends. close()
+    returns the document; when the output stopped early, it holds every
+    element that was complete, with the open containers closed around
+    them. Text around the document and stray or missing commas are
+    tolerated; values that do not parse are skipped (counted in `skipped`).
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._string_start: Optional[int] = None
+        self._ready: List[Any] = []
+        self._root: Any = None
+        self.complete = False
+        self.truncated = False
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        if self.complete or self.truncated:
+            return []
+        self._buf += chunk
+        self._scan()
+
+        # Drop what has been consumed; an unfinished string is re-sliced whole
+        keep_from = self._pos if self._string_start is None else self._string_start
+        if keep_from:
+            self._buf = self._buf[keep_from:]
+            self._pos -= keep_from
+            if self._string_start is not None:
+                self._string_start = 0
+
+        ready, self._ready = self._ready, []
+        return ready
+
+    def close(self) -> Any:
+        """The document, or what was complete of it; ValueError if none started."""
+        if self.complete or self.truncated:
+            return self._root
+        if not self._stack:
+            raise ValueError("no JSON array or object in LLM output")
+
+        self.truncated = True
+        while len(self._stack) > 1:
+            child = self._stack.pop()
+            if child.keep:
+                self._add(self._stack[-1], child.value)
+        self._root = self._stack.pop().value
+        self._ready = []
+        return self._root
+
+    @property
+    def intact(self) -> bool:
+        """The document closed and nothing in it had to be skipped."""
+        return self.complete and not self.skipped
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    def _scan(self) -> None:
+        buf, pos, stack = self._buf, self._pos, self._stack
+        end = len(buf)
+
+        while pos < end and not self.complete:
+            if self._string_start is not None:
+                stop = _STRING_STOP.search(buf, pos)
+                if stop is None:
+                    pos = end
+                elif stop.group() == "\\":
+                    if stop.end() == end:
+                        # Escape split across chunks: wait for its second half
+                        pos = stop.start()
+                        break
+                    pos = stop.end() + 1
+                else:
+                    pos = stop.end()
+                    self._string_done(buf[self._string_start:pos])
+                    self._string_start = None
+                continue
+
+            if not stack:
+                start = _ROOT_START.search(buf, pos)
+                if start is None:
+                    pos = end
+                    break
+                stack.append(_Frame(start.group() == "{", keep=True))
+                pos = start.end()
+                continue
+
+            token = _NON_SPACE.search(buf, pos)
+            if token is None:
+                pos = end
+                break
+            pos = token.start()
+            char = buf[pos]
+            frame = stack[-1]
+
+            if char == '"':
+                self._string_start = pos
+                pos += 1
+            elif char in "[{":
+                stack.append(_Frame(char == "{", keep=isinstance(frame.value, dict)))
+                pos += 1
+            elif char in "]}":
+                child = stack.pop()
+                if stack:
+                    self._add(stack[-1], child.value)
+                else:
+                    self._root = child.value
+                    self.complete = True
+                pos += 1
+            elif char == ",":
+                if frame.key is not None:
+                    # Key without a value
+                    self.skipped += 1
+                frame.key, frame.after_colon = None, False
+                pos += 1
+            elif char == ":":
+                frame.after_colon = frame.key is not None
+                pos += 1
+            else:
+                scalar = _SCALAR.match(buf, pos)
+                if scalar.end() == end:
+                    # "12" may be the start of "1234": wait for what follows
+                    break
+                self._scalar_done(scalar.group())
+                pos = scalar.end()
+
+        self._pos = pos
+
+    def _string_done(self, token: str) -> None:
+        frame = self._stack[-1]
+        try:
+            value = _DECODER.decode(token)
+        except ValueError:
+            self.skipped += 1
+            return
+        if isinstance(frame.value, dict) and not frame.after_colon:
+            if frame.key is not None:
+                self.skipped += 1
+            frame.key = value
+        else:
+            self._add(frame, value)
+
+    def _scalar_done(self, token: str) -> None:
+        if token in _LITERALS:
+            value = _LITERALS[token]
+        else:
+            try:
+                value = json.loads(token)
+            except ValueError:
+                self.skipped += 1
+                return
+        self._add(self._stack[-1], value)
+
+    def _add(self, frame: _Frame, value: Any) -> None:
+        if isinstance(frame.value, list):
+            frame.value.append(value)
+            if frame is self._stack[0]:
+                self._ready.append(value)
+        elif frame.key is not None and frame.after_colon:
+            frame.value[frame.key] = value
+            frame.key, frame.after_colon = None, False
+        else:
+            self.skipped += 1
+
+
+def salvage_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parse a whole LLM response: (document, intact). intact is False when
+    the response stopped early or parts of it had to be skipped.
+    Raises ValueError when it holds no JSON array or object.
+    """
+    start = _ROOT_START.search(text)
+    if start is not None:
+        # Well-formed responses (the usual case) decode in one C-level pass
+        try:
+            return _DECODER.raw_decode(text, start.start())[0], True
+        except ValueError:
+            pass
+
+    parser = JSONStreamParser()
+    parser.feed(text)
+    value = parser.close()
+    return value, parser.intact
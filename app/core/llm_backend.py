@@ -0,0 +1,53 @@
+import os
+from functools import lru_cache
+from typing import AsyncIterator, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class LLMBackend(Protocol):
+    """
+    What the pipeline needs from an LLM. GeminiClient is the production
+    implementation; StubLLMBackend serves fixtures offline.
+    """
+
+    def generate(self, prompt: str) -> str: ...
+
+    def extract(self, prompt: str, input_text: str) -> str: ...
+
+    async def agenerate(self, prompt: str) -> str: ...
+
+    async def aextract(self, prompt: str, input_text: str) -> str: ...
+
+    def agenerate_stream(self, prompt: str) -> AsyncIterator[str]: ...
+
+
+def create_llm_backend() -> LLMBackend:
+    """
+    Backend selected by LLM_BACKEND: "gemini" (default) or "stub".
+    With LLM_RECORD_PATH set, Gemini responses are also appended to a
+    JSONL file that the stub backend can replay.
+    """
+    backend = os.getenv("LLM_BACKEND", "gemini").lower()
+
+    if backend == "gemini":
+        from app.core.llm_client import get_gemini_client
+        client = get_gemini_client()
+
+        record_path = os.getenv("LLM_RECORD_PATH")
+        if record_path:
+            from app.core.stub_llm import RecordingBackend
+            return RecordingBackend(client, record_path)
+        return client
+
+    if backend == "stub":
+        from app.core.rate_limit import llm_scheduler
+        from app.core.stub_llm import StubLLMBackend
+        return StubLLMBackend.from_env(scheduler=llm_scheduler)
+
+    raise ValueError(f"Unsupported LLM backend: {backend}")
+
+
+@lru_cache(maxsize=None)
+def get_llm_backend() -> LLMBackend:
+    """Process-wide backend shared by every request handler."""
+    return create_llm_backend()
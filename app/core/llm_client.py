@@ -1,37 +1,441 @@
+import asyncio
 import os
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Dict, Optional, Tuple
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+from app.core.cache import LRUCache, SqliteCache, TieredCache, make_cache_key
+from app.core.prompt_budget import extraction_prompt, prompt_ledger
+from app.core.rate_limit import (
+    LLMScheduler,
+    failed_on_earlier_deadline,
+    llm_scheduler,
+    tag_deadline_error,
+    time_left,
+)
+from app.core.singleflight import SingleFlight
 
 load_dotenv()
 
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise RuntimeError("GEMINI_API_KEY not found")
+# google.generativeai (and its gRPC stack) is imported and configured on
+# first use, so the app starts without the SDK import cost or an API key.
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def get_genai():
+    """Import and configure the Gemini SDK once, on first use."""
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise RuntimeError("GEMINI_API_KEY not found")
+
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                _genai = genai
+    return _genai
+
+
+DEFAULT_MODEL = "gemini-3-flash-preview"
+
+GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "max_output_tokens": 8192,  # Increased to 2048
+}
+
+# Concurrent in-flight calls allowed per client (sync and async each)
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "64"))
+
+
+def build_response_cache() -> TieredCache:
+    """
+    Process-wide response cache: an in-memory LRU tier, plus a sqlite tier
+    when LLM_CACHE_PATH is set so responses survive restarts.
+    """
+    ttl = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    memory = LRUCache(
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048")),
+        ttl=ttl,
+        max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    )
+
+    disk_path = os.getenv("LLM_CACHE_PATH")
+    disk = SqliteCache(disk_path, ttl=ttl) if disk_path else None
+
+    return TieredCache(memory, disk)
+
+
+response_cache = build_response_cache()
 
-genai.configure(api_key=api_key)
+# Identical prompts already in flight (from any client) share one call
+llm_flights = SingleFlight()
+
+
+class ClientHealth:
+    """
+    Passive health of one client, updated by every real (uncached) call.
+    Status is "unknown" before the first call, "ok" after a success and
+    "degraded"/"unhealthy" after 1/3+ consecutive failures.
+    """
+
+    UNHEALTHY_AFTER = 3
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_latency: Optional[float] = None
+        self.in_flight = 0
+
+    def record_start(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def record_success(self, started: float) -> None:
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.last_success = time.time()
+            self.last_latency = latency
+
+    def record_abandoned(self) -> None:
+        """Call ended by the caller (e.g. a closed stream): neither outcome."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_failure = time.time()
+            self.last_error = f"{type(error).__name__}: {error}"
+
+    @property
+    def status(self) -> str:
+        if self.consecutive_failures >= self.UNHEALTHY_AFTER:
+            return "unhealthy"
+        if self.consecutive_failures:
+            return "degraded"
+        return "ok" if self.successes else "unknown"
+
+    def as_dict(self) -> Dict:
+        return {
+            "status": self.status,
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+            "last_latency": self.last_latency,
+        }
 
 
 class GeminiClient:
-    def __init__(self, model="gemini-3-flash-preview"):
+    """
+    Gemini implementation of LLMBackend.
+
+    Long-lived: the model handle (bound to the SDK's process-wide gRPC
+    channel) is built once and reused, and at most `pool_size` calls are
+    in flight at a time. Cache misses that survive single-flight go
+    through the shared LLMScheduler (rate limit, priorities, retries).
+    Obtain instances through get_gemini_client() rather than constructing
+    one per request.
+    """
+
+    def __init__(
+        self,
+        model=DEFAULT_MODEL,
+        cache=response_cache,
+        generation_config: Optional[Dict] = None,
+        pool_size: Optional[int] = None,
+        scheduler: Optional[LLMScheduler] = llm_scheduler
+    ):
         self.model_name = model
+        self.generation_config = dict(generation_config or GENERATION_CONFIG)
+        self.cache = cache
+        self.pool_size = pool_size or LLM_POOL_SIZE
+        # Shared rate limit + retries; None calls the API directly
+        self.scheduler = scheduler
+        self.health = ClientHealth()
         self._model = None
+        self._model_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        # asyncio semaphores belong to one event loop; keep one per loop
+        self._async_slots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
 
     def _get_model(self):
         if self._model is None:
-            self._model = genai.GenerativeModel(self.model_name)
+            with self._model_lock:
+                if self._model is None:
+                    self._model = get_genai().GenerativeModel(self.model_name)
         return self._model
 
     def generate(self, prompt: str) -> str:
-        response = self._get_model().generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.2,
-                "max_output_tokens": 8192,  # Increased to 2048
-            }
-        )
-        return response.text
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            prompt_ledger.record_cached()
+            return cached
+        while True:
+            try:
+                return llm_flights.do(key, self._generate_uncached, key, prompt)
+            except Exception as e:
+                # The call this one joined ran out of its caller's (earlier) deadline
+                if not failed_on_earlier_deadline(e):
+                    raise
+
+    async def agenerate(self, prompt: str) -> str:
+        """Non-blocking generate() built on the SDK's async generation."""
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            prompt_ledger.record_cached()
+            return cached
+        while True:
+            try:
+                return await llm_flights.ado(key, self._agenerate_uncached, key, prompt)
+            except Exception as e:
+                if not failed_on_earlier_deadline(e):
+                    raise
+
+    def _generate_uncached(self, key: str, prompt: str) -> str:
+        try:
+            if self.scheduler is None:
+                text = self._call_model(prompt)
+            else:
+                text = self.scheduler.run(self._call_model, prompt)
+        except Exception as e:
+            # Coalesced callers with more time left ask again instead of sharing it
+            tag_deadline_error(e)
+            raise
+        # Only the caller that ran the model accounts for it (not coalesced callers)
+        prompt_ledger.record_call(prompt, text)
+        return self._cache_store(key, text)
+
+    async def _agenerate_uncached(self, key: str, prompt: str) -> str:
+        try:
+            if self.scheduler is None:
+                text = await self._acall_model(prompt)
+            else:
+                text = await self.scheduler.arun(self._acall_model, prompt)
+        except Exception as e:
+            tag_deadline_error(e)
+            raise
+        prompt_ledger.record_call(prompt, text)
+        return self._cache_store(key, text)
+
+    def _call_model(self, prompt: str) -> str:
+        """One attempt against the API, holding a pool slot."""
+        with self._slots:
+            started = self.health.record_start()
+            try:
+                response = self._get_model().generate_content(
+                    prompt,
+                    generation_config=self.generation_config,
+                    **_request_options()
+                )
+                text = response.text
+            except Exception as e:
+                self.health.record_failure(e)
+                raise
+            except BaseException:
+                # Cancelled / interrupted: no verdict on the API, but no longer in flight
+                self.health.record_abandoned()
+                raise
+            self.health.record_success(started)
+        return text
+
+    async def _acall_model(self, prompt: str) -> str:
+        async with self._async_slot():
+            started = self.health.record_start()
+            try:
+                response = await self._get_model().generate_content_async(
+                    prompt,
+                    generation_config=self.generation_config,
+                    **_request_options()
+                )
+                text = response.text
+            except Exception as e:
+                self.health.record_failure(e)
+                raise
+            except BaseException:
+                # Cancelled / interrupted: no verdict on the API, but no longer in flight
+                self.health.record_abandoned()
+                raise
+            self.health.record_success(started)
+        return text
+
+    async def agenerate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Yield the completion chunk by chunk as the SDK streams it. A cached
+        completion comes back as one chunk. Streams are not coalesced, and
+        only opening the stream is retried (chunks already sent cannot be
+        taken back).
+        """
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            prompt_ledger.record_cached()
+            yield cached
+            return
+
+        # The slot is held from opening the stream until it ends, however
+        # it ends (errors, cancellation, consumer going away), and released once
+        slot = self._async_slot()
+        await slot.acquire()
+        opened = False
+        try:
+            if self.scheduler is None:
+                response, started = await self._aopen_stream(prompt)
+            else:
+                response, started = await self.scheduler.arun(self._aopen_stream, prompt)
+            opened = True
+
+            chunks = []
+            async for chunk in response:
+                text = chunk.text
+                if text:
+                    chunks.append(text)
+                    yield text
+        except Exception as e:
+            if opened:
+                self.health.record_failure(e)
+            raise
+        except BaseException:
+            # Consumer went away (client disconnect / cancellation)
+            if opened:
+                self.health.record_abandoned()
+            raise
+        else:
+            self.health.record_success(started)
+            text = "".join(chunks)
+            prompt_ledger.record_call(prompt, text)
+            self._cache_store(key, text)
+        finally:
+            slot.release()
+
+    async def _aopen_stream(self, prompt: str):
+        """One attempt at opening the stream; the caller holds the pool slot."""
+        started = self.health.record_start()
+        try:
+            response = await self._get_model().generate_content_async(
+                prompt,
+                generation_config=self.generation_config,
+                stream=True,
+                **_request_options()
+            )
+        except Exception as e:
+            self.health.record_failure(e)
+            raise
+        except BaseException:
+            self.health.record_abandoned()
+            raise
+        return response, started
 
     def extract(self, prompt: str, input_text: str) -> str:
         """Extract structured data from text using the given prompt."""
-        full_prompt = f"{prompt}\n\nText to analyze:\n{input_text}"
-        return self.generate(full_prompt)
+        return self.generate(extraction_prompt(prompt, input_text))
+
+    async def aextract(self, prompt: str, input_text: str) -> str:
+        return await self.agenerate(extraction_prompt(prompt, input_text))
+
+    # -----------------------------
+    # Health
+    # -----------------------------
+
+    def ping(self) -> bool:
+        """Active check: a token count round-trip (no generation is billed)."""
+        started = self.health.record_start()
+        try:
+            self._get_model().count_tokens("ping")
+        except Exception as e:
+            self.health.record_failure(e)
+            return False
+        self.health.record_success(started)
+        return True
+
+    def health_info(self) -> Dict:
+        return {
+            "model": self.model_name,
+            "pool_size": self.pool_size,
+            **self.health.as_dict(),
+        }
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    def _async_slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._async_slots.get(loop)
+        if slot is None:
+            slot = self._async_slots[loop] = asyncio.Semaphore(self.pool_size)
+        return slot
+
+    def _cache_lookup(self, prompt: str):
+        """Content key for the call (also the single-flight key) and any cached text."""
+        key = make_cache_key(self.model_name, self.generation_config, prompt)
+        if self.cache is None:
+            return key, None
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: str, text: str) -> str:
+        if self.cache is not None and text:
+            self.cache.set(key, text)
+        return text
+
+
+def _request_options() -> Dict:
+    """SDK request timeout from the caller's llm_deadline, if it set one."""
+    left = time_left()
+    if left is None:
+        return {}
+    return {"request_options": {"timeout": max(left, 0.001)}}
+
+
+# -----------------------------
+# Process-wide client registry
+# -----------------------------
+
+_clients: Dict[Tuple, GeminiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_gemini_client(
+    model: str = DEFAULT_MODEL,
+    generation_config: Optional[Dict] = None
+) -> GeminiClient:
+    """Shared client for (model, generation_config), created on first request."""
+    config = dict(generation_config or GENERATION_CONFIG)
+    key = (model, tuple(sorted(config.items())))
+
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = GeminiClient(model, generation_config=config)
+    return client
+
+
+def client_health(ping: bool = False) -> list:
+    """Health of every registered client; ping=True adds an active round-trip."""
+    with _clients_lock:
+        clients = list(_clients.values())
+    if ping:
+        for client in clients:
+            client.ping()
+    return [client.health_info() for client in clients]
+
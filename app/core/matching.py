@@ -0,0 +1,249 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.models import ProfessionalProfile, JobRequirement
+from app.core.scoring import fit_score_table
+
+
+# -----------------------------
+# Skill vocabulary
+# -----------------------------
+
+class SkillVocabulary:
+    """Interns normalized (lowercased) skill names into dense integer ids."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, skill: str) -> int:
+        key = skill.lower()
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            skill_id = self._ids[key] = len(self._ids)
+        return skill_id
+
+    def lookup(self, skill: str) -> Optional[int]:
+        return self._ids.get(skill.lower())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+# -----------------------------
+# Profile skill matrix (CSR)
+# -----------------------------
+
+class SkillMatrix:
+    """
+    Stores each profile's deduplicated skill ids as one row of a CSR
+    (compressed sparse row) matrix, so exact/partial match counts for a job
+    against every profile are two sparse mat-vec products.
+
+    Overwriting a profile appends a new row and retires the old one; dead
+    rows are compacted once they make up half of the matrix.
+    """
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None):
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self._indices = np.zeros(1024, dtype=np.int32)   # skill ids, row after row
+        self._indptr = np.zeros(1025, dtype=np.int64)    # row start offsets
+        self._alive = np.zeros(1024, dtype=bool)
+        self._nnz = 0
+        self._n_rows = 0
+        self._rows: Dict[str, int] = {}                  # candidate_id -> live row
+        self._profiles: List[Optional[ProfessionalProfile]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def upsert(self, profile: ProfessionalProfile) -> None:
+        skill_ids = {self.vocabulary.intern(s.name) for s in profile.skills}
+
+        old_row = self._rows.get(profile.candidate_id)
+        if old_row is not None:
+            self._alive[old_row] = False
+            self._profiles[old_row] = None
+
+        self._append_row(sorted(skill_ids))
+        self._rows[profile.candidate_id] = self._n_rows - 1
+        self._profiles.append(profile)
+
+        if self._n_rows > 1024 and len(self._rows) * 2 < self._n_rows:
+            self._compact()
+
+    def upsert_many(self, profiles: Iterable[ProfessionalProfile]) -> None:
+        """Bulk insert/overwrite; builds all new rows with one array append."""
+        intern = self.vocabulary.intern
+        batch: Dict[str, ProfessionalProfile] = {}
+        for profile in profiles:
+            batch.pop(profile.candidate_id, None)
+            batch[profile.candidate_id] = profile
+
+        lengths = []
+        indices = []
+        for candidate_id, profile in batch.items():
+            old_row = self._rows.get(candidate_id)
+            if old_row is not None:
+                self._alive[old_row] = False
+                self._profiles[old_row] = None
+
+            skill_ids = sorted({intern(s.name) for s in profile.skills})
+            lengths.append(len(skill_ids))
+            indices.extend(skill_ids)
+
+        first_row = self._n_rows
+        n_new = len(batch)
+        end = self._nnz + len(indices)
+        if end > len(self._indices):
+            self._indices = _grow(self._indices, end)
+        if first_row + n_new + 1 > len(self._indptr):
+            self._indptr = _grow(self._indptr, first_row + n_new + 1)
+        if first_row + n_new > len(self._alive):
+            self._alive = _grow(self._alive, first_row + n_new)
+
+        self._indices[self._nnz:end] = indices
+        self._indptr[first_row + 1:first_row + n_new + 1] = self._nnz + np.cumsum(lengths)
+        self._alive[first_row:first_row + n_new] = True
+        self._nnz = end
+        self._n_rows += n_new
+
+        for offset, (candidate_id, profile) in enumerate(batch.items()):
+            self._rows[candidate_id] = first_row + offset
+            self._profiles.append(profile)
+
+        if self._n_rows > 1024 and len(self._rows) * 2 < self._n_rows:
+            self._compact()
+
+    def remove(self, candidate_id: str) -> None:
+        row = self._rows.pop(candidate_id, None)
+        if row is not None:
+            self._alive[row] = False
+            self._profiles[row] = None
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+
+    def match_counts(self, job: JobRequirement) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact (required) and partial (preferred) match counts for every row,
+        including dead rows (callers mask with the live-row array).
+
+        Both counts come from a single sparse mat-vec: required skills weigh
+        1 and preferred skills 1 << 32, so the per-row sums carry the exact
+        count in the low 32 bits and the partial count in the high bits.
+        """
+        weights = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        for skills, weight in ((job.required_skills, 1), (job.preferred_skills, 1 << 32)):
+            for skill_id in {self.vocabulary.lookup(s) for s in skills} - {None}:
+                weights[skill_id] += weight
+
+        sums = np.zeros(self._nnz + 1, dtype=np.int64)
+        np.cumsum(weights[self._indices[:self._nnz]], out=sums[1:])
+        indptr = self._indptr[:self._n_rows + 1]
+        packed = sums[indptr[1:]] - sums[indptr[:-1]]
+        return packed & 0xFFFFFFFF, packed >> 32
+
+    def score(self, job: JobRequirement) -> np.ndarray:
+        """fit_score for every row, identical to score_profile_against_job."""
+        n_required = len({s.lower() for s in job.required_skills})
+        n_preferred = len({s.lower() for s in job.preferred_skills})
+        table = np.array(fit_score_table(n_required, n_preferred), dtype=np.float64)
+
+        exact, partial = self.match_counts(job)
+        return table[exact, partial]
+
+    def score_jobs(self, jobs: List[JobRequirement]) -> Tuple[List[str], np.ndarray]:
+        """
+        M jobs against all live profiles.
+
+        Returns:
+            (candidate_ids, scores) with scores shaped (M, N)
+        """
+        live = np.flatnonzero(self._alive[:self._n_rows])
+        candidate_ids = [self._profiles[row].candidate_id for row in live]
+        scores = np.empty((len(jobs), len(live)), dtype=np.float64)
+        for i, job in enumerate(jobs):
+            scores[i] = self.score(job)[live]
+        return candidate_ids, scores
+
+    def rank(
+        self,
+        job: JobRequirement,
+        limit: Optional[int] = None,
+        min_score: float = 0.0
+    ) -> Tuple[int, List[Tuple[float, ProfessionalProfile]]]:
+        """
+        Same contract (and same ordering) as rank_profiles_against_job:
+        (total, best `limit` rows sorted by score desc, candidate_id asc).
+        """
+        scores = self.score(job)
+        rows = np.flatnonzero(self._alive[:self._n_rows] & (scores >= min_score))
+        total = len(rows)
+
+        if limit is not None and limit <= 0:
+            return total, []
+        if limit is not None and limit < total:
+            row_scores = scores[rows]
+            threshold = np.partition(row_scores, total - limit)[total - limit]
+            above = rows[row_scores > threshold]
+            ties = rows[row_scores == threshold]
+            # Ties at the cut-off are resolved by candidate_id, like the sort key
+            ties = heapq.nsmallest(
+                limit - len(above),
+                ties.tolist(),
+                key=lambda row: self._profiles[row].candidate_id
+            )
+            rows = np.concatenate([above, np.array(ties, dtype=above.dtype)])
+
+        ranked = [(float(scores[row]), self._profiles[row]) for row in rows.tolist()]
+        ranked.sort(key=lambda item: (-item[0], item[1].candidate_id))
+        return total, ranked
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    def _append_row(self, skill_ids: List[int]) -> None:
+        end = self._nnz + len(skill_ids)
+        if end > len(self._indices):
+            self._indices = _grow(self._indices, end)
+        if self._n_rows + 2 > len(self._indptr):
+            self._indptr = _grow(self._indptr, self._n_rows + 2)
+        if self._n_rows + 1 > len(self._alive):
+            self._alive = _grow(self._alive, self._n_rows + 1)
+
+        self._indices[self._nnz:end] = skill_ids
+        self._alive[self._n_rows] = True
+        self._n_rows += 1
+        self._indptr[self._n_rows] = end
+        self._nnz = end
+
+    def _compact(self) -> None:
+        live = [(row, self._profiles[row]) for row in range(self._n_rows) if self._alive[row]]
+        old_indices, old_indptr = self._indices, self._indptr
+
+        self._nnz = 0
+        self._n_rows = 0
+        self._alive[:] = False
+        self._indices = np.zeros_like(old_indices)
+        self._indptr = np.zeros_like(old_indptr)
+        self._rows = {}
+        self._profiles = []
+
+        for row, profile in live:
+            self._append_row(old_indices[old_indptr[row]:old_indptr[row + 1]])
+            self._rows[profile.candidate_id] = self._n_rows - 1
+            self._profiles.append(profile)
+
+
+def _grow(array: np.ndarray, min_size: int) -> np.ndarray:
+    grown = np.zeros(max(min_size, len(array) * 2), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
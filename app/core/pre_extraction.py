@@ -0,0 +1,336 @@
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from app.core.prompt_budget import estimate_tokens
+from app.core.prompts.resume_prompts import PERSONAL_FIELDS, PERSONAL_PROMPT, personal_prompt
+from app.core.segmentation import DATE_RANGE_RE, HEADER_SECTION, get_header_matcher
+
+
+# Lines of the header region sent to the LLM for fields the rules missed
+HEADER_REGION_LINES = 12
+
+# Lines of the header region the name is looked for in
+NAME_LINES = 3
+
+
+# -----------------------------
+# Patterns
+# -----------------------------
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+
+# Digits with spaces, dots, dashes, slashes or parentheses between them;
+# checked for length (and for being a date range) below
+PHONE_RE = re.compile(r"(?<![\w/.+-])(?:\+|00)?\(?\d[\d \t()./-]{5,}\d(?![\w/])")
+
+# A name line: two to four words of letters, hyphens, apostrophes and dots
+_NAME_RE = re.compile(r"[^\W\d_]+(?:[.'’-]?[ \t]+[^\W\d_]+|[-'’][^\W\d_]+){1,3}\.?")
+
+# Words that make a short first line a title rather than a name
+_NOT_NAME_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "lebenslauf", "contact", "profile",
+    "engineer", "developer", "scientist", "analyst", "manager", "consultant",
+    "designer", "architect", "director", "lead", "senior", "junior", "intern",
+    "owner", "product", "project", "program", "data", "machine", "learning",
+    "software", "engineering", "science", "research", "researcher", "business",
+    "marketing", "sales", "specialist", "administrator", "officer", "assistant",
+    "associate", "executive", "head", "chief", "founder", "student", "graduate",
+    "stack", "frontend", "backend", "cloud", "devops", "security", "portfolio",
+}
+
+# The part after the comma of an unlabelled location: a country or region
+# name, or an upper-case state/province code ("Austin, TX")
+_REGION_NAMES = {
+    # Countries
+    "argentina", "australia", "austria", "bangladesh", "belgium", "brazil",
+    "bulgaria", "canada", "chile", "china", "colombia", "croatia", "czechia",
+    "czech republic", "denmark", "egypt", "estonia", "finland", "france",
+    "germany", "ghana", "greece", "hong kong", "hungary", "india", "indonesia",
+    "ireland", "israel", "italy", "japan", "kenya", "latvia", "lithuania",
+    "luxembourg", "malaysia", "mexico", "morocco", "netherlands", "new zealand",
+    "nigeria", "norway", "pakistan", "peru", "philippines", "poland", "portugal",
+    "romania", "saudi arabia", "serbia", "singapore", "slovakia", "slovenia",
+    "south africa", "south korea", "korea", "spain", "sweden", "switzerland",
+    "taiwan", "thailand", "tunisia", "turkey", "türkiye", "ukraine",
+    "united arab emirates", "uae", "united kingdom", "uk", "united states",
+    "usa", "us", "vietnam", "england", "scotland", "wales", "northern ireland",
+    # US states, Canadian provinces, Australian states
+    "alabama", "alaska", "arizona", "arkansas", "california", "colorado",
+    "connecticut", "delaware", "florida", "georgia", "hawaii", "idaho",
+    "illinois", "indiana", "iowa", "kansas", "kentucky", "louisiana", "maine",
+    "maryland", "massachusetts", "michigan", "minnesota", "mississippi",
+    "missouri", "montana", "nebraska", "nevada", "new hampshire", "new jersey",
+    "new mexico", "new york", "north carolina", "north dakota", "ohio",
+    "oklahoma", "oregon", "pennsylvania", "rhode island", "south carolina",
+    "south dakota", "tennessee", "texas", "utah", "vermont", "virginia",
+    "washington", "west virginia", "wisconsin", "wyoming",
+    "ontario", "quebec", "british columbia", "alberta", "manitoba",
+    "saskatchewan", "nova scotia", "new brunswick", "newfoundland",
+    "new south wales", "victoria", "queensland", "tasmania",
+}
+_REGION_CODES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL",
+    "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT",
+    "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI",
+    "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC",
+    "ON", "QC", "BC", "AB", "MB", "SK", "NS", "NB", "NL", "PE",
+    "NSW", "VIC", "QLD", "SA", "TAS", "ACT",
+}
+
+# "Berlin, Germany", "Austin, TX", "São Paulo, Brazil"
+_LOCATION_RE = re.compile(
+    r"[^\W\d_][^\W\d_ .'-]*(?:[ .'-]+[^\W\d_]+){0,2},[ \t]*[^\W\d_]+(?:[ .'-]+[^\W\d_]+){0,2}"
+)
+
+_LABEL_RE = re.compile(r"^(name|email|e-mail|phone|tel|mobile|location|address)\s*[:：]\s*", re.IGNORECASE)
+
+# Separators between items of a contact line (segmentation turns "•" into "-")
+_CONTACT_SPLIT_RE = re.compile(r"\s*(?:[|•·;\t]|\s[-–—]\s|\s{3,})\s*")
+
+
+# -----------------------------
+# Personal info
+# -----------------------------
+
+class PreExtraction:
+    """
+    Personal fields the rules found in a resume's header region, the
+    fields still left for the LLM, and what skipping the rest saved
+    compared with sending PERSONAL_PROMPT over the whole resume.
+    """
+
+    def __init__(self, sections: Dict[str, str]):
+        self.header = header_region(sections)
+        self.found = find_personal(self.header)
+        self.missing = [field for field in PERSONAL_FIELDS if not self.found.get(field)]
+        self.dates_filled = 0
+        self._full_tokens = estimate_tokens(PERSONAL_PROMPT) + estimate_tokens(merge_sections(sections))
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return 0 if self.missing else 1
+
+    @property
+    def prompt_tokens_saved(self) -> int:
+        if not self.missing:
+            return self._full_tokens
+        sent = estimate_tokens(personal_prompt(self.missing)) + estimate_tokens(self.header)
+        return max(self._full_tokens - sent, 0)
+
+    def merge(self, llm_personal) -> Dict[str, Optional[str]]:
+        """Rule-found fields, plus the LLM's answer for the missing ones."""
+        llm_personal = llm_personal if isinstance(llm_personal, dict) else {}
+        return {
+            field: self.found.get(field) or llm_personal.get(field)
+            for field in PERSONAL_FIELDS
+        }
+
+    def report(self) -> None:
+        filled = [field for field in PERSONAL_FIELDS if self.found.get(field)]
+        print(
+            f"🧮 Rules filled {', '.join(filled) or 'no personal fields'}"
+            f"{f' and {self.dates_filled} date(s)' if self.dates_filled else ''}; "
+            f"LLM asked for {', '.join(self.missing) or 'nothing'} "
+            f"(saved {self.llm_calls_saved} call(s), ~{self.prompt_tokens_saved} prompt tokens)"
+        )
+        pre_extraction_stats.record(self, filled)
+
+
+def merge_sections(sections: Dict[str, str]) -> str:
+    """
+    Used for personal info extraction where data may appear anywhere.
+    """
+    return "\n\n".join(
+        value for value in sections.values() if value
+    )
+
+
+def header_region(sections: Dict[str, str]) -> str:
+    """
+    The top of the resume, where name and contact details sit: the lines
+    above the first section header, or the first lines of the resume if
+    there are none, capped at HEADER_REGION_LINES non-blank lines.
+    """
+    text = sections.get(HEADER_SECTION) or merge_sections(sections)
+    lines = []
+    for line in text.split("\n"):
+        if line.strip():
+            lines.append(line.strip())
+            if len(lines) == HEADER_REGION_LINES:
+                break
+    return "\n".join(lines)
+
+
+def find_personal(header: str) -> Dict[str, Optional[str]]:
+    """Name, email, phone and location found by regexes and heuristics (None if not found)."""
+    found: Dict[str, Optional[str]] = dict.fromkeys(PERSONAL_FIELDS)
+
+    email = EMAIL_RE.search(header)
+    if email:
+        found["email"] = email.group(0)
+
+    for match in PHONE_RE.finditer(header):
+        candidate = match.group(0).strip()
+        digits = sum(c.isdigit() for c in candidate)
+        if 7 <= digits <= 15 and not DATE_RANGE_RE.search(candidate):
+            found["phone"] = candidate
+            break
+
+    lines = header.split("\n")
+    name_line = None
+    for line in lines[:NAME_LINES]:
+        label = _LABEL_RE.match(line)
+        if label and label.group(1).lower() != "name":
+            continue
+        candidate = line[label.end():] if label else line
+        candidate = candidate.strip(" \t-=_*#~|•")
+        if _is_name(candidate):
+            # Unlabelled, "Product Owner" looks like a name too: only take
+            # it when the email address backs it up, else ask the LLM
+            if label or _in_email(candidate, found["email"]):
+                found["name"] = candidate
+            name_line = line
+            break
+
+    for line in lines:
+        if line is name_line:
+            continue
+        label = _LABEL_RE.match(line)
+        if label and label.group(1).lower() in ("location", "address"):
+            found["location"] = line[label.end():].strip() or None
+            break
+        location = _find_location(line)
+        if location:
+            found["location"] = location
+            break
+
+    return found
+
+
+def _is_name(text: str) -> bool:
+    if not _NAME_RE.fullmatch(text):
+        return False
+    words = re.split(r"[\s.'’-]+", text.lower())
+    if any(word in _NOT_NAME_WORDS for word in words):
+        return False
+    # "Experience", "Work History": a section header, not a name
+    return get_header_matcher().match(text) is None
+
+
+def _in_email(name: str, email: Optional[str]) -> bool:
+    """Whether a word of the name appears in the email's local part."""
+    if not email:
+        return False
+    local = _fold(email.split("@")[0])
+    return any(len(word) > 1 and word in local for word in _fold(name).split())
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c if c.isalpha() else " " for c in text if not unicodedata.combining(c))
+
+
+def _find_location(line: str) -> Optional[str]:
+    """A "City, Region" item of a contact line, the region being a known one."""
+    if "," not in line:
+        return None
+    for item in _CONTACT_SPLIT_RE.split(line):
+        item = item.strip()
+        if "@" in item or any(c.isdigit() for c in item):
+            continue
+        if _LOCATION_RE.fullmatch(item) and _is_region(item.rsplit(",", 1)[1].strip()):
+            return item
+    return None
+
+
+def _is_region(text: str) -> bool:
+    return text in _REGION_CODES or text.casefold() in _REGION_NAMES
+
+
+# -----------------------------
+# Dates
+# -----------------------------
+
+def find_date_ranges(text: str) -> List[Tuple[str, str, str]]:
+    """(line, start, end) for every line holding exactly one date range."""
+    ranges = []
+    for line in text.split("\n"):
+        matches = DATE_RANGE_RE.findall(line)
+        if len(matches) == 1:
+            start, end = matches[0]
+            ranges.append((line, start, end))
+    return ranges
+
+
+def fill_experience_dates(experience, text: str) -> int:
+    """
+    Fill missing start/end dates of LLM-extracted roles from the one date
+    range on the line naming their company (or role). Returns how many
+    dates were filled.
+    """
+    if not isinstance(experience, list) or not text:
+        return 0
+
+    ranges = None
+    filled = 0
+    for entry in experience:
+        if not isinstance(entry, dict) or (entry.get("start_date") and entry.get("end_date")):
+            continue
+        if ranges is None:
+            ranges = find_date_ranges(text)
+        for key in ("company", "role"):
+            value = entry.get(key)
+            if not isinstance(value, str) or not value.strip():
+                continue
+            lines = [r for r in ranges if value.lower() in r[0].lower()]
+            if len(lines) != 1:
+                continue
+            _, start, end = lines[0]
+            if not entry.get("start_date"):
+                entry["start_date"] = start
+                filled += 1
+            if not entry.get("end_date"):
+                entry["end_date"] = end
+                filled += 1
+            break
+    return filled
+
+
+# -----------------------------
+# Accounting
+# -----------------------------
+
+class PreExtractionStats:
+    """Process-wide totals of what rule-based pre-extraction saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.llm_calls_saved = 0
+        self.prompt_tokens_saved = 0
+        self.dates_filled = 0
+        self.fields: Dict[str, int] = dict.fromkeys(PERSONAL_FIELDS, 0)
+
+    def record(self, pre: PreExtraction, filled: List[str]) -> None:
+        with self._lock:
+            self.documents += 1
+            self.llm_calls_saved += pre.llm_calls_saved
+            self.prompt_tokens_saved += pre.prompt_tokens_saved
+            self.dates_filled += pre.dates_filled
+            for field in filled:
+                self.fields[field] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "llm_calls_saved": self.llm_calls_saved,
+                "prompt_tokens_saved": self.prompt_tokens_saved,
+                "dates_filled": self.dates_filled,
+                "fields_filled": dict(self.fields),
+            }
+
+
+pre_extraction_stats = PreExtractionStats()
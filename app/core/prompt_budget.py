@@ -0,0 +1,189 @@
+import contextvars
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+# Most estimated prompt tokens one extraction call may send (0: unbounded).
+# Larger inputs are split into several calls, or trimmed where only the
+# start of the text matters.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "4000"))
+
+_PIECES = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local token estimate, no tokenizer or API call: a word costs one token
+    per 5 letters, a number one per 3 digits, a punctuation mark one.
+    Errs on the high side for English prose.
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        if piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif piece[0].isalpha():
+            tokens += (len(piece) + 4) // 5
+        else:
+            tokens += 1
+    return tokens
+
+
+# -----------------------------
+# Budgeted extraction prompts
+# -----------------------------
+
+def extraction_prompt(prompt: str, input_text: str) -> str:
+    """The prompt every backend's extract() sends: instructions, then the text."""
+    return f"{prompt}\n\nText to analyze:\n{input_text}"
+
+
+def fit_extraction_input(
+    prompt: str,
+    input_text: str,
+    budget: Optional[int] = None,
+    trim: bool = False
+) -> Tuple[List[str], bool]:
+    """
+    Split `input_text` so that each extraction prompt built from it
+    (instructions + "Text to analyze:" + piece) fits the budget.
+
+    Pieces break at blank lines, then at line ends, then between words.
+    With trim=True only the first piece is kept. Returns (pieces, changed),
+    changed being True when the input was split or trimmed. `budget`
+    defaults to PROMPT_TOKEN_BUDGET.
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    room = budget - estimate_tokens(extraction_prompt(prompt, ""))
+    if budget <= 0 or estimate_tokens(input_text) <= room:
+        return [input_text], False
+
+    pieces = split_to_budget(input_text, max(room, 1))
+    return (pieces[:1] if trim else pieces), True
+
+
+def split_to_budget(text: str, max_tokens: int) -> List[str]:
+    """Consecutive pieces of `text` of at most max_tokens (estimated) each."""
+    pieces: List[str] = []
+    current: List[str] = []
+    used = 0
+
+    for unit, separator in _units(text, max_tokens):
+        cost = estimate_tokens(unit)
+        if current and used + cost > max_tokens:
+            pieces.append("".join(current).strip())
+            current, used = [], 0
+        current.append(unit + separator)
+        used += cost
+
+    if current:
+        pieces.append("".join(current).strip())
+    return [piece for piece in pieces if piece]
+
+
+def _units(text: str, max_tokens: int):
+    """(unit, separator) pairs, from paragraphs down to words, each within max_tokens."""
+    for paragraph in text.split("\n\n"):
+        if estimate_tokens(paragraph) <= max_tokens:
+            yield paragraph, "\n\n"
+            continue
+        for line in paragraph.split("\n"):
+            if estimate_tokens(line) <= max_tokens:
+                yield line, "\n"
+                continue
+            for word in line.split(" "):
+                yield word, " "
+
+
+# -----------------------------
+# Per-call-site accounting
+# -----------------------------
+
+_site: contextvars.ContextVar[Optional[Tuple[str, bool, bool]]] = contextvars.ContextVar("prompt_site", default=None)
+
+
+@contextmanager
+def prompt_site(site: str, trimmed: bool = False, chunked: bool = False):
+    """
+    Account LLM calls made inside the block (and tasks spawned from it) to
+    `site` in the prompt ledger; `trimmed`/`chunked` say how the input was
+    fitted to the budget.
+    """
+    token = _site.set((site, trimmed, chunked))
+    try:
+        yield
+    finally:
+        _site.reset(token)
+
+
+class PromptLedger:
+    """
+    Estimated prompt and response tokens per call site ("resume.experience",
+    "transferable", "alignment.ask", ...), so the stage that dominates
+    token spend is visible in /metrics/llm.
+
+    Backends report through record_call() only when the model actually
+    ran; answers served from the response cache are counted under
+    "cached" and spend no tokens. Calls coalesced onto another caller's
+    in-flight call are not counted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites: Dict[str, Dict[str, int]] = {}
+
+    def record_call(self, prompt: str, response: str = "") -> None:
+        """A model call made for the current prompt_site (none: not accounted)."""
+        current = _site.get()
+        if current is not None:
+            site, trimmed, chunked = current
+            self.record(site, prompt, response, trimmed=trimmed, chunked=chunked)
+
+    def record_cached(self) -> None:
+        """An answer for the current prompt_site served without calling the model."""
+        current = _site.get()
+        if current is not None:
+            with self._lock:
+                self._counts(current[0])["cached"] += 1
+
+    def record(self, site: str, prompt: str, response: str = "", trimmed: bool = False, chunked: bool = False) -> None:
+        prompt_tokens = estimate_tokens(prompt)
+        response_tokens = estimate_tokens(response) if response else 0
+        with self._lock:
+            counts = self._counts(site)
+            counts["calls"] += 1
+            counts["prompt_tokens"] += prompt_tokens
+            counts["response_tokens"] += response_tokens
+            counts["max_prompt_tokens"] = max(counts["max_prompt_tokens"], prompt_tokens)
+            counts["trimmed"] += trimmed
+            counts["chunked"] += chunked
+            counts["over_budget"] += bool(PROMPT_TOKEN_BUDGET) and prompt_tokens > PROMPT_TOKEN_BUDGET
+
+    def _counts(self, site: str) -> Dict[str, int]:
+        return self._sites.setdefault(site, {
+            "calls": 0,
+            "cached": 0,
+            "prompt_tokens": 0,
+            "response_tokens": 0,
+            "max_prompt_tokens": 0,
+            "trimmed": 0,
+            "chunked": 0,
+            "over_budget": 0,
+        })
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sites = {site: dict(counts) for site, counts in self._sites.items()}
+        total = sum(counts["prompt_tokens"] + counts["response_tokens"] for counts in sites.values())
+        for counts in sites.values():
+            counts["share"] = round((counts["prompt_tokens"] + counts["response_tokens"]) / total, 3) if total else 0.0
+        return {"budget": PROMPT_TOKEN_BUDGET, "sites": sites}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sites = {}
+
+
+prompt_ledger = PromptLedger()
@@ -18,6 +18,14 @@ Schema:
 }
 """
 
+PERSONAL_FIELDS = ("name", "email", "phone", "location")
+
+
+def personal_prompt(fields=PERSONAL_FIELDS) -> str:
+    """PERSONAL_PROMPT with only `fields` in its schema."""
+    schema = ",\n".join(f'  "{field}": string | null' for field in fields)
+    return PERSONAL_PROMPT.split("Schema:")[0] + "Schema:\n{\n" + schema + "\n}\n"
+
 EXPERIENCE_PROMPT = """
 Extract work experience from the resume section below.
 
@@ -0,0 +1,432 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# -----------------------------
+# Priorities
+# -----------------------------
+
+# Lower value = served first
+INTERACTIVE = 0
+DEFAULT = 1
+BATCH = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", DEFAULT: "default", BATCH: "batch"}
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=DEFAULT)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run LLM calls made inside the block (and tasks spawned from it) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# -----------------------------
+# Deadlines
+# -----------------------------
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The caller's llm_deadline passed before an LLM call could start."""
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("llm_deadline", default=None)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current llm_deadline (None: no deadline)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _check_deadline() -> None:
+    left = time_left()
+    if left is not None and left <= 0:
+        raise LLMDeadlineExceeded("LLM call deadline passed before the call started")
+
+
+def _until_deadline(delay: Optional[float]) -> Optional[float]:
+    """`delay` capped at the time left before the current llm_deadline."""
+    left = time_left()
+    if left is None:
+        return delay
+    if left <= 0:
+        raise LLMDeadlineExceeded("LLM call deadline passed while waiting for a rate-limit token")
+    return left if delay is None else min(delay, left)
+
+
+def tag_deadline_error(error: BaseException) -> None:
+    """Mark `error` as raised because the current llm_deadline passed, if it has."""
+    deadline = _deadline.get()
+    if deadline is not None and deadline <= time.monotonic():
+        error.llm_deadline = deadline
+
+
+def failed_on_earlier_deadline(error: BaseException) -> bool:
+    """
+    Whether `error` came from a caller whose llm_deadline passed earlier
+    than the current one would (e.g. the leader of a coalesced call), so
+    the current caller still has time to ask again.
+    """
+    theirs = getattr(error, "llm_deadline", None)
+    if theirs is None:
+        return False
+    mine = _deadline.get()
+    return mine is None or mine > theirs
+
+
+@contextmanager
+def llm_deadline(deadline: Optional[float]):
+    """
+    LLM calls made inside the block (and tasks spawned from it) must end by
+    `deadline`, a time.monotonic() value (None: no deadline of its own; an
+    enclosing, earlier one still applies). Clients send the time left as
+    the request timeout and the scheduler does not retry past it, so a
+    timed-out call really stops instead of holding its thread.
+    """
+    current = _deadline.get()
+    if deadline is None or (current is not None and current < deadline):
+        deadline = current
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+# -----------------------------
+# Token bucket
+# -----------------------------
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "wake", "cancelled")
+
+    def __init__(self, priority: int, seq: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.wake = wake
+        self.cancelled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class TokenBucket:
+    """
+    Token bucket shared by threads and event loops alike.
+
+    Waiters queue in one heap ordered by (priority, arrival), so a token
+    that frees up always goes to the most urgent, oldest caller. The rate
+    adapts AIMD-style: halved on a throttling response (429), crept back
+    up towards the configured rate on every success.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._wait_stats: Dict[int, List[float]] = {}   # priority -> [granted, total wait, max wait]
+
+    # -----------------------------
+    # Acquire
+    # -----------------------------
+
+    def acquire(self, priority: int = DEFAULT) -> float:
+        """
+        Block until a token is granted; returns seconds waited. Raises
+        LLMDeadlineExceeded if the caller's llm_deadline passes first.
+        """
+        started = time.monotonic()
+        event = threading.Event()
+        waiter = self._enqueue(priority, event.set)
+        try:
+            while True:
+                delay = self._try_grant(waiter)
+                if delay == 0:
+                    return self._granted(priority, started)
+                event.wait(_until_deadline(delay))
+                event.clear()
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    async def aacquire(self, priority: int = DEFAULT) -> float:
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(priority, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                delay = self._try_grant(waiter)
+                if delay == 0:
+                    return self._granted(priority, started)
+                timeout = _until_deadline(delay)
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    # -----------------------------
+    # Adaptation
+    # -----------------------------
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self._refill()
+            self.rate = max(self.rate / 2, self.min_rate)
+
+    def on_success(self) -> None:
+        if self.rate < self.max_rate:
+            with self._lock:
+                self._refill()
+                self.rate = min(self.rate + self.max_rate / 20, self.max_rate)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refill()
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for waiter in self._waiters:
+                if not waiter.cancelled:
+                    depth[PRIORITY_NAMES.get(waiter.priority, str(waiter.priority))] += 1
+            waits = {
+                PRIORITY_NAMES.get(p, str(p)): {
+                    "granted": int(granted),
+                    "avg_wait": total / granted if granted else 0.0,
+                    "max_wait": longest,
+                }
+                for p, (granted, total, longest) in sorted(self._wait_stats.items())
+            }
+            return {
+                "rate_per_second": self.rate,
+                "configured_rate_per_second": self.max_rate,
+                "burst": self.burst,
+                "tokens": self._tokens,
+                "queue_depth": depth,
+                "wait": waits,
+            }
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    def _enqueue(self, priority: int, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(priority, next(self._seq), wake)
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def _try_grant(self, waiter: _Waiter) -> Optional[float]:
+        """
+        0 if `waiter` got a token, else how long to sleep before asking
+        again (None = until woken, i.e. someone else is at the head).
+        """
+        with self._lock:
+            self._drop_cancelled()
+            if self._waiters[0] is not waiter:
+                return None
+
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                heapq.heappop(self._waiters)
+                self._wake_head()
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        with self._lock:
+            waiter.cancelled = True
+            self._drop_cancelled()
+            self._wake_head()
+
+    def _granted(self, priority: int, started: float) -> float:
+        waited = time.monotonic() - started
+        with self._lock:
+            stats = self._wait_stats.setdefault(priority, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+        return waited
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _drop_cancelled(self) -> None:
+        while self._waiters and self._waiters[0].cancelled:
+            heapq.heappop(self._waiters)
+
+    def _wake_head(self) -> None:
+        if self._waiters:
+            self._waiters[0].wake()
+
+
+# -----------------------------
+# Retry scheduling
+# -----------------------------
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """
+    HTTP-style status of an LLM error. google.api_core exceptions carry it
+    as `.code`, StubLLMError as `.status`.
+    """
+    for attr in ("code", "status"):
+        value = getattr(error, attr, None)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class LLMScheduler:
+    """
+    Entry point for every outgoing LLM call: waits for a rate-limit token
+    at the caller's priority, then runs the call, retrying throttled and
+    transient failures with exponential backoff and full jitter.
+
+    rate=None disables throttling (retries still apply).
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 10,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        seed: Optional[int] = None,
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.throttled = 0
+        self.gave_up = 0
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs):
+        priority = current_priority()
+        for attempt in itertools.count(1):
+            _check_deadline()
+            if self.bucket is not None:
+                self.bucket.acquire(priority)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._on_success()
+            return result
+
+    async def arun(self, coro_fn: Callable[..., Any], *args, **kwargs):
+        priority = current_priority()
+        for attempt in itertools.count(1):
+            _check_deadline()
+            if self.bucket is not None:
+                await self.bucket.aacquire(priority)
+            try:
+                result = await coro_fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._on_success()
+            return result
+
+    def stats(self) -> Dict:
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "gave_up": self.gave_up,
+            "rate_limit": self.bucket.stats() if self.bucket is not None else None,
+        }
+
+    def _on_success(self) -> None:
+        with self._stats_lock:
+            self.attempts += 1
+        if self.bucket is not None:
+            self.bucket.on_success()
+
+    def _on_error(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None to give up and re-raise."""
+        status = error_status(error)
+        with self._stats_lock:
+            self.attempts += 1
+            if status == 429:
+                self.throttled += 1
+            if status not in RETRYABLE_STATUS:
+                return None
+            if attempt >= self.max_attempts:
+                self.gave_up += 1
+                return None
+            ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            delay = self._rng.uniform(0, ceiling)
+            left = time_left()
+            if left is not None and delay >= left:
+                # The retry would start after the caller's deadline
+                self.gave_up += 1
+                return None
+            self.retries += 1
+
+        if status == 429 and self.bucket is not None:
+            self.bucket.on_throttled()
+        print(f"🔁 LLM call failed ({error}), retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s")
+        return delay
+
+
+def build_scheduler() -> LLMScheduler:
+    """Process-wide scheduler configured from LLM_RATE_LIMIT_RPM / LLM_RATE_BURST / LLM_MAX_ATTEMPTS."""
+    rpm = float(os.getenv("LLM_RATE_LIMIT_RPM", "1000"))
+    return LLMScheduler(
+        rate=rpm / 60 if rpm > 0 else None,
+        burst=int(os.getenv("LLM_RATE_BURST", "20")),
+        max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "4")),
+        base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+    )
+
+
+llm_scheduler = build_scheduler()
@@ -1,3 +1,6 @@
+import heapq
+from typing import Iterable, List, Optional, Tuple
+
 from .models import ProfessionalProfile, JobRequirement, MatchResult, MatchBreakdown
 
 
@@ -39,3 +42,56 @@ def score_profile_against_job(
             experience_gap=exp_gap
         )
     )
+
+
+def rank_profiles_against_job(
+    profiles: Iterable[ProfessionalProfile],
+    job: JobRequirement,
+    limit: Optional[int] = None,
+    min_score: float = 0.0
+) -> Tuple[int, List[Tuple[float, ProfessionalProfile]]]:
+    """
+    Score every profile against one job in a single pass.
+
+    Job skill sets are built once, and fit scores come from a lookup table
+    over (exact, partial) match counts, so the per-profile work is one set
+    construction and two intersections. Callers materialize full
+    MatchResults (via score_profile_against_job) for the page they return.
+
+    Returns:
+        (total, ranked) where total counts profiles with fit_score >= min_score
+        and ranked holds the best `limit` of them (all if limit is None),
+        sorted best first with ties broken by candidate_id
+    """
+    required = {s.lower() for s in job.required_skills}
+    preferred = {s.lower() for s in job.preferred_skills}
+    score_table = fit_score_table(len(required), len(preferred))
+
+    scored = []
+    for profile in profiles:
+        profile_skills = {s.name.lower() for s in profile.skills}
+        fit_score = score_table[len(required.intersection(profile_skills))][
+            len(preferred.intersection(profile_skills))
+        ]
+        if fit_score >= min_score:
+            scored.append((fit_score, profile))
+
+    rank_key = lambda item: (-item[0], item[1].candidate_id)
+    if limit is None:
+        return len(scored), sorted(scored, key=rank_key)
+    return len(scored), heapq.nsmallest(limit, scored, key=rank_key)
+
+
+def fit_score_table(n_required: int, n_preferred: int) -> List[List[float]]:
+    """
+    fit_score for every (exact, partial) count pair, computed exactly as in
+    score_profile_against_job so ranked scores are identical.
+    """
+    max_skill_score = n_required * 1.0 + n_preferred * 0.5
+    return [
+        [
+            round((exact * 1.0 + partial * 0.5) / max(max_skill_score, 1) * 100, 2)
+            for partial in range(n_preferred + 1)
+        ]
+        for exact in range(n_required + 1)
+    ]
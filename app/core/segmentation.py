@@ -1,5 +1,9 @@
+import json
+import os
 import re
-from typing import Dict
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 
 # Section 1: Header definitions
@@ -25,63 +29,332 @@ SECTION_HEADERS = {
 }
 
 
+# Other bundled languages; SEGMENT_LANGUAGES picks which are matched
+LANGUAGE_HEADERS: Dict[str, Dict[str, List[str]]] = {
+    "en": SECTION_HEADERS,
+    "de": {
+        "summary": ["zusammenfassung", "profil", "kurzprofil", "über mich"],
+        "experience": ["berufserfahrung", "erfahrung", "beruflicher werdegang", "werdegang"],
+        "education": ["ausbildung", "bildung", "studium", "bildungsweg"],
+        "skills": ["kenntnisse", "fähigkeiten", "fachkenntnisse", "kompetenzen"],
+        "projects": ["projekte"],
+        "certifications": ["zertifikate", "zertifizierungen"],
+    },
+    "fr": {
+        # Not "résumé": it would turn an English "Resume" title line into a summary header
+        "summary": ["profil", "à propos"],
+        "experience": ["expérience", "expérience professionnelle", "expériences professionnelles", "parcours professionnel"],
+        "education": ["formation", "formations", "études", "diplômes"],
+        "skills": ["compétences", "compétences techniques"],
+        "projects": ["projets"],
+        "certifications": ["certifications", "certificats"],
+    },
+    "es": {
+        "summary": ["resumen", "perfil", "sobre mí", "perfil profesional"],
+        "experience": ["experiencia", "experiencia laboral", "experiencia profesional"],
+        "education": ["educación", "formación", "formación académica", "estudios"],
+        "skills": ["habilidades", "competencias", "conocimientos"],
+        "projects": ["proyectos"],
+        "certifications": ["certificaciones", "certificados"],
+    },
+    "pt": {
+        "summary": ["resumo", "perfil", "sobre mim"],
+        "experience": ["experiência", "experiência profissional"],
+        "education": ["educação", "formação", "formação acadêmica"],
+        "skills": ["habilidades", "competências"],
+        "projects": ["projetos"],
+        "certifications": ["certificações", "certificados"],
+    },
+    "it": {
+        "summary": ["sommario", "profilo", "chi sono"],
+        "experience": ["esperienza", "esperienze", "esperienza professionale", "esperienze lavorative"],
+        "education": ["istruzione", "formazione"],
+        "skills": ["competenze", "abilità"],
+        "projects": ["progetti"],
+        "certifications": ["certificazioni"],
+    },
+    "nl": {
+        "summary": ["samenvatting", "profiel", "over mij"],
+        "experience": ["werkervaring", "ervaring"],
+        "education": ["opleiding", "opleidingen"],
+        "skills": ["vaardigheden", "competenties"],
+        "projects": ["projecten"],
+        "certifications": ["certificaten", "certificeringen"],
+    },
+}
+
+# Comma-separated language codes from LANGUAGE_HEADERS. English only by
+# default: other languages' headers ("Profil", "Formation") are ordinary
+# lines in English resumes, so they are opt-in
+SEGMENT_LANGUAGES = os.getenv("SEGMENT_LANGUAGES", "en")
+
+# Optional JSON file of extra headers, {"section": ["header", ...]}
+SEGMENT_HEADERS_PATH = os.getenv("SEGMENT_HEADERS_PATH")
+
+# Whether "Skills: Python, SQL" lines open a section. Off by default: roles
+# often list "Skills:" or "Projects:" lines of their own
+SEGMENT_INLINE_HEADERS = os.getenv("SEGMENT_INLINE_HEADERS", "0") not in ("0", "false", "no")
+
+# Key for the lines above the first section header (name, contact details)
+HEADER_SECTION = "header"
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}-\d{{2}}|\d{{4}})"
+
+# "01/2020 - Present", "Jan 2019 to Mar 2021", "2015–2018"
+DATE_RANGE_RE = re.compile(
+    rf"(?<![\w/])({_DATE})\s*(?:-|–|—|to)\s*({_DATE}|present|current|now|today)(?![\w/])",
+    re.IGNORECASE
+)
+
+
 # Section 2: Public entry point
-def segment_resume(text: str) -> Dict[str, str]:
+def segment_resume(text: str, matcher: Optional["HeaderMatcher"] = None) -> Dict[str, str]:
     """
     Segments resume text into logical sections using rule-based heuristics.
 
     Returns:
-        Dict mapping section_name -> section_text
+        Dict mapping section_name -> section_text; the lines above the
+        first section header, if any, are under HEADER_SECTION (except
+        for the single-block fallback)
+    """
+    segmenter = IncrementalSegmenter(matcher)
+    segmenter.feed(text)
+    return segmenter.sections()
+
+# Section 3: Rule-based segmentation
+class IncrementalSegmenter:
     """
-    normalized_text = _normalize_text(text)
-    sections = _rule_based_segmentation(normalized_text)
+    segment_resume() for text that arrives in pieces (pages, paragraphs),
+    each made of whole lines.
 
-    # Fallback: if experience is missing or too small, assume bad formatting
-    if not sections.get("experience") or len(sections["experience"]) < 200:
-        return _fallback_single_block(normalized_text)
+    feed() returns the sections the new text closed, i.e. those followed by
+    the next header, so work on them can start before the rest of the
+    document is read. A closed section can still be replaced if its
+    header appears again; the lines above the first header close as
+    HEADER_SECTION. sections() gives exactly what segment_resume()
+    returns for the whole text (without HEADER_SECTION when it falls back
+    to a single block, which already holds those lines).
+    """
 
-    return sections
+    def __init__(self, matcher: Optional["HeaderMatcher"] = None):
+        self.matcher = matcher or get_header_matcher()
+        # Normalized lines, kept for the single-block fallback
+        self._lines: List[str] = []
+        self._preamble: List[str] = []
+        self._sections: Dict[str, List[str]] = {}
+        self._current: Optional[str] = None
 
-# Section 3: Rule-based segmentation
-def _rule_based_segmentation(text: str) -> Dict[str, str]:
-    lines = text.split("\n")
-    sections: Dict[str, str] = {}
-    current_section = None
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        closed = []
+        for line in text.split("\n"):
+            # Normalize bullets; collapse runs of blank lines into one
+            line = line.replace("•", "-")
+            if not line and self._lines and not self._lines[-1]:
+                continue
+            self._lines.append(line)
 
-    for line in lines:
-        header = _match_section_header(line)
+            header = self.matcher.match(line)
+            if header and header[1] and self._current == "experience":
+                # "Skills: Python, SQL" under a role belongs to that role
+                header = None
 
-        if header:
-            current_section = header
-            sections[current_section] = []
-            continue
+            if header:
+                if self._current:
+                    closed.append((self._current, self._section_text(self._current)))
+                elif self._preamble_text():
+                    # The first header closes the name/contact block above it
+                    closed.append((HEADER_SECTION, self._preamble_text()))
+                self._current, rest = header
+                self._sections[self._current] = [rest] if rest else []
+                continue
 
-        if current_section:
-            sections[current_section].append(line)
+            if self._current:
+                self._sections[self._current].append(line)
+            else:
+                self._preamble.append(line)
 
-    # Join collected lines
-    for key in sections:
-        sections[key] = "\n".join(sections[key]).strip()
+        return closed
 
-    return sections
+    def sections(self) -> Dict[str, str]:
+        sections = {key: self._section_text(key) for key in self._sections}
+
+        # Fallback: if experience is missing or too small, assume bad formatting.
+        # The single block already holds the lines above the first header
+        if not sections.get("experience") or len(sections["experience"]) < 200:
+            return _fallback_single_block("\n".join(self._lines).strip())
+
+        preamble = self._preamble_text()
+        if preamble:
+            sections = {HEADER_SECTION: preamble, **sections}
+        return sections
+
+    def _section_text(self, key: str) -> str:
+        return "\n".join(self._sections[key]).strip()
+
+    def _preamble_text(self) -> str:
+        return "\n".join(self._preamble).strip()
 
 # Section 4: Header matching logic
-def _match_section_header(line: str) -> str | None:
-    clean = re.sub(r"[^a-zA-Z ]", "", line).lower().strip()
-
-    for section, headers in SECTION_HEADERS.items():
-        for header in headers:
-            if clean == header:
-                return section
-
-    return None
-
-# Section 5: Text normalization
-def _normalize_text(text: str) -> str:
-    # Normalize bullets and whitespace
-    text = text.replace("•", "-")
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+class HeaderMatcher:
+    """
+    Precompiled section-header index: one dict lookup per candidate line.
+
+    Headers are compared after case folding, stripping accents and
+    replacing digits/punctuation with spaces, so "WORK EXPERIENCE",
+    "Work-Experience:" and "Expérience" all match their vocabulary entry.
+    With inline=True a "Header: content" line also counts, and its
+    content becomes the first line of the section (IncrementalSegmenter
+    ignores such lines inside experience). Lines too long to be a
+    header are rejected without normalizing them.
+    """
+
+    def __init__(self, vocabulary: Dict[str, List[str]], inline: bool = False):
+        self.index: Dict[str, str] = {}
+        for section, headers in vocabulary.items():
+            for header in headers:
+                key = _normalize_header(header)
+                if key:
+                    self.index[key] = section
+        self.inline = inline
+        # Room for decoration around the longest header ("== Experience ==")
+        self._max_chars = max((len(key) for key in self.index), default=0) + 16
+
+    def match(self, line: str) -> Optional[Tuple[str, str]]:
+        """(section, content after the header) if the line is a header, else None."""
+        if self.inline:
+            head, sep, rest = line.partition(":")
+            if not sep:
+                head, sep, rest = line.partition("：")
+            if sep and len(head) <= self._max_chars:
+                section = self.index.get(_normalize_header(head))
+                if section:
+                    return section, rest.strip()
+
+        line = line.strip(_DECORATION)
+        if len(line) <= self._max_chars:
+            section = self.index.get(_normalize_header(line))
+            if section:
+                return section, ""
+
+        return None
+
+
+_NON_LETTERS = re.compile(r"[\W\d_]+")
+
+# Rules and ornaments around standalone headers ("EXPERIENCE ________")
+_DECORATION = " \t-=_*#~.:|•"
+
+# ASCII fast path: every non-letter becomes a space, letters are lowercased
+_ASCII_HEADER_TABLE = {
+    c: (chr(c).lower() if chr(c).isalpha() else " ") for c in range(128)
+}
+
+
+def _normalize_header(text: str) -> str:
+    if text.isascii():
+        return " ".join(text.translate(_ASCII_HEADER_TABLE).split())
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_NON_LETTERS.sub(" ", text).split())
+
+
+def build_header_matcher(
+    languages: Optional[str] = None,
+    headers_path: Optional[str] = None,
+    inline: bool = SEGMENT_INLINE_HEADERS
+) -> HeaderMatcher:
+    """Matcher for the given languages plus the headers in a JSON file, if any."""
+    vocabulary: Dict[str, List[str]] = {}
+    for language in (languages or SEGMENT_LANGUAGES).split(","):
+        language = language.strip()
+        if not language:
+            continue
+        if language not in LANGUAGE_HEADERS:
+            raise ValueError(f"Unknown header language: {language} (expected one of {', '.join(LANGUAGE_HEADERS)})")
+        for section, headers in LANGUAGE_HEADERS[language].items():
+            vocabulary.setdefault(section, []).extend(headers)
+
+    if headers_path:
+        with open(headers_path) as f:
+            for section, headers in json.load(f).items():
+                vocabulary.setdefault(section, []).extend(headers)
+
+    return HeaderMatcher(vocabulary, inline=inline)
+
+
+@lru_cache(maxsize=1)
+def get_header_matcher() -> HeaderMatcher:
+    """Process-wide matcher from SEGMENT_LANGUAGES / SEGMENT_HEADERS_PATH / SEGMENT_INLINE_HEADERS."""
+    return build_header_matcher(SEGMENT_LANGUAGES, SEGMENT_HEADERS_PATH)
+
+# Section 5: Splitting experience into roles
+
+# Company/title lines above a role's date line that belong to that role
+ROLE_HEADING_LINES = 2
+
+
+def split_roles(text: str) -> List[str]:
+    """
+    Split an experience section into one text per role.
+
+    A role starts at a non-bullet line holding a date range, and only
+    when that line has a heading: company and title on the line itself
+    ("Acme - Engineer, 01/2020 - Present"), or up to ROLE_HEADING_LINES
+    short company/title lines right above it, which then open the role.
+    Date lines without one (a promotion, a dated project) stay in the
+    current role. Text before the first role stays with it. Returns
+    [text] when fewer than two roles are found.
+    """
+    lines = text.split("\n")
+    starts: List[int] = []
+    for i, line in enumerate(lines):
+        if _is_bullet(line) or not DATE_RANGE_RE.search(line):
+            continue
+        start = i
+        while (
+            i - start < ROLE_HEADING_LINES
+            and start - 1 > (starts[-1] if starts else -1)
+            and _is_role_heading(lines[start - 1])
+        ):
+            start -= 1
+        if start == i and not _names_role(line):
+            continue
+        starts.append(start)
+
+    if len(starts) < 2:
+        return [text]
+
+    starts[0] = 0
+    bounds = starts + [len(lines)]
+    roles = ["\n".join(lines[a:b]).strip() for a, b in zip(bounds, bounds[1:])]
+    return [role for role in roles if role]
+
+
+# "Company - Title", "Title | Company", "Title at Company", "Title @ Company"
+_ROLE_SEPARATOR_RE = re.compile(r"\s(?:-|–|—|\||@|at)\s", re.IGNORECASE)
+
+
+def _names_role(line: str) -> bool:
+    """A date line that also holds a company and a title, apart from its dates."""
+    rest = DATE_RANGE_RE.sub(" ", line).strip(" \t,;:|()[]-–—")
+    return bool(_ROLE_SEPARATOR_RE.search(rest))
+
+
+def _is_bullet(line: str) -> bool:
+    return line.lstrip()[:1] in ("-", "*", "•", "·", "–")
+
+
+def _is_role_heading(line: str) -> bool:
+    """A short, non-bullet line that is not a sentence: a company or job title."""
+    line = line.strip()
+    return (
+        bool(line)
+        and not _is_bullet(line)
+        and not line.endswith(".")
+        and len(line.split()) <= 8
+        and not DATE_RANGE_RE.search(line)
+    )
 
 # Section 6: Fallback strategy (safe default)
 
@@ -0,0 +1,140 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Abandoned(Exception):
+    """The call stopped without a result (cancelled, interrupted); waiters start it again."""
+
+
+class _Flight:
+    """One in-flight call: its result, who waits for it, and its task (ado)."""
+
+    __slots__ = ("future", "waiters", "task")
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for `key` is in
+    flight, later callers with the same key wait for its result instead of
+    starting their own.
+
+    Threaded callers use do(), asyncio callers use ado(); both share one
+    in-flight table (backed by concurrent.futures.Future), so a thread and
+    a coroutine asking the same thing also coalesce.
+
+    Errors are shared, cancellation is not: ado() runs the call in its own
+    task, so a cancelled caller (the first one included) only stops
+    waiting. The task is cancelled once nobody waits for it any more, and
+    a caller that still needs the result then starts the call again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs):
+        while True:
+            flight, leader = self._join(key)
+            try:
+                if not leader:
+                    return flight.future.result()
+
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    self._finish(key, flight, error=e)
+                    raise
+                except BaseException:
+                    # KeyboardInterrupt & co. stop this caller, not the others
+                    self._finish(key, flight, error=_Abandoned())
+                    raise
+                self._finish(key, flight, result=result)
+                return result
+            except _Abandoned:
+                continue
+            finally:
+                self._leave(flight)
+
+    async def ado(self, key: Hashable, coro_fn: Callable[..., Any], *args, **kwargs):
+        while True:
+            flight, leader = self._join(key)
+            if leader:
+                flight.task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+                flight.task.add_done_callback(functools.partial(self._task_done, key, flight))
+            waiter = asyncio.wrap_future(flight.future)
+            # Seen even if this caller is cancelled before the result arrives
+            waiter.add_done_callback(_retrieve)
+            try:
+                return await asyncio.shield(waiter)
+            except _Abandoned:
+                continue
+            finally:
+                self._leave(flight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            self.calls += 1
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                flight.waiters += 1
+                return flight, False
+
+            flight = self._in_flight[key] = _Flight()
+            flight.waiters = 1
+            self.executed += 1
+            return flight, True
+
+    def _leave(self, flight: _Flight) -> None:
+        with self._lock:
+            flight.waiters -= 1
+            orphaned = flight.waiters == 0 and not flight.future.done()
+        if orphaned and flight.task is not None:
+            # Every caller was cancelled: stop the work
+            flight.task.get_loop().call_soon_threadsafe(flight.task.cancel)
+
+    def _task_done(self, key: Hashable, flight: _Flight, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self._finish(key, flight, error=_Abandoned())
+        elif task.exception() is not None:
+            error = task.exception()
+            self._finish(key, flight, error=error if isinstance(error, Exception) else _Abandoned())
+        else:
+            self._finish(key, flight, result=task.result())
+
+    def _finish(self, key: Hashable, flight: _Flight, result=None, error=None) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+            if isinstance(error, _Abandoned):
+                self.abandoned += 1
+        if error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(result)
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
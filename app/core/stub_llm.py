@@ -0,0 +1,333 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from app.core.prompt_budget import extraction_prompt, prompt_ledger
+from app.core.rate_limit import time_left
+
+
+class StubLLMError(RuntimeError):
+    """Injected failure; status mimics the HTTP code of a real API error."""
+
+    def __init__(self, message: str, status: int = 503):
+        super().__init__(message)
+        self.status = status
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Built-in fixtures
+# -----------------------------
+
+# (marker found in the prompt, canned response) for each prompt in app/core/prompts
+DEFAULT_RULES: List[Tuple[str, str]] = [
+    ("extracting personal information", json.dumps({
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+1 555 010 0000",
+        "location": "Berlin, Germany",
+    })),
+    ("Extract work experience", json.dumps([
+        {
+            "company": "Acme Analytics",
+            "role": "Senior Data Scientist",
+            "start_date": "01/2020",
+            "end_date": "Present",
+            "responsibilities": [
+                "Built demand forecasting models serving 40 markets",
+                "Led migration of batch pipelines to Spark",
+            ],
+            "tech_stack": ["Python", "Spark", "SQL"],
+        },
+        {
+            "company": "Globex",
+            "role": "Data Analyst",
+            "start_date": "06/2017",
+            "end_date": "12/2019",
+            "responsibilities": ["Designed KPI dashboards for operations teams"],
+            "tech_stack": ["SQL", "Tableau"],
+        },
+    ], indent=2)),
+    ("Extract education details", json.dumps([
+        {"degree": "MSc Statistics", "institution": "TU Munich", "year": "2017"},
+    ], indent=2)),
+    ("Extract skills from", json.dumps({
+        "programming": ["Python", "SQL"],
+        "ml": ["scikit-learn", "pandas", "forecasting"],
+        "tools": ["Spark", "Tableau", "Docker"],
+    }, indent=2)),
+    ("evaluating transferable skills", json.dumps([
+        {
+            "source_skill": "pandas",
+            "target_skill": "machine learning",
+            "justification": "Feature engineering at scale is core ML preparation work",
+            "confidence": 0.7,
+        },
+    ], indent=2)),
+    ("explaining how a candidate aligns", (
+        "- Strengths: the candidate matches most required skills.\n"
+        "- Gaps: see missing_required_skills in the provided context."
+    )),
+]
+
+
+class StubLLMBackend:
+    """
+    Offline LLMBackend that serves recorded or fixture responses.
+
+    Lookup order: exact replay (by prompt hash), then the first rule whose
+    marker appears in the prompt, then `default`. Latency, jitter, error
+    rate and truncation are injected so the pipeline (including its
+    JSON-repair paths) can be profiled under realistic conditions.
+
+    `latency` (+ jitter) is the time to the first token and
+    `token_latency` the time per further streamed chunk; a non-streaming
+    call waits for the whole completion, i.e. the sum of both.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[Tuple[str, str]]] = None,
+        replay: Optional[Dict[str, str]] = None,
+        default: str = "{}",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        token_latency: float = 0.0,
+        error_rate: float = 0.0,
+        truncation_rate: float = 0.0,
+        seed: Optional[int] = None,
+        scheduler=None,
+    ):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.replay = replay or {}
+        self.default = default
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.truncation_rate = truncation_rate
+        # Optional LLMScheduler, so load tests exercise rate limiting and retries
+        self.scheduler = scheduler
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.truncations = 0
+
+    @classmethod
+    def from_env(cls, scheduler=None) -> "StubLLMBackend":
+        replay, rules, default = {}, None, "{}"
+        fixtures_path = os.getenv("LLM_STUB_FIXTURES")
+        if fixtures_path:
+            replay, rules, default = load_fixtures(fixtures_path)
+
+        seed = os.getenv("LLM_STUB_SEED")
+        return cls(
+            rules=rules,
+            replay=replay,
+            default=default,
+            latency=float(os.getenv("LLM_STUB_LATENCY", "0")),
+            jitter=float(os.getenv("LLM_STUB_JITTER", "0")),
+            token_latency=float(os.getenv("LLM_STUB_TOKEN_LATENCY", "0")),
+            error_rate=float(os.getenv("LLM_STUB_ERROR_RATE", "0")),
+            truncation_rate=float(os.getenv("LLM_STUB_TRUNCATION_RATE", "0")),
+            seed=int(seed) if seed else None,
+            scheduler=scheduler,
+        )
+
+    # -----------------------------
+    # LLMBackend
+    # -----------------------------
+
+    def generate(self, prompt: str) -> str:
+        if self.scheduler is None:
+            text = self._generate_once(prompt)
+        else:
+            text = self.scheduler.run(self._generate_once, prompt)
+        prompt_ledger.record_call(prompt, text)
+        return text
+
+    async def agenerate(self, prompt: str) -> str:
+        if self.scheduler is None:
+            text = await self._agenerate_once(prompt)
+        else:
+            text = await self.scheduler.arun(self._agenerate_once, prompt)
+        prompt_ledger.record_call(prompt, text)
+        return text
+
+    async def agenerate_stream(self, prompt: str) -> AsyncIterator[str]:
+        if self.scheduler is None:
+            chunks = await self._aopen_stream(prompt)
+        else:
+            chunks = await self.scheduler.arun(self._aopen_stream, prompt)
+
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(self.token_latency)
+            yield chunk
+        prompt_ledger.record_call(prompt, "".join(chunks))
+
+    def extract(self, prompt: str, input_text: str) -> str:
+        return self.generate(extraction_prompt(prompt, input_text))
+
+    async def aextract(self, prompt: str, input_text: str) -> str:
+        return await self.agenerate(extraction_prompt(prompt, input_text))
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "errors": self.errors, "truncations": self.truncations}
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    def _generate_once(self, prompt: str) -> str:
+        delay, response = self._plan(prompt)
+        wait, response = _within_deadline(delay + self._streaming_time(response), response)
+        time.sleep(wait)
+        return self._deliver(response)
+
+    async def _agenerate_once(self, prompt: str) -> str:
+        delay, response = self._plan(prompt)
+        wait, response = _within_deadline(delay + self._streaming_time(response), response)
+        await asyncio.sleep(wait)
+        return self._deliver(response)
+
+    async def _aopen_stream(self, prompt: str) -> List[str]:
+        """Wait for the first token; errors surface here, like a failed stream open."""
+        delay, response = self._plan(prompt)
+        await asyncio.sleep(delay)
+        return _chunks(self._deliver(response))
+
+    def _streaming_time(self, response: Union[str, StubLLMError]) -> float:
+        if isinstance(response, StubLLMError) or not self.token_latency:
+            return 0.0
+        return self.token_latency * max(len(_chunks(response)) - 1, 0)
+
+    def _plan(self, prompt: str) -> Tuple[float, Union[str, StubLLMError]]:
+        """Draw latency and outcome up front so sync and async paths agree."""
+        with self._rng_lock:
+            self.calls += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+
+            if self._rng.random() < self.error_rate:
+                self.errors += 1
+                status = self._rng.choice([429, 500, 503])
+                return delay, StubLLMError(f"stub injected error ({status})", status=status)
+
+            response = self._lookup(prompt)
+            if response and self._rng.random() < self.truncation_rate:
+                self.truncations += 1
+                # Mimic hitting max_output_tokens: keep at least one character
+                response = response[:self._rng.randint(1, max(len(response) - 1, 1))]
+
+        return delay, response
+
+    @staticmethod
+    def _deliver(response: Union[str, StubLLMError]) -> str:
+        if isinstance(response, StubLLMError):
+            raise response
+        return response
+
+    def _lookup(self, prompt: str) -> str:
+        replayed = self.replay.get(prompt_key(prompt))
+        if replayed is not None:
+            return replayed
+
+        for marker, response in self.rules:
+            if marker in prompt:
+                return response
+        return self.default
+
+
+def _within_deadline(wait: float, response: Union[str, StubLLMError]) -> Tuple[float, Union[str, StubLLMError]]:
+    """Like the API's request timeout: a call that would outlast the caller's llm_deadline fails at it."""
+    left = time_left()
+    if left is None or wait <= left:
+        return wait, response
+    return max(left, 0.0), StubLLMError("stub deadline exceeded (504)", status=504)
+
+
+def _chunks(text: str) -> List[str]:
+    """Split a completion into word-sized stream chunks."""
+    return re.findall(r"\s*\S+(?:\s+$)?", text) or [text]
+
+
+# -----------------------------
+# Recording / fixture files
+# -----------------------------
+
+class RecordingBackend:
+    """
+    Wraps a real backend and appends every (prompt hash, response) to a
+    JSONL file, producing replay fixtures for StubLLMBackend.
+    """
+
+    def __init__(self, inner, path: Union[str, Path]):
+        self.inner = inner
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> str:
+        return self._record(prompt, self.inner.generate(prompt))
+
+    async def agenerate(self, prompt: str) -> str:
+        return self._record(prompt, await self.inner.agenerate(prompt))
+
+    async def agenerate_stream(self, prompt: str) -> AsyncIterator[str]:
+        chunks = []
+        async for chunk in self.inner.agenerate_stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._record(prompt, "".join(chunks))
+
+    def extract(self, prompt: str, input_text: str) -> str:
+        return self.generate(extraction_prompt(prompt, input_text))
+
+    async def aextract(self, prompt: str, input_text: str) -> str:
+        return await self.agenerate(extraction_prompt(prompt, input_text))
+
+    def _record(self, prompt: str, response: str) -> str:
+        line = json.dumps({"key": prompt_key(prompt), "response": response})
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return response
+
+
+def load_fixtures(path: Union[str, Path]):
+    """
+    Load fixtures from either
+    - a JSONL recording ({"key": ..., "response": ...} per line), or
+    - a JSON file {"replay": {key: response}, "rules": [[marker, response]], "default": str}.
+
+    Returns:
+        (replay, rules or None, default)
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix == ".jsonl":
+        replay = {}
+        for line in text.splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                replay[entry["key"]] = entry["response"]
+        return replay, None, "{}"
+
+    data = json.loads(text)
+    rules = data.get("rules")
+    return (
+        data.get("replay", {}),
+        [tuple(rule) for rule in rules] if rules is not None else None,
+        data.get("default", "{}"),
+    )
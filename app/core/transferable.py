@@ -1,15 +1,42 @@
-import json
-from typing import List
-from app.core.llm_client import GeminiClient
+import asyncio
+import hashlib
+import os
+from typing import Dict, List, Iterable, Tuple
+from app.core.cache import LRUCache
+from app.core.json_stream import JSONStreamParser, salvage_json
+from app.core.llm_backend import LLMBackend, get_llm_backend
+from app.core.prompt_budget import prompt_site
 # from app.core.prompts import TRANSFERABLE_SKILL_PROMPT
 from app.core.reasoning_models import TransferableSkillInference
 from app.core.prompts.scoring_prompts import TRANSFERABLE_SKILL_PROMPT
+from app.core.singleflight import SingleFlight
+from app.store.skill_pairs import SkillPairStore
+
+
+def canonical_skill_set(skills: Iterable[str]) -> Tuple[str, ...]:
+    """Sorted, lowercased, deduplicated skill names (used as a cache key)."""
+    return tuple(sorted({s.strip().lower() for s in skills if s and s.strip()}))
 
 
 class TransferableSkillEngine:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: int = 4096,
+        pair_store: SkillPairStore | None = None,
+        llm: LLMBackend | None = None
+    ):
         print("🤖 Initializing TransferableSkillEngine...")
-        self.llm = GeminiClient()
+        self.llm = llm if llm is not None else get_llm_backend()
+        # Every source → target verdict ever produced, persisted across runs
+        if pair_store is None:
+            pair_store = SkillPairStore(_pair_store_path(self.llm), version=_verdict_version(self.llm))
+        self.pair_store = pair_store
+        # Validated inferences keyed on canonical (candidate, job) skill sets.
+        # A result rests on negative verdicts too, so it expires with them
+        # (ttl=0 would mean never)
+        self.cache = LRUCache(max_entries=cache_size, ttl=max(pair_store.negative_ttl, 1e-3))
+        # Concurrent infers for the same canonical skill sets share one run
+        self.flights = SingleFlight()
         print("✅ TransferableSkillEngine initialized")
 
     def infer(
@@ -18,113 +45,256 @@ class TransferableSkillEngine:
         job_skills: List[str]
     ) -> List[TransferableSkillInference]:
 
-        print("📝 Building transferable skills prompt...")
+        key = _memo_key(candidate_skills, job_skills)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.flights.do(key, self._infer_uncached, key)
+        return _recase(cached, candidate_skills, job_skills)
+
+    async def ainfer(
+        self,
+        candidate_skills: List[str],
+        job_skills: List[str]
+    ) -> List[TransferableSkillInference]:
+        """Non-blocking infer(); shares the memo cache and pair store."""
+
+        key = _memo_key(candidate_skills, job_skills)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = await self.flights.ado(key, self._ainfer_uncached, key)
+        return _recase(cached, candidate_skills, job_skills)
+
+    def _infer_uncached(self, key) -> List[TransferableSkillInference]:
+        known, unseen = self._split_pairs(*key)
+        if not unseen:
+            return self._complete(key, known, unseen, [])
+        prompt = self._build_prompt(*_unseen_skills(unseen))
+        with prompt_site("transferable"):
+            raw = self.llm.generate(prompt)
+        return self._complete(key, known, unseen, *self._parse_response(raw))
+
+    async def _ainfer_uncached(self, key) -> List[TransferableSkillInference]:
+        # The pair store is sqlite: lookups and records run off the event loop
+        known, unseen = await asyncio.to_thread(self._split_pairs, *key)
+        if not unseen:
+            return self._complete(key, known, unseen, [])
+        prompt = self._build_prompt(*_unseen_skills(unseen))
+        with prompt_site("transferable"):
+            parsed = await self._astream_response(prompt)
+        return await asyncio.to_thread(self._complete, key, known, unseen, *parsed)
+
+    def _split_pairs(
+        self,
+        candidate_skills: Tuple[str, ...],
+        job_skills: Tuple[str, ...]
+    ) -> Tuple[List[TransferableSkillInference], List[Tuple[str, str]]]:
+        """
+        Known transferable inferences from the pair store, plus the
+        (source, target) pairs it has never seen.
+        """
+        known = self.pair_store.lookup(candidate_skills, job_skills)
+        unseen = [
+            (source, target)
+            for source in candidate_skills
+            for target in job_skills
+            if (source, target) not in known
+        ]
+        if unseen:
+            print(f"🧠 {len(known)} skill pairs known, {len(unseen)} unseen")
+        return [inf for inf in known.values() if inf is not None], unseen
+
+    def _complete(
+        self,
+        key: Tuple[Tuple[str, ...], Tuple[str, ...]],
+        known: List[TransferableSkillInference],
+        unseen: List[Tuple[str, str]],
+        new: List[TransferableSkillInference] | None,
+        complete: bool = True
+    ) -> List[TransferableSkillInference]:
+        """
+        Record the LLM verdict for unseen pairs and merge it with known ones.
+        new is None when the LLM response could not be parsed; the partial
+        answer is then returned but neither recorded nor memoized. When the
+        response was incomplete or named pairs that were not asked, only the
+        pairs it did answer are recorded and nothing is memoized.
+        """
+        inferences = list(known)
+        if new is not None and unseen:
+            # The prompt lists skills, so it asks about their cross product,
+            # known pairs included; answers about those are not new
+            sources, targets = (set(skills) for skills in _unseen_skills(unseen))
+            pairs = [(inf.source_skill.lower(), inf.target_skill.lower(), inf) for inf in new]
+            if any(source not in sources or target not in targets for source, target, _ in pairs):
+                # Skills renamed in the answer ("ML" for "machine learning"):
+                # silence about a pair is then no verdict either
+                complete = False
+            asked = set(unseen)
+            new = [inf for source, target, inf in pairs if (source, target) in asked]
+            # A cut-short answer says nothing about the pairs it never reached
+            answered = unseen if complete else [
+                (inf.source_skill.lower(), inf.target_skill.lower()) for inf in new
+            ]
+            self.pair_store.record(answered, new)
+            inferences.extend(new)
+
+        inferences.sort(key=lambda inf: (inf.source_skill.lower(), inf.target_skill.lower()))
+        if new is not None and complete:
+            self.cache.set(key, inferences)
+        return list(inferences)
+
+    def _build_prompt(self, candidate_skills: List[str], job_skills: List[str]) -> str:
+        print("🔄 Calling LLM for transferable skills analysis...")
         prompt = TRANSFERABLE_SKILL_PROMPT.format(
             candidate_skills=candidate_skills,
             job_skills=job_skills
         )
         print(f"📋 Prompt length: {len(prompt)} characters")
+        return prompt
 
-        print("🔄 Calling LLM for transferable skills analysis...")
-        raw = self.llm.generate(prompt)
+    def _parse_response(self, raw: str) -> Tuple[List[TransferableSkillInference] | None, bool]:
+        """
+        Parse the LLM output into inferences: (inferences, complete).
+        inferences is None when the output is unusable; complete is False
+        when it was cut short or some entries did not validate, in which
+        case only the inferences it completed are returned.
+        """
         print(f"📤 LLM response length: {len(raw)} characters")
         print(f"📤 Raw response preview: {raw[:200]}...")
-        
-        # Check if response is truncated
-        if len(raw) < 100:
-            print("⚠️ Response seems very short, might be truncated")
-        if not raw.strip().endswith(']') and not raw.strip().endswith('}'):
-            print("⚠️ Response doesn't end with complete JSON")
 
         try:
-            print("🔍 Parsing JSON response...")
-            
-            # Clean the response - remove markdown code blocks if present
-            cleaned_raw = raw.strip()
-            if cleaned_raw.startswith('```json'):
-                cleaned_raw = cleaned_raw[7:]  # Remove ```json
-            if cleaned_raw.startswith('```'):
-                cleaned_raw = cleaned_raw[3:]   # Remove ```
-            if cleaned_raw.endswith('```'):
-                cleaned_raw = cleaned_raw[:-3]  # Remove trailing ```
-            cleaned_raw = cleaned_raw.strip()
-            
-            print(f"🧹 Cleaned response preview: {cleaned_raw[:200]}...")
-            
-            # Try to fix incomplete JSON
-            if not cleaned_raw.endswith(']') and not cleaned_raw.endswith('}'):
-                print("🔧 Attempting to fix incomplete JSON...")
-                
-                # Find the last complete object and truncate there
-                lines = cleaned_raw.split('\n')
-                fixed_lines = []
-                brace_count = 0
-                bracket_count = 0
-                in_string = False
-                escape_next = False
-                
-                for line in lines:
-                    line_fixed = line
-                    for char in line:
-                        if escape_next:
-                            escape_next = False
-                            continue
-                        if char == '\\':
-                            escape_next = True
-                            continue
-                        if char == '"' and not escape_next:
-                            in_string = not in_string
-                            continue
-                        if not in_string:
-                            if char == '{':
-                                brace_count += 1
-                            elif char == '}':
-                                brace_count -= 1
-                            elif char == '[':
-                                bracket_count += 1
-                            elif char == ']':
-                                bracket_count -= 1
-                    
-                    # Keep this line if we're still in a valid structure
-                    if brace_count >= 0 and bracket_count >= 0:
-                        fixed_lines.append(line)
-                    else:
-                        break
-                
-                cleaned_raw = '\n'.join(fixed_lines)
-                
-                # Close any remaining structures
-                if brace_count > 0:
-                    cleaned_raw += '\n' + '  ' * (brace_count - 1) + '}'
-                if bracket_count > 0:
-                    cleaned_raw += '\n]'
-                    
-                print(f"🔧 Fixed response preview: {cleaned_raw[:200]}...")
-            
-            parsed = json.loads(cleaned_raw)
-            
-            # Handle different response formats
-            if isinstance(parsed, dict):
-                if 'transferable_skills' in parsed:
-                    inferences = parsed['transferable_skills']
-                elif 'job_fit_assessment' in parsed and 'transferable_skills' in parsed['job_fit_assessment']:
-                    inferences = parsed['job_fit_assessment']['transferable_skills']
-                elif isinstance(parsed, list):
-                    inferences = parsed
-                else:
-                    # Try to extract any list from the response
-                    inferences = []
-                    for key, value in parsed.items():
-                        if isinstance(value, list):
-                            inferences = value
-                            break
-            else:
-                inferences = parsed
-                
-            result = [TransferableSkillInference(**p) for p in inferences]
-            return result
-        except Exception as e:
+            parsed, intact = salvage_json(raw)
+        except ValueError as e:
             print(f"❌ Failed to parse LLM response: {e}")
             print(f"   Raw response: {raw}")
-            print(f"   Cleaned response: {cleaned_raw if 'cleaned_raw' in locals() else 'N/A'}")
-            return []
+            return None, False
+        if not intact:
+            print("🔧 Response is truncated or malformed, keeping its complete entries")
+
+        entries = _entries(parsed)
+        if entries is None:
+            print(f"❌ Unexpected LLM response format: {raw[:200]}...")
+            return None, False
+
+        inferences = []
+        for entry in entries:
+            intact = _add_inference(inferences, entry) and intact
+        return inferences, intact
+
+    async def _astream_response(self, prompt: str) -> Tuple[List[TransferableSkillInference] | None, bool]:
+        """
+        _parse_response() over the streamed answer: each entry of a
+        top-level array is validated as soon as it closes, while the rest
+        of the answer is still being generated.
+        """
+        parser = JSONStreamParser()
+        inferences: List[TransferableSkillInference] = []
+        valid = True
+        chunks = []
+        async for chunk in self.llm.agenerate_stream(prompt):
+            chunks.append(chunk)
+            for entry in parser.feed(chunk):
+                valid = _add_inference(inferences, entry) and valid
+
+        raw = "".join(chunks)
+        print(f"📤 LLM response length: {len(raw)} characters")
+        try:
+            parsed = parser.close()
+        except ValueError as e:
+            print(f"❌ Failed to parse LLM response: {e}")
+            print(f"   Raw response: {raw}")
+            return None, False
+        if not parser.intact:
+            print("🔧 Response is truncated or malformed, keeping its complete entries")
+
+        if not isinstance(parsed, list):
+            # An object around the list: its entries only arrive with close()
+            entries = _entries(parsed)
+            if entries is None:
+                print(f"❌ Unexpected LLM response format: {raw[:200]}...")
+                return None, False
+            for entry in entries:
+                valid = _add_inference(inferences, entry) and valid
+        return inferences, valid and parser.intact
+
+
+def _entries(parsed) -> list | None:
+    """The list of inference entries in a parsed answer, whatever its format."""
+    if isinstance(parsed, dict):
+        if 'transferable_skills' in parsed:
+            entries = parsed['transferable_skills']
+        elif isinstance(parsed.get('job_fit_assessment'), dict) and 'transferable_skills' in parsed['job_fit_assessment']:
+            entries = parsed['job_fit_assessment']['transferable_skills']
+        else:
+            # Try to extract any list from the response
+            entries = next((value for value in parsed.values() if isinstance(value, list)), [])
+    else:
+        entries = parsed
+    return entries if isinstance(entries, list) else None
+
+
+def _add_inference(inferences: List[TransferableSkillInference], entry) -> bool:
+    """Validate one answer entry into `inferences`; False if it was skipped."""
+    try:
+        inferences.append(TransferableSkillInference(**entry))
+    except Exception as e:
+        print(f"⚠️ Skipping invalid inference {entry!r}: {e}")
+        return False
+    return True
+
+
+def _pair_store_path(llm: LLMBackend) -> str:
+    """SKILL_PAIR_DB, except for the stub backend, whose verdicts must not reach it."""
+    from app.core.stub_llm import StubLLMBackend
+    if isinstance(llm, StubLLMBackend):
+        return os.getenv("SKILL_PAIR_STUB_DB", ":memory:")
+    return os.getenv("SKILL_PAIR_DB", "data/skill_pairs.sqlite")
+
+
+def _verdict_version(llm: LLMBackend) -> str:
+    """Model and prompt the verdicts come from; negatives from others are not trusted."""
+    # RecordingBackend wraps the real client
+    llm = getattr(llm, "inner", llm)
+    model = getattr(llm, "model_name", type(llm).__name__)
+    prompt = hashlib.sha256(TRANSFERABLE_SKILL_PROMPT.encode("utf-8")).hexdigest()[:12]
+    return f"{model}:{prompt}"
+
+
+def _memo_key(candidate_skills: Iterable[str], job_skills: Iterable[str]):
+    return canonical_skill_set(candidate_skills), canonical_skill_set(job_skills)
+
+
+def _recase(
+    inferences: List[TransferableSkillInference],
+    candidate_skills: Iterable[str],
+    job_skills: Iterable[str]
+) -> List[TransferableSkillInference]:
+    """
+    Inferences named as the caller spelled the skills: the memo and the
+    pair store work on lowercased names, the LLM on whatever it answered.
+    """
+    sources, targets = _spellings(candidate_skills), _spellings(job_skills)
+    recased = []
+    for inf in inferences:
+        source = sources.get(inf.source_skill.lower(), inf.source_skill)
+        target = targets.get(inf.target_skill.lower(), inf.target_skill)
+        if (source, target) != (inf.source_skill, inf.target_skill):
+            inf = inf.model_copy(update={"source_skill": source, "target_skill": target})
+        recased.append(inf)
+    return recased
+
+
+def _spellings(skills: Iterable[str]) -> Dict[str, str]:
+    """Canonical name -> the caller's first spelling of it."""
+    spellings: Dict[str, str] = {}
+    for skill in skills:
+        if skill and skill.strip():
+            spellings.setdefault(skill.strip().lower(), skill.strip())
+    return spellings
+
+
+def _unseen_skills(unseen: List[Tuple[str, str]]) -> Tuple[List[str], List[str]]:
+    """Candidate and job skills that appear in at least one unseen pair."""
+    return (
+        sorted({source for source, _ in unseen}),
+        sorted({target for _, target in unseen}),
+    )
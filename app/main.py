@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 
-from app.api import resume, job, compare, compare_v2, compare_v3
+from app.api import resume, job, compare, compare_v2, compare_v3, search, metrics
 
 app = FastAPI(title="Career Intelligence Assistant")
 
@@ -12,3 +12,9 @@ app.include_router(compare.router)
 # Phase 2 endpoints
 app.include_router(compare_v2.router)
 app.include_router(compare_v3.router)
+
+# Skill search
+app.include_router(search.router)
+
+# Operational metrics
+app.include_router(metrics.router)
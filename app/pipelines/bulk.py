@@ -0,0 +1,389 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from app.core.llm_backend import get_llm_backend
+from app.core.rate_limit import BATCH, llm_priority
+from app.core.segmentation import segment_resume
+from app.pipelines.resume_pipeline import ResumeExtractionPipeline, resume_to_profile
+from app.store import get_store
+
+
+SUPPORTED_SUFFIXES = {".pdf", ".docx"}
+
+# Upper bounds on what one bulk upload may unpack to
+MAX_FILES = int(os.getenv("INGEST_MAX_FILES", "10000"))
+MAX_FILE_BYTES = int(os.getenv("INGEST_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+MAX_BATCH_BYTES = int(os.getenv("INGEST_MAX_BATCH_BYTES", str(2 * 1024 * 1024 * 1024)))
+
+# Uploads are refused, and staging stops, once the staging disk is this full
+MAX_DISK_USAGE = float(os.getenv("INGEST_MAX_DISK_USAGE", "0.9"))
+
+# Finished batches are forgotten after this many seconds
+BATCH_TTL = float(os.getenv("INGEST_BATCH_TTL", "86400"))
+
+
+# -----------------------------
+# Batch bookkeeping
+# -----------------------------
+
+class BatchItem:
+    """One file of a batch; status goes queued -> parsing -> extracting -> done | failed."""
+
+    def __init__(self, index: int, filename: str, path: str):
+        self.index = index
+        self.filename = filename
+        self.path = path
+        self.status = "queued"
+        self.candidate_id: Optional[str] = None
+        self.engine: Optional[str] = None
+        self.extracted: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def as_dict(self) -> Dict:
+        return {
+            "index": self.index,
+            "filename": self.filename,
+            "status": self.status,
+            "candidate_id": self.candidate_id,
+            "engine": self.engine,
+            "error": self.error,
+            "seconds": (
+                self.finished_at - self.started_at
+                if self.started_at and self.finished_at else None
+            ),
+        }
+
+
+class Batch:
+    def __init__(self, batch_id: str, items: List[BatchItem], staging_dir: str, skipped: List[Dict]):
+        self.batch_id = batch_id
+        self.items = items
+        self.staging_dir = staging_dir
+        self.skipped = skipped
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._remaining = len(items)
+        self._lock = threading.Lock()
+
+    def item_finished(self) -> bool:
+        """Count one finished item; True once the whole batch is finished."""
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining == 0:
+                self.finished_at = time.time()
+                return True
+            return False
+
+    def progress(self) -> Dict:
+        counts = {"queued": 0, "parsing": 0, "extracting": 0, "done": 0, "failed": 0}
+        for item in self.items:
+            counts[item.status] += 1
+
+        total = len(self.items)
+        finished = counts["done"] + counts["failed"]
+        elapsed = (self.finished_at or time.time()) - self.created_at
+        return {
+            "batch_id": self.batch_id,
+            "status": "completed" if self.finished_at or not total else (
+                "queued" if counts["queued"] == total else "running"
+            ),
+            "total": total,
+            "finished": finished,
+            "percent": round(100 * finished / total, 1) if total else 100.0,
+            "counts": counts,
+            "skipped": self.skipped,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": round(elapsed, 3),
+            "resumes_per_minute": round(60 * finished / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+# -----------------------------
+# Upload staging
+# -----------------------------
+
+class StagingDiskFull(RuntimeError):
+    """The staging disk is fuller than INGEST_MAX_DISK_USAGE; try again later."""
+
+
+def stage_uploads(uploads: List[Tuple[str, BinaryIO]]) -> Tuple[str, List[Tuple[str, str]], List[Dict]]:
+    """
+    Copy uploaded files (and every resume inside uploaded zips) into a new
+    staging directory, within the per-file, file-count and total-bytes
+    limits. Raises StagingDiskFull if the disk is already over
+    MAX_DISK_USAGE; files reached after it fills up are skipped. Any
+    other error removes the staging directory before propagating.
+
+    Returns:
+        (staging_dir, [(original filename, staged path)], [skipped file + reason])
+    """
+    if _disk_full(tempfile.gettempdir()):
+        raise StagingDiskFull(f"Staging disk is over {MAX_DISK_USAGE:.0%} full")
+
+    staging = _Staging(tempfile.mkdtemp(prefix="bulk_ingest_"))
+    try:
+        for filename, fileobj in uploads:
+            staging.add_upload(filename, fileobj)
+    except BaseException:
+        # A failed copy or archive read leaves no directory behind
+        shutil.rmtree(staging.dir, ignore_errors=True)
+        raise
+    return staging.dir, staging.files, staging.skipped
+
+
+class _Staging:
+    """One upload's staging directory and what went into it (or did not)."""
+
+    def __init__(self, staging_dir: str):
+        self.dir = staging_dir
+        self.files: List[Tuple[str, str]] = []
+        self.skipped: List[Dict] = []
+        self.bytes = 0
+
+    def add_upload(self, filename: str, fileobj: BinaryIO) -> None:
+        if Path(filename).suffix.lower() == ".zip":
+            try:
+                archive = zipfile.ZipFile(fileobj)
+            except zipfile.BadZipFile:
+                self.skip(filename, "not a valid zip archive")
+                return
+            with archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    member = info.filename
+                    name = Path(member).name
+                    if member.startswith("__MACOSX/") or name.startswith("."):
+                        continue
+                    if info.file_size > MAX_FILE_BYTES:
+                        self.skip(member, "file too large")
+                        continue
+                    if info.file_size > MAX_BATCH_BYTES - self.bytes:
+                        self.skip(member, f"batch limit of {MAX_BATCH_BYTES} bytes reached")
+                        continue
+                    with archive.open(info) as source:
+                        self.add_file(member, source)
+            return
+
+        self.add_file(filename, fileobj)
+
+    def add_file(self, filename: str, source: BinaryIO) -> None:
+        suffix = Path(filename).suffix.lower()
+        if suffix not in SUPPORTED_SUFFIXES:
+            self.skip(filename, f"unsupported format: {suffix or 'none'}")
+            return
+        if len(self.files) >= MAX_FILES:
+            self.skip(filename, f"batch limit of {MAX_FILES} files reached")
+            return
+        if _disk_full(self.dir):
+            self.skip(filename, f"staging disk over {MAX_DISK_USAGE:.0%} full")
+            return
+
+        # Staged under a generated name: archive paths never leave staging_dir
+        path = os.path.join(self.dir, f"{len(self.files):06d}{suffix}")
+        limit = min(MAX_FILE_BYTES, MAX_BATCH_BYTES - self.bytes)
+        with open(path, "wb") as target:
+            copied = _copy_limited(source, target, limit)
+        if copied is None:
+            os.remove(path)
+            too_large = limit == MAX_FILE_BYTES
+            self.skip(filename, "file too large" if too_large else f"batch limit of {MAX_BATCH_BYTES} bytes reached")
+            return
+        self.bytes += copied
+        self.files.append((filename, path))
+
+    def skip(self, filename: str, reason: str) -> None:
+        self.skipped.append({"filename": filename, "reason": reason})
+
+
+def _disk_full(path: str) -> bool:
+    usage = shutil.disk_usage(path)
+    return usage.used >= usage.total * MAX_DISK_USAGE
+
+
+def _copy_limited(source: BinaryIO, target: BinaryIO, limit: int) -> Optional[int]:
+    copied = 0
+    while True:
+        chunk = source.read(1024 * 1024)
+        if not chunk:
+            return copied
+        copied += len(chunk)
+        if copied > limit:
+            return None
+        target.write(chunk)
+
+
+# -----------------------------
+# Ingestion queue
+# -----------------------------
+
+class BulkIngestionQueue:
+    """
+    Background ingestion for bulk uploads.
+
+    Runs its own event loop in a daemon thread, so batches keep moving
+    independently of HTTP requests. `workers` resumes are in flight at
+    once; within that, CPU-bound parsing is bounded by the size of the
+    parse pool and LLM extraction by `llm_concurrency`. LLM calls run at
+    BATCH priority, behind interactive and per-upload traffic.
+    """
+
+    def __init__(
+        self,
+        workers: int = 32,
+        parse_workers: Optional[int] = None,
+        llm_concurrency: int = 16,
+        llm=None,
+        store=None,
+    ):
+        self.workers = workers
+        self.parse_workers = parse_workers or os.cpu_count() or 4
+        self.llm_concurrency = llm_concurrency
+        self.llm = llm
+        self.store = store
+        self.batches: Dict[str, Batch] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._parse_pool = ThreadPoolExecutor(self.parse_workers, thread_name_prefix="ingest-parse")
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+
+    def submit(
+        self,
+        files: List[Tuple[str, str]],
+        staging_dir: str,
+        skipped: Optional[List[Dict]] = None
+    ) -> Batch:
+        """Queue staged (filename, path) files as a new batch; staging_dir is removed when it finishes."""
+        self._ensure_started()
+        self._prune()
+
+        items = [BatchItem(i, filename, path) for i, (filename, path) in enumerate(files)]
+        batch = Batch(uuid.uuid4().hex, items, staging_dir, skipped or [])
+        with self._lock:
+            self.batches[batch.batch_id] = batch
+
+        if not items:
+            batch.finished_at = time.time()
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        for item in items:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (batch, item))
+        return batch
+
+    def get(self, batch_id: str) -> Optional[Batch]:
+        return self.batches.get(batch_id)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "parse_workers": self.parse_workers,
+            "llm_concurrency": self.llm_concurrency,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": len(self.batches),
+        }
+
+    # -----------------------------
+    # Worker loop
+    # -----------------------------
+
+    def _ensure_started(self) -> None:
+        if self._loop is not None:
+            return
+        with self._lock:
+            if self._loop is not None:
+                return
+            ready = threading.Event()
+            threading.Thread(
+                target=self._run_loop, args=(ready,), name="ingest-loop", daemon=True
+            ).start()
+            ready.wait()
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._queue = asyncio.Queue()
+        self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        for _ in range(self.workers):
+            loop.create_task(self._worker())
+        self._loop = loop
+        ready.set()
+        loop.run_forever()
+
+    async def _worker(self) -> None:
+        pipeline = ResumeExtractionPipeline(self.llm or get_llm_backend())
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, item = await self._queue.get()
+            try:
+                await self._process(loop, pipeline, item)
+            finally:
+                self._queue.task_done()
+                if batch.item_finished():
+                    shutil.rmtree(batch.staging_dir, ignore_errors=True)
+                    print(f"📦 Batch {batch.batch_id} finished: {batch.progress()['counts']}")
+
+    async def _process(self, loop, pipeline: ResumeExtractionPipeline, item: BatchItem) -> None:
+        item.started_at = time.time()
+        try:
+            item.status = "parsing"
+            document = await loop.run_in_executor(self._parse_pool, pipeline.extract, item.path)
+            item.engine = document.engine
+            sections = segment_resume(document.text)
+
+            item.status = "extracting"
+            async with self._llm_slots:
+                with llm_priority(BATCH):
+                    result = await pipeline.astructure(sections)
+
+            profile = resume_to_profile(result)
+            await loop.run_in_executor(None, (self.store or get_store()).save_profile, profile)
+        except Exception as e:
+            print(f"❌ Bulk ingestion failed for {item.filename}: {e}")
+            item.status = "failed"
+            item.error = f"{type(e).__name__}: {e}"
+        else:
+            item.candidate_id = profile.candidate_id
+            item.extracted = result.model_dump()
+            item.status = "done"
+        finally:
+            item.finished_at = time.time()
+            try:
+                os.remove(item.path)
+            except OSError:
+                pass
+
+    def _prune(self) -> None:
+        cutoff = time.time() - BATCH_TTL
+        with self._lock:
+            for batch_id in [
+                batch_id for batch_id, batch in self.batches.items()
+                if batch.finished_at and batch.finished_at < cutoff
+            ]:
+                del self.batches[batch_id]
+
+
+@lru_cache(maxsize=1)
+def get_ingestion_queue() -> BulkIngestionQueue:
+    """Process-wide queue configured from INGEST_WORKERS / INGEST_PARSE_WORKERS / INGEST_LLM_CONCURRENCY."""
+    parse_workers = os.getenv("INGEST_PARSE_WORKERS")
+    return BulkIngestionQueue(
+        workers=int(os.getenv("INGEST_WORKERS", "32")),
+        parse_workers=int(parse_workers) if parse_workers else None,
+        llm_concurrency=int(os.getenv("INGEST_LLM_CONCURRENCY", "16")),
+    )
@@ -1,16 +1,157 @@
-from app.core.ingestion import extract_text
-from app.core.segmentation import segment_resume
-from app.core.extraction import extract_resume_structured
+import asyncio
+import datetime
+import threading
+import uuid
+from typing import Dict, Optional, Union
+
+from app.core.ingestion import DocumentStream, ExtractedText, Source, extract_document
+from app.core.ingestion_pool import PooledDocumentStream, get_ingestion_pool, get_max_pages
+from app.core.segmentation import IncrementalSegmenter, segment_resume
+from app.core.extraction import (
+    IncrementalExtraction,
+    aextract_resume_structured,
+    extract_resume_structured,
+)
 from app.core.normalize import normalize_resume
 from app.core.schemas.resume_schema import ResumeSchema
+from app.core.models import ProfessionalProfile, Skill, Experience
 
 class ResumeExtractionPipeline:
     def __init__(self, llm_client):
         self.llm = llm_client
 
-    def run(self, file_path: str) -> ResumeSchema:
-        raw_text = extract_text(file_path)
-        sections = segment_resume(raw_text)
+    def run(self, source: Source, suffix: Optional[str] = None) -> ResumeSchema:
+        """`source` is a path, or the file's content with its `suffix` (see ingestion.extract_text)."""
+        sections = self.parse(source, suffix)
         extracted = extract_resume_structured(sections, self.llm)
         normalized = normalize_resume(extracted)
         return ResumeSchema.model_validate(normalized)
+
+    async def arun(self, source: Source, suffix: Optional[str] = None) -> ResumeSchema:
+        """
+        Non-blocking run() that overlaps parsing with LLM extraction.
+
+        Pages (PDF) or paragraphs (DOCX) are read in a thread, from the
+        ingestion process pool when enabled, and segmented as they arrive;
+        a section's LLM call starts as soon as the next header closes it
+        instead of after the whole file is parsed. The result is the same
+        as run()'s.
+        """
+        loop = asyncio.get_running_loop()
+        pages: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        segmenter = IncrementalSegmenter()
+        extraction = IncrementalExtraction(self.llm)
+        reader = asyncio.ensure_future(
+            asyncio.to_thread(self._read_pages, source, suffix, loop, pages, stop)
+        )
+
+        try:
+            while (chunk := await pages.get()) is not None:
+                for name, text in segmenter.feed(chunk):
+                    extraction.section_closed(name, text)
+            document = await reader
+            print(f"📄 Extracted {document.pages} page(s) with {document.engine}")
+
+            if extraction.started_early:
+                print(f"⚡ {extraction.started_early} section extraction(s) started before parsing finished")
+            extracted = await extraction.finish(segmenter.sections())
+        except BaseException:
+            stop.set()
+            extraction.cancel()
+            raise
+
+        normalized = normalize_resume(extracted)
+        return ResumeSchema.model_validate(normalized)
+
+    # Stages, for callers that bound parsing and LLM work separately
+
+    @staticmethod
+    def extract(source: Source, suffix: Optional[str] = None) -> ExtractedText:
+        """CPU-bound stage: file -> plain text (and the engine that produced it)."""
+        pool = get_ingestion_pool()
+        if pool is not None:
+            document = pool.extract_document(source, suffix)
+        else:
+            document = extract_document(source, get_max_pages(), suffix=suffix)
+        print(f"📄 Extracted {document.pages} page(s) with {document.engine}")
+        return document
+
+    @staticmethod
+    def iter_document(source: Source, suffix: Optional[str] = None) -> Union[DocumentStream, PooledDocumentStream]:
+        """CPU-bound stage, one page (PDF) or paragraph (DOCX) at a time."""
+        pool = get_ingestion_pool()
+        if pool is not None:
+            return pool.iter_document(source, suffix)
+        return DocumentStream(source, get_max_pages(), suffix=suffix)
+
+    @staticmethod
+    def _read_pages(source: Source, suffix: Optional[str], loop, pages: asyncio.Queue, stop: threading.Event):
+        """Feed the document's pieces to `pages` (None at the end); runs in a thread."""
+        stream = ResumeExtractionPipeline.iter_document(source, suffix)
+        try:
+            for chunk in stream:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(pages.put_nowait, chunk)
+        finally:
+            loop.call_soon_threadsafe(pages.put_nowait, None)
+        return stream
+
+    @staticmethod
+    def parse(source: Source, suffix: Optional[str] = None) -> Dict[str, str]:
+        """CPU-bound stage: file -> segmented sections."""
+        return segment_resume(ResumeExtractionPipeline.extract(source, suffix).text)
+
+    async def astructure(self, sections: Dict[str, str]) -> ResumeSchema:
+        """IO-bound stage: sections -> validated resume via the LLM."""
+        extracted = await aextract_resume_structured(sections, self.llm)
+        normalized = normalize_resume(extracted)
+        return ResumeSchema.model_validate(normalized)
+
+
+def resume_to_profile(result: ResumeSchema, candidate_id: str | None = None) -> ProfessionalProfile:
+    """Convert an extracted resume to the ProfessionalProfile used for matching."""
+    candidate_id = candidate_id or f"candidate_{uuid.uuid4().hex[:8]}"
+
+    # Convert skills
+    skills = []
+    for skill_name in result.skills.programming + result.skills.ml + result.skills.tools:
+        skills.append(Skill(name=skill_name, level="intermediate"))  # Default level
+
+    # Convert experience
+    experiences = []
+    for exp in result.experience:
+        # Calculate duration years from start/end dates
+        duration_years = None
+        try:
+            if exp.start_date and exp.end_date:
+                # Simple year calculation - could be improved
+                start_year = int(exp.start_date.split('/')[-1]) if '/' in exp.start_date else 0
+                if exp.end_date.lower() == 'current':
+                    end_year = datetime.datetime.now().year
+                else:
+                    end_year = int(exp.end_date.split('/')[-1]) if '/' in exp.end_date else 0
+                duration_years = max(0, end_year - start_year)
+        except:
+            pass
+
+        experiences.append(Experience(
+            title=exp.role or "Unknown Role",
+            company=exp.company or "Unknown Company",
+            duration_years=duration_years,
+            skills_used=exp.tech_stack or [],
+            description="; ".join(exp.responsibilities[:3]) if exp.responsibilities else ""
+        ))
+
+    return ProfessionalProfile(
+        candidate_id=candidate_id,
+        name=result.personal.name or "Unknown Name",
+        email=result.personal.email or "",
+        phone=result.personal.phone or "",
+        title=result.experience[0].role if result.experience and result.experience[0].role else "Professional",
+        total_experience_years=len(result.experience),  # Simple count as placeholder
+        skills=skills,
+        experiences=experiences,
+        summary=result.personal.location or ""  # Using location as summary for now
+    )
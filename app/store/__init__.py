@@ -0,0 +1,26 @@
+import os
+from functools import lru_cache
+
+from app.store.base import Store
+
+
+@lru_cache(maxsize=None)
+def get_store() -> Store:
+    """
+    Process-wide store selected by STORE_BACKEND:
+    "memory" (default) or "sqlite" (STORE_PATH, STORE_POOL_SIZE).
+    """
+    backend = os.getenv("STORE_BACKEND", "memory").lower()
+
+    if backend == "memory":
+        from app.store.memory import InMemoryStore
+        return InMemoryStore()
+
+    if backend == "sqlite":
+        from app.store.sqlite import SqliteStore
+        return SqliteStore(
+            os.getenv("STORE_PATH", "data/store.sqlite"),
+            pool_size=int(os.getenv("STORE_POOL_SIZE", "8")),
+        )
+
+    raise ValueError(f"Unsupported store backend: {backend}")
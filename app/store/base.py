@@ -0,0 +1,177 @@
+import abc
+import threading
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Set, Tuple
+
+from app.core.matching import SkillMatrix
+from app.core.models import ProfessionalProfile, JobRequirement
+from app.core.reasoning_models import TransferableSkillInference
+from app.store.index import InvertedIndex
+
+
+class _ReadWriteLock:
+    """Many readers or one writer; a waiting writer holds back new readers."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class Store(abc.ABC):
+    """
+    Storage interface for profiles, jobs and transferable inferences.
+
+    Backends implement the persistence primitives (_write_* / get_* /
+    list_*). The derived in-process views used for ranking and search
+    (SkillMatrix + inverted indexes) are maintained here, fed by the rows
+    each backend reports as new from _pull_changes. Readers hold the
+    views' read lock for the whole rank/query, so a concurrent sync()
+    (upsert, compaction) never changes them mid-read.
+    """
+
+    def __init__(self):
+        self.profile_matrix = SkillMatrix()
+        self.profile_index = InvertedIndex()   # skill -> candidate_ids
+        self.job_index = InvertedIndex()       # skill -> job_ids (required + preferred)
+        self._sync_lock = threading.Lock()
+        self._views_lock = _ReadWriteLock()
+
+    # -----------------------------
+    # Backend primitives
+    # -----------------------------
+
+    @abc.abstractmethod
+    def get_profile(self, candidate_id: str) -> Optional[ProfessionalProfile]:
+        ...
+
+    @abc.abstractmethod
+    def list_profiles(self) -> List[ProfessionalProfile]:
+        ...
+
+    @abc.abstractmethod
+    def get_job(self, job_id: str) -> Optional[JobRequirement]:
+        ...
+
+    @abc.abstractmethod
+    def list_jobs(self) -> List[JobRequirement]:
+        ...
+
+    @abc.abstractmethod
+    def get_transferable(
+        self, candidate_id: str, job_id: str
+    ) -> List[TransferableSkillInference]:
+        ...
+
+    @abc.abstractmethod
+    def save_transferable(
+        self,
+        candidate_id: str,
+        job_id: str,
+        inferences: List[TransferableSkillInference]
+    ) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _write_profiles(self, profiles: List[ProfessionalProfile]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _write_jobs(self, jobs: List[JobRequirement]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _pull_changes(self) -> Tuple[List[ProfessionalProfile], List[JobRequirement]]:
+        """
+        Rows written since the last call, including writes made by other
+        processes. Backends whose data only changes through this object
+        return what _write_* just stored.
+        """
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def save_profile(self, profile: ProfessionalProfile) -> None:
+        self.save_profiles([profile])
+
+    def save_profiles(self, profiles: Iterable[ProfessionalProfile]) -> None:
+        """Bulk insert/overwrite. Derived views catch up on the next sync()."""
+        self._write_profiles(list(profiles))
+
+    def save_job(self, job: JobRequirement) -> None:
+        self.save_jobs([job])
+
+    def save_jobs(self, jobs: Iterable[JobRequirement]) -> None:
+        self._write_jobs(list(jobs))
+
+    # -----------------------------
+    # Derived views
+    # -----------------------------
+
+    def sync(self) -> None:
+        """
+        Bring the matrix and indexes up to date with the backend.
+        Called lazily before every rank/search, not on each write.
+        """
+        with self._sync_lock:
+            profiles, jobs = self._pull_changes()
+            if not profiles and not jobs:
+                return
+            with self._views_lock.write():
+                if profiles:
+                    self.profile_matrix.upsert_many(profiles)
+                    for profile in profiles:
+                        self.profile_index.add(profile.candidate_id, (s.name for s in profile.skills))
+                for job in jobs:
+                    self.job_index.add(job.job_id, job.required_skills + job.preferred_skills)
+
+    def rank(
+        self,
+        job: JobRequirement,
+        limit: Optional[int] = None,
+        min_score: float = 0.0
+    ) -> Tuple[int, List[Tuple[float, ProfessionalProfile]]]:
+        self.sync()
+        with self._views_lock.read():
+            return self.profile_matrix.rank(job, limit=limit, min_score=min_score)
+
+    def search_candidates(self, all_of=(), any_of=(), none_of=()) -> Set[str]:
+        self.sync()
+        with self._views_lock.read():
+            return self.profile_index.query(all_of=all_of, any_of=any_of, none_of=none_of)
+
+    def search_jobs(self, all_of=(), any_of=(), none_of=()) -> Set[str]:
+        self.sync()
+        with self._views_lock.read():
+            return self.job_index.query(all_of=all_of, any_of=any_of, none_of=none_of)
@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, FrozenSet, Iterable, Set
+
+
+def normalize_skill(skill: str) -> str:
+    return skill.strip().lower()
+
+
+class InvertedIndex:
+    """
+    Maps normalized skill -> set of document ids (candidate or job ids).
+
+    add() replaces a document's previous postings, so overwriting a profile
+    or job never leaves stale entries behind.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, doc_id: str, skills: Iterable[str]) -> None:
+        terms = frozenset(normalize_skill(s) for s in skills if s and s.strip())
+        with self._lock:
+            self._unlink(doc_id)
+            self._terms[doc_id] = terms
+            for term in terms:
+                self._postings.setdefault(term, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._unlink(doc_id)
+            self._terms.pop(doc_id, None)
+
+    def postings(self, skill: str) -> Set[str]:
+        with self._lock:
+            return set(self._postings.get(normalize_skill(skill), ()))
+
+    def query(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> Set[str]:
+        """
+        Boolean skill filter:
+        every skill in all_of AND at least one of any_of AND none of none_of.
+        Empty all_of/any_of impose no constraint.
+        """
+        all_of = [normalize_skill(s) for s in all_of]
+        any_of = [normalize_skill(s) for s in any_of]
+        none_of = [normalize_skill(s) for s in none_of]
+
+        with self._lock:
+            if all_of:
+                # Intersect starting from the shortest posting list
+                lists = sorted(
+                    (self._postings.get(term, set()) for term in all_of), key=len
+                )
+                result = set(lists[0]).intersection(*lists[1:])
+            else:
+                result = set(self._terms)
+
+            if any_of:
+                result &= set().union(*(self._postings.get(term, ()) for term in any_of))
+
+            for term in none_of:
+                result -= self._postings.get(term, set())
+
+        return result
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _unlink(self, doc_id: str) -> None:
+        for term in self._terms.get(doc_id, ()):
+            docs = self._postings.get(term)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self._postings[term]
@@ -1,7 +1,57 @@
-from typing import Dict, Tuple, List
+import threading
+from typing import Dict, Tuple, List, Optional
 from app.core.models import ProfessionalProfile, JobRequirement
 from app.core.reasoning_models import TransferableSkillInference
+from app.store.base import Store
 
-profiles: Dict[str, ProfessionalProfile] = {}
-jobs: Dict[str, JobRequirement] = {}
-transferable_store: Dict[Tuple[str, str], List[TransferableSkillInference]] = {}
+
+class InMemoryStore(Store):
+    """Process-local dicts; state is lost on restart and not shared across workers."""
+
+    def __init__(self):
+        super().__init__()
+        self.profiles: Dict[str, ProfessionalProfile] = {}
+        self.jobs: Dict[str, JobRequirement] = {}
+        self.transferable_store: Dict[Tuple[str, str], List[TransferableSkillInference]] = {}
+        self._pending: Tuple[List[ProfessionalProfile], List[JobRequirement]] = ([], [])
+        self._pending_lock = threading.Lock()
+
+    def get_profile(self, candidate_id: str) -> Optional[ProfessionalProfile]:
+        return self.profiles.get(candidate_id)
+
+    def list_profiles(self) -> List[ProfessionalProfile]:
+        return list(self.profiles.values())
+
+    def get_job(self, job_id: str) -> Optional[JobRequirement]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[JobRequirement]:
+        return list(self.jobs.values())
+
+    def get_transferable(self, candidate_id: str, job_id: str) -> List[TransferableSkillInference]:
+        return self.transferable_store.get((candidate_id, job_id), [])
+
+    def save_transferable(
+        self,
+        candidate_id: str,
+        job_id: str,
+        inferences: List[TransferableSkillInference]
+    ) -> None:
+        self.transferable_store[(candidate_id, job_id)] = inferences
+
+    def _write_profiles(self, profiles: List[ProfessionalProfile]) -> None:
+        with self._pending_lock:
+            for profile in profiles:
+                self.profiles[profile.candidate_id] = profile
+            self._pending[0].extend(profiles)
+
+    def _write_jobs(self, jobs: List[JobRequirement]) -> None:
+        with self._pending_lock:
+            for job in jobs:
+                self.jobs[job.job_id] = job
+            self._pending[1].extend(jobs)
+
+    def _pull_changes(self) -> Tuple[List[ProfessionalProfile], List[JobRequirement]]:
+        with self._pending_lock:
+            changes, self._pending = self._pending, ([], [])
+        return changes
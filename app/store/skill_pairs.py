@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.reasoning_models import TransferableSkillInference
+
+
+SkillPair = Tuple[str, str]
+
+# How long a "not transferable" verdict is trusted before the pair is asked
+# again (positive verdicts do not expire)
+SKILL_PAIR_NEGATIVE_TTL_DAYS = float(os.getenv("SKILL_PAIR_NEGATIVE_TTL_DAYS", "30"))
+
+
+class SkillPairStore:
+    """
+    Persistent knowledge base of source → target skill transferability.
+
+    Every pair the engine has asked the LLM about is recorded, including
+    pairs judged NOT transferable, so it does not ask again. Those negative
+    verdicts are ignored once older than negative_ttl seconds or when
+    recorded under another `version` (model and prompt), so one bad answer
+    cannot hide a pair for good. Lookups are indexed by source skill
+    (primary key prefix) and by target skill. Skill names are stored
+    lowercased.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        version: str = "",
+        negative_ttl: Optional[float] = None
+    ):
+        self.path = str(path)
+        self.version = version
+        self.negative_ttl = SKILL_PAIR_NEGATIVE_TTL_DAYS * 86400 if negative_ttl is None else negative_ttl
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS skill_pairs ("
+            " source_skill TEXT NOT NULL,"
+            " target_skill TEXT NOT NULL,"
+            " transferable INTEGER NOT NULL,"
+            " justification TEXT,"
+            " confidence REAL,"
+            " updated_at REAL NOT NULL,"
+            " version TEXT NOT NULL DEFAULT '',"
+            " PRIMARY KEY (source_skill, target_skill))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(skill_pairs)")}
+        if "version" not in columns:
+            # Stores written before verdicts were versioned
+            self._conn.execute("ALTER TABLE skill_pairs ADD COLUMN version TEXT NOT NULL DEFAULT ''")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS skill_pairs_target ON skill_pairs(target_skill)"
+        )
+        self._conn.commit()
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+
+    def lookup(
+        self,
+        sources: Iterable[str],
+        targets: Iterable[str]
+    ) -> Dict[SkillPair, Optional[TransferableSkillInference]]:
+        """
+        Known pairs within sources × targets.
+        Value is the inference, or None for pairs known NOT to transfer;
+        stale negative verdicts are left out (unknown).
+        """
+        sources = sorted({s.lower() for s in sources})
+        targets = {t.lower() for t in targets}
+        if not sources or not targets:
+            return {}
+
+        placeholders = ",".join("?" * len(sources))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM skill_pairs WHERE source_skill IN ({placeholders})",
+                sources,
+            ).fetchall()
+
+        stale_before = time.time() - self.negative_ttl
+        return {
+            (row[0], row[1]): self._to_inference(row)
+            for row in rows
+            if row[1] in targets
+            and (row[2] or (row[5] >= stale_before and row[6] == self.version))
+        }
+
+    def by_source(self, skill: str) -> List[TransferableSkillInference]:
+        return self._select("source_skill", skill)
+
+    def by_target(self, skill: str) -> List[TransferableSkillInference]:
+        return self._select("target_skill", skill)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM skill_pairs").fetchone()[0]
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def record(
+        self,
+        pairs: Iterable[SkillPair],
+        inferences: List[TransferableSkillInference]
+    ) -> None:
+        """
+        Record the LLM verdict for every pair that was asked about.
+        Pairs without a matching inference are stored as not transferable.
+        """
+        positive = {
+            (inf.source_skill.lower(), inf.target_skill.lower()): inf
+            for inf in inferences
+        }
+        now = time.time()
+        rows = []
+        for source, target in pairs:
+            inf = positive.get((source, target))
+            rows.append((
+                source,
+                target,
+                1 if inf else 0,
+                inf.justification if inf else None,
+                inf.confidence if inf else None,
+                now,
+                self.version,
+            ))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO skill_pairs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+
+    def _select(self, column: str, skill: str) -> List[TransferableSkillInference]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM skill_pairs WHERE {column} = ? AND transferable = 1",
+                (skill.lower(),),
+            ).fetchall()
+        return [self._to_inference(row) for row in rows]
+
+    @staticmethod
+    def _to_inference(row) -> Optional[TransferableSkillInference]:
+        source, target, transferable, justification, confidence, _, _ = row
+        if not transferable:
+            return None
+        return TransferableSkillInference(
+            source_skill=source,
+            target_skill=target,
+            justification=justification or "",
+            confidence=confidence,
+        )
@@ -0,0 +1,166 @@
+import json
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from app.core.models import ProfessionalProfile, JobRequirement
+from app.core.reasoning_models import TransferableSkillInference
+from app.store.base import Store
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_id TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transferables (
+    candidate_id TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, job_id)
+);
+CREATE INDEX IF NOT EXISTS transferables_job ON transferables(job_id);
+"""
+
+
+class ConnectionPool:
+    """Fixed-size pool of sqlite connections shared across threads."""
+
+    def __init__(self, path: str, size: int = 8, timeout: float = 30.0):
+        self._connections: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            with conn:  # commit on success, rollback on error
+                yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self) -> None:
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+class SqliteStore(Store):
+    """
+    sqlite (WAL mode) backend shared by every worker process on the host.
+
+    Lookups are indexed by candidate_id, job_id and (candidate_id, job_id).
+    Every write gets a new, monotonically increasing seq, so each process
+    catches its matrix/indexes up with other workers' writes by reading
+    rows with seq > the last one it has seen.
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/store.sqlite", pool_size: int = 8):
+        super().__init__()
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.pool = ConnectionPool(self.path, size=pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+        self._profile_seq = 0
+        self._job_seq = 0
+        self.sync()
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+
+    def get_profile(self, candidate_id: str) -> Optional[ProfessionalProfile]:
+        row = self._fetch_one("SELECT data FROM profiles WHERE candidate_id = ?", (candidate_id,))
+        return ProfessionalProfile.model_validate_json(row[0]) if row else None
+
+    def list_profiles(self) -> List[ProfessionalProfile]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT data FROM profiles ORDER BY seq").fetchall()
+        return [ProfessionalProfile.model_validate_json(data) for (data,) in rows]
+
+    def get_job(self, job_id: str) -> Optional[JobRequirement]:
+        row = self._fetch_one("SELECT data FROM jobs WHERE job_id = ?", (job_id,))
+        return JobRequirement.model_validate_json(row[0]) if row else None
+
+    def list_jobs(self) -> List[JobRequirement]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT data FROM jobs ORDER BY seq").fetchall()
+        return [JobRequirement.model_validate_json(data) for (data,) in rows]
+
+    def get_transferable(self, candidate_id: str, job_id: str) -> List[TransferableSkillInference]:
+        row = self._fetch_one(
+            "SELECT data FROM transferables WHERE candidate_id = ? AND job_id = ?",
+            (candidate_id, job_id),
+        )
+        if not row:
+            return []
+        return [TransferableSkillInference(**item) for item in json.loads(row[0])]
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def save_transferable(
+        self,
+        candidate_id: str,
+        job_id: str,
+        inferences: List[TransferableSkillInference]
+    ) -> None:
+        data = json.dumps([inf.model_dump() for inf in inferences])
+        with self.pool.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO transferables (candidate_id, job_id, data) VALUES (?, ?, ?)",
+                (candidate_id, job_id, data),
+            )
+
+    def _write_profiles(self, profiles: List[ProfessionalProfile]) -> None:
+        # REPLACE deletes the old row, so an overwrite gets a fresh seq
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO profiles (candidate_id, data) VALUES (?, ?)",
+                [(p.candidate_id, p.model_dump_json()) for p in profiles],
+            )
+
+    def _write_jobs(self, jobs: List[JobRequirement]) -> None:
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO jobs (job_id, data) VALUES (?, ?)",
+                [(j.job_id, j.model_dump_json()) for j in jobs],
+            )
+
+    def _pull_changes(self) -> Tuple[List[ProfessionalProfile], List[JobRequirement]]:
+        with self.pool.connection() as conn:
+            profile_rows = conn.execute(
+                "SELECT seq, data FROM profiles WHERE seq > ? ORDER BY seq", (self._profile_seq,)
+            ).fetchall()
+            job_rows = conn.execute(
+                "SELECT seq, data FROM jobs WHERE seq > ? ORDER BY seq", (self._job_seq,)
+            ).fetchall()
+
+        if profile_rows:
+            self._profile_seq = profile_rows[-1][0]
+        if job_rows:
+            self._job_seq = job_rows[-1][0]
+
+        return (
+            [ProfessionalProfile.model_validate_json(data) for _, data in profile_rows],
+            [JobRequirement.model_validate_json(data) for _, data in job_rows],
+        )
+
+    def _fetch_one(self, sql: str, params: tuple):
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchone()
@@ -0,0 +1,81 @@
+"""
+Load test: blocking LLM calls in sync handlers vs async LLM calls.
+
+Sync FastAPI handlers run in Starlette's threadpool (40 threads by
+default), so in-flight LLM requests are capped by thread count. The async
+path awaits the SDK's async generation on the event loop instead.
+Both drive a real GeminiClient whose model is a local fake with a fixed
+latency, so no key or network is needed.
+
+Usage:
+    GEMINI_API_KEY=dummy python -m benchmarks.async_load --requests 400 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.llm_client import GeminiClient
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel with a fixed generation latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, prompt, generation_config=None):
+        time.sleep(self.latency)
+        return FakeResponse(f"answer to {prompt}")
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        await asyncio.sleep(self.latency)
+        return FakeResponse(f"answer to {prompt}")
+
+
+def _client(latency: float) -> GeminiClient:
+    # Pool sized well above the request count: measure the handler model only
+    client = GeminiClient(cache=None, pool_size=10_000)
+    client._model = FakeModel(latency)
+    return client
+
+
+async def sync_handlers(n: int, latency: float) -> float:
+    client = _client(latency)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_in_threadpool(client.generate, f"question {i}") for i in range(n)
+    ))
+    return time.perf_counter() - start
+
+
+async def async_handlers(n: int, latency: float) -> float:
+    client = _client(latency)
+    start = time.perf_counter()
+    await asyncio.gather(*(client.agenerate(f"question {i}") for i in range(n)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for name, run in (("sync (threadpool)", sync_handlers), ("async", async_handlers)):
+        elapsed = asyncio.run(run(args.requests, args.latency))
+        print(
+            f"{name:>18} | {args.requests} concurrent requests in {elapsed:6.2f}s "
+            f"| {args.requests / elapsed:8.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
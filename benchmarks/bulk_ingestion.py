@@ -0,0 +1,85 @@
+"""
+Bulk ingestion throughput vs worker count, against the stub LLM backend.
+
+Generates a zip of DOCX resumes, stages it like POST /resume/bulk does and
+pushes it through a fresh BulkIngestionQueue per worker count.
+
+Usage:
+    python -m benchmarks.bulk_ingestion --resumes 200 --workers 1 4 16 64 --latency 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import zipfile
+
+from docx import Document
+
+from app.core.stub_llm import StubLLMBackend
+from app.pipelines.bulk import BulkIngestionQueue, stage_uploads
+from app.store.memory import InMemoryStore
+
+
+def _docx(i: int) -> bytes:
+    doc = Document()
+    lines = [
+        f"Candidate {i}", f"candidate{i}@example.com",
+        "Experience",
+        *[f"Company {i}-{j} - Engineer 201{j} - 202{j}: built data pipelines in Python and SQL" for j in range(4)],
+        "Education", "BSc Computer Science",
+        "Skills", "Python, SQL, pandas, Docker",
+    ]
+    for line in lines:
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _corpus(n: int) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        for i in range(n):
+            archive.writestr(f"resumes/{i}.docx", _docx(i))
+    return buf.getvalue()
+
+
+def run(corpus: bytes, workers: int, latency: float, jitter: float) -> float:
+    queue = BulkIngestionQueue(
+        workers=workers,
+        llm_concurrency=workers,
+        llm=StubLLMBackend(latency=latency, jitter=jitter, seed=0),
+        store=InMemoryStore(),
+    )
+    start = time.perf_counter()
+    staging_dir, files, skipped = stage_uploads([("corpus.zip", io.BytesIO(corpus))])
+    batch = queue.submit(files, staging_dir, skipped)
+    while batch.finished_at is None:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    counts = batch.progress()["counts"]
+    assert counts["done"] == len(files), counts
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    args = parser.parse_args()
+
+    corpus = _corpus(args.resumes)
+    print(f"{args.resumes} DOCX resumes, stub LLM {args.latency:.2f}s +{args.jitter:.2f}s jitter")
+    for workers in args.workers:
+        # Per-file progress logging would dominate the output
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = run(corpus, workers, args.latency, args.jitter)
+        print(f"workers={workers:<4} {elapsed:7.2f}s  {args.resumes / elapsed:8.1f} resumes/s")
+
+
+if __name__ == "__main__":
+    main()
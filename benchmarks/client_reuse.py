@@ -0,0 +1,66 @@
+"""
+Per-request setup cost of the Gemini client: shared registry client vs a
+fresh GeminiClient per request (old behaviour of /resume/extract and
+/compare_v3), vs a fresh gRPC transport per request.
+
+No network traffic: gRPC channels connect lazily, so this measures the
+in-process setup work only. TLS/auth handshakes on a brand-new channel
+come on top of the last row in production.
+
+Usage:
+    GEMINI_API_KEY=dummy python -m benchmarks.client_reuse --requests 2000
+"""
+
+import argparse
+import time
+import warnings
+
+from app.core.llm_client import GeminiClient, get_gemini_client, get_genai
+
+
+def _per_request(n: int, fn) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    genai = get_genai()
+    from google.generativeai import client as sdk_client
+    import google.ai.generativelanguage as glm
+
+    def shared():
+        get_gemini_client()._get_model()
+
+    def fresh_client():
+        model = GeminiClient()._get_model()
+        model._client = sdk_client.get_default_generative_client()
+
+    def fresh_transport():
+        model = GeminiClient()._get_model()
+        model._client = glm.GenerativeServiceClient(**sdk_client._client_manager.client_config)
+        model._async_client = glm.GenerativeServiceAsyncClient(
+            **sdk_client._client_manager.client_config
+        )
+
+    shared()  # warm the registry entry once, like the first request after startup
+    results = [
+        ("shared registry client", _per_request(args.requests, shared)),
+        ("fresh client per request", _per_request(args.requests, fresh_client)),
+        ("fresh transport per request", _per_request(max(args.requests // 20, 10), fresh_transport)),
+    ]
+
+    baseline = results[0][1]
+    print(f"google.generativeai {genai.__version__}")
+    for label, seconds in results:
+        print(f"{label:<30} {seconds * 1e6:10.1f} µs/request  ({seconds / baseline:8.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
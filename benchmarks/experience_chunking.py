@@ -0,0 +1,154 @@
+"""
+Experience extraction for resumes with 2 to 30 roles: one call for the
+whole section (EXTRACTION_ANSWER_TOKENS=0) vs sections whose answer could
+outgrow --answer-tokens split into role groups extracted in parallel.
+
+The LLM is a stub that answers the experience prompt with one entry per
+role it finds in its input, so the answer grows with the role count. It
+streams --token-latency seconds per output token after --latency, and
+cuts the answer at --max-output-tokens like the real API, which sends
+long answers through the JSON repair path. Thinking models spend part of
+max_output_tokens on reasoning, so try values below the configured 8192
+too. Roles are generated in two layouts: "Company - Title, dates" on one
+line, and company / title / dates on separate lines.
+
+Usage:
+    python -m benchmarks.experience_chunking --roles 2 5 10 20 30 --max-output-tokens 4096
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import re
+import statistics
+import time
+
+from app.core import extraction
+from app.core.llm_client import GENERATION_CONFIG
+from app.core.prompt_budget import estimate_tokens
+from app.core.segmentation import segment_resume
+from app.core.stub_llm import StubLLMBackend
+
+SKILLS = ["Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "pandas", "AWS", "Tableau", "dbt"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Automated", "Scaled", "Maintained", "Introduced"]
+THINGS = ["forecasting models", "data pipelines", "KPI dashboards", "feature stores", "ETL jobs", "A/B test tooling"]
+TITLES = ["Data Scientist", "Senior Data Engineer", "Analytics Engineer", "ML Engineer", "Data Analyst"]
+
+_COMPANY_RE = re.compile(r"(Company \d+)")
+_DATES_RE = re.compile(r"(\d{2}/\d{4}) - (\d{2}/\d{4}|Present)")
+
+
+def resume(n_roles, rng):
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 010 0000 | Berlin, Germany", "", "Experience"]
+    for k in range(n_roles):
+        start = 2024 - 2 * (k + 1)
+        end = "Present" if k == 0 else f"{rng.randint(1, 12):02d}/{start + 2}"
+        dates = f"{rng.randint(1, 12):02d}/{start} - {end}"
+        title = rng.choice(TITLES)
+        if rng.random() < 0.5:
+            lines.append(f"Company {k} - {title}, {dates}")
+        else:
+            lines += [f"Company {k}", title, dates]
+        for _ in range(rng.randint(4, 6)):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(THINGS)} with {rng.choice(SKILLS)} and "
+                f"{rng.choice(SKILLS)}, serving {rng.randint(2, 90)} teams across {rng.randint(2, 30)} markets"
+            )
+        lines.append("")
+    lines += ["Education", "MSc Statistics, TU Munich, 2012", "", "Skills", ", ".join(SKILLS[:6])]
+    return "\n".join(lines)
+
+
+def answer_for(text):
+    """The experience JSON a model would give for `text`: one entry per company."""
+    entries, current = [], None
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        company = _COMPANY_RE.match(line)
+        if company:
+            window = " ".join(lines[i:i + 3])
+            dates = _DATES_RE.search(window)
+            title = next((t for t in TITLES if t in window), None)
+            current = {
+                "company": company.group(1),
+                "role": title,
+                "start_date": dates.group(1) if dates else None,
+                "end_date": dates.group(2) if dates else None,
+                "responsibilities": [],
+                "tech_stack": [],
+            }
+            entries.append(current)
+        elif current is not None and line.startswith("- "):
+            current["responsibilities"].append(line[2:])
+            for skill in SKILLS:
+                if skill in line and skill not in current["tech_stack"]:
+                    current["tech_stack"].append(skill)
+    return json.dumps(entries, indent=2)
+
+
+class RoleEchoLLM(StubLLMBackend):
+    def __init__(self, max_output_tokens, latency, token_latency):
+        super().__init__(latency=latency)
+        self.max_output_tokens = max_output_tokens
+        self.output_token_latency = token_latency
+        self.truncated = 0
+
+    async def aextract(self, prompt, input_text):
+        if "Extract work experience" not in prompt:
+            return await super().aextract(prompt, input_text)
+        self.calls += 1
+        answer = answer_for(input_text)
+        tokens = estimate_tokens(answer)
+        if tokens > self.max_output_tokens:
+            self.truncated += 1
+            answer = answer[:int(len(answer) * self.max_output_tokens / tokens)]
+            tokens = self.max_output_tokens
+        await asyncio.sleep(self.latency + tokens * self.output_token_latency)
+        return answer
+
+
+async def run(texts, answer_tokens, args):
+    extraction.EXPERIENCE_ANSWER_TOKENS = answer_tokens
+    llm = RoleEchoLLM(args.max_output_tokens, args.latency, args.token_latency)
+    latencies, found = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in texts:
+            start = time.perf_counter()
+            result = await extraction.aextract_resume_structured(segment_resume(text), llm)
+            latencies.append(time.perf_counter() - start)
+            found.append(sum(1 for role in result["experience"] if role.get("responsibilities")))
+    return statistics.mean(latencies), found, llm
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roles", type=int, nargs="+", default=[2, 5, 10, 20, 30])
+    parser.add_argument("--resumes", type=int, default=3)
+    parser.add_argument("--answer-tokens", type=int, default=extraction.EXPERIENCE_ANSWER_TOKENS)
+    parser.add_argument("--max-output-tokens", type=int, default=GENERATION_CONFIG["max_output_tokens"])
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    print(
+        f"stub: {args.latency}s + {args.token_latency * 1000:.1f}ms/output token, "
+        f"max_output_tokens {args.max_output_tokens}, {args.resumes} resumes per row"
+    )
+    print(f"{'roles':>5}  {'mode':<18} {'latency':>8}  {'roles kept':>10}  {'LLM calls':>9}  {'truncated':>9}")
+    for n_roles in args.roles:
+        rng = random.Random(n_roles)
+        texts = [resume(n_roles, rng) for _ in range(args.resumes)]
+        for label, answer_tokens in (("one call", 0), (f"split > {args.answer_tokens} tok", args.answer_tokens)):
+            latency, found, llm = asyncio.run(run(texts, answer_tokens, args))
+            print(
+                f"{n_roles:>5}  {label:<18} {latency:7.2f}s  "
+                f"{sum(found) / len(found):5.1f}/{n_roles:<4}  {llm.calls / args.resumes:9.1f}  "
+                f"{llm.truncated:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark sequential vs concurrent section extraction against a stub LLM.
+
+Usage:
+    python -m benchmarks.extraction_concurrency --delay 0.5 --runs 5
+"""
+
+import argparse
+import time
+
+from app.core.extraction import extract_resume_structured
+from app.core.stub_llm import StubLLMBackend
+
+
+SECTIONS = {
+    "summary": "Engineer with 5 years of experience.",
+    "experience": "Acme Corp - Engineer 2019-2024",
+    "education": "BSc Computer Science, MIT",
+    "skills": "Python, SQL",
+}
+
+
+def _time_mode(llm, concurrent: bool, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        extract_resume_structured(SECTIONS, llm, concurrent=concurrent)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    llm = StubLLMBackend(latency=args.delay, jitter=args.jitter, seed=0)
+    sequential = _time_mode(llm, concurrent=False, runs=args.runs)
+    concurrent = _time_mode(llm, concurrent=True, runs=args.runs)
+
+    print(f"stub delay:  {args.delay:.3f}s (+{args.jitter:.3f}s jitter)")
+    print(f"sequential:  {sequential:.3f}s / resume")
+    print(f"concurrent:  {concurrent:.3f}s / resume")
+    print(f"speedup:     {sequential / concurrent:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Fuzzing the parsing of LLM JSON output: the previous post-hoc repair
+(extraction's _repair_json path and the brace counting in
+TransferableSkillEngine._parse_response) vs the incremental
+JSONStreamParser, over answers cut at random points and answers with the
+usual LLM slips (code fences, prose around the JSON, trailing commas,
+"..." placeholders, raw newlines in strings, missing commas).
+
+For each parser: answers that yield anything but the fallback, complete
+elements recovered out of those available, elements returned altered
+(not equal to any element of the full answer), and parse time. Then how
+early a streamed experience answer hands over its first role.
+
+Usage:
+    python -m benchmarks.json_stream --answers 200 --cuts 20
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+
+from app.core.json_stream import JSONStreamParser, salvage_json
+from app.core.stub_llm import DEFAULT_RULES, _chunks
+from benchmarks.experience_chunking import SKILLS, THINGS, TITLES, VERBS
+
+
+# -----------------------------
+# Previous parsers
+# -----------------------------
+
+def legacy_extraction(response, default):
+    """The previous _parse_json_response + _repair_json, without the logging."""
+    try:
+        cleaned = response.strip()
+        if cleaned.startswith('```json'):
+            cleaned = cleaned[7:]
+        if cleaned.startswith('```'):
+            cleaned = cleaned[3:]
+        if cleaned.endswith('```'):
+            cleaned = cleaned[:-3]
+        cleaned = cleaned.strip()
+        return json.loads(cleaned)
+    except Exception:
+        try:
+            return _legacy_repair(cleaned, default)
+        except Exception:
+            return default
+
+
+def _legacy_repair(json_str, default):
+    if '...' in json_str or json_str.rstrip().endswith('[') or json_str.rstrip().endswith('{'):
+        return default
+    repaired_lines = []
+    for line in json_str.split('\n'):
+        if '...' in line or line.rstrip().endswith('...'):
+            continue
+        if line.count('"') % 2 != 0:
+            last_quote_pos = line.rfind('"')
+            if last_quote_pos != -1:
+                line = line[:last_quote_pos + 1] + line[last_quote_pos + 1:].rstrip().rstrip(',')
+        if line.strip().endswith(','):
+            line = line.rstrip(',')
+        repaired_lines.append(line)
+    repaired = '\n'.join(repaired_lines)
+    open_brackets = repaired.count('[') - repaired.count(']')
+    open_braces = repaired.count('{') - repaired.count('}')
+    if open_brackets > 0:
+        repaired += ']' * open_brackets
+    if open_braces > 0:
+        repaired += '}' * open_braces
+    try:
+        return json.loads(repaired)
+    except Exception:
+        return default
+
+
+def legacy_transferable(raw, default):
+    """The previous TransferableSkillEngine._parse_response, before validation."""
+    try:
+        cleaned_raw = raw.strip()
+        if cleaned_raw.startswith('```json'):
+            cleaned_raw = cleaned_raw[7:]
+        if cleaned_raw.startswith('```'):
+            cleaned_raw = cleaned_raw[3:]
+        if cleaned_raw.endswith('```'):
+            cleaned_raw = cleaned_raw[:-3]
+        cleaned_raw = cleaned_raw.strip()
+        if not cleaned_raw.endswith(']') and not cleaned_raw.endswith('}'):
+            fixed_lines = []
+            brace_count = bracket_count = 0
+            in_string = escape_next = False
+            for line in cleaned_raw.split('\n'):
+                for char in line:
+                    if escape_next:
+                        escape_next = False
+                        continue
+                    if char == '\\':
+                        escape_next = True
+                        continue
+                    if char == '"':
+                        in_string = not in_string
+                        continue
+                    if not in_string:
+                        if char == '{':
+                            brace_count += 1
+                        elif char == '}':
+                            brace_count -= 1
+                        elif char == '[':
+                            bracket_count += 1
+                        elif char == ']':
+                            bracket_count -= 1
+                if brace_count >= 0 and bracket_count >= 0:
+                    fixed_lines.append(line)
+                else:
+                    break
+            cleaned_raw = '\n'.join(fixed_lines)
+            if brace_count > 0:
+                cleaned_raw += '\n' + '  ' * (brace_count - 1) + '}'
+            if bracket_count > 0:
+                cleaned_raw += '\n]'
+        return json.loads(cleaned_raw)
+    except Exception:
+        return default
+
+
+def stream_parser(response, default):
+    try:
+        return salvage_json(response)[0]
+    except ValueError:
+        return default
+
+
+PARSERS = {
+    "extraction repair": legacy_extraction,
+    "transferable repair": legacy_transferable,
+    "JSONStreamParser": stream_parser,
+}
+
+
+# -----------------------------
+# Answers
+# -----------------------------
+
+def experience_answer(rng):
+    return [
+        {
+            "company": f"Company {k}",
+            "role": rng.choice(TITLES),
+            "start_date": f"{rng.randint(1, 12):02d}/{2010 + k}",
+            "end_date": "Present" if k == 0 else f"{rng.randint(1, 12):02d}/{2012 + k}",
+            "responsibilities": [
+                f"{rng.choice(VERBS)} {rng.choice(THINGS)} with {rng.choice(SKILLS)} "
+                f"(\"{rng.choice(SKILLS)}\" team, {rng.randint(2, 90)}% faster)"
+                for _ in range(rng.randint(2, 5))
+            ],
+            "tech_stack": rng.sample(SKILLS, rng.randint(1, 4)),
+        }
+        for k in range(rng.randint(2, 8))
+    ]
+
+
+def transferable_answer(rng):
+    return [
+        {
+            "source_skill": rng.choice(SKILLS),
+            "target_skill": rng.choice(SKILLS),
+            "confidence": round(rng.uniform(0.3, 0.95), 2),
+            "justification": f"Both involve {rng.choice(THINGS)}; see \\\"{rng.choice(VERBS)}\\\".",
+        }
+        for _ in range(rng.randint(2, 10))
+    ]
+
+
+def answers(n, rng):
+    """(kind, document) pairs: generated arrays plus the stub's canned answers."""
+    canned = []
+    for _, response in DEFAULT_RULES:
+        try:
+            canned.append(("canned", json.loads(response)))
+        except ValueError:
+            pass
+    generated = [
+        ("experience", experience_answer(rng)) if i % 2 else ("transferable", transferable_answer(rng))
+        for i in range(n)
+    ]
+    return generated + canned
+
+
+def available(doc, text, offset, cut):
+    """Elements of a top-level array whose text ends before `cut`."""
+    if not isinstance(doc, list):
+        return 0
+    count = 0
+    for k in range(1, len(doc) + 1):
+        if offset + len(json.dumps(doc[:k], indent=2)) - 2 <= cut:
+            count = k
+    return count
+
+
+# -----------------------------
+# Malformations
+# -----------------------------
+
+def fenced(text):
+    return f"```json\n{text}\n```"
+
+
+def prose(text):
+    return f"Here is the extracted JSON:\n\n{text}\n\nLet me know if you need anything else."
+
+
+def trailing_comma(text):
+    return text[:text.rfind("\n")] + "," + text[text.rfind("\n"):]
+
+
+def ellipsis(text):
+    return text[:text.rfind("\n")] + ",\n  ..." + text[text.rfind("\n"):]
+
+
+def raw_newline(text):
+    return text.replace(" with ", " with\n", 1)
+
+
+def missing_comma(text):
+    return text.replace("},\n  {", "}\n  {", 1)
+
+
+SLIPS = [fenced, prose, trailing_comma, ellipsis, raw_newline, missing_comma]
+
+
+def cases(docs, cuts, rng):
+    """(case, doc, text, expected complete elements) for every fuzzed answer."""
+    for kind, doc in docs:
+        text = json.dumps(doc, indent=2)
+        for slip in SLIPS:
+            slipped = slip(text)
+            if slipped != text:
+                # A raw newline in a string is still part of its value
+                meant = json.loads(slipped, strict=False) if slip is raw_newline else doc
+                yield slip.__name__, meant, slipped, len(doc) if isinstance(doc, list) else 0
+        for _ in range(cuts):
+            offset = rng.choice([0, 8])
+            full = "```json\n" + text if offset else text
+            cut = rng.randint(1, len(full) - 1)
+            yield "truncated", doc, full[:cut], available(doc, text, offset, cut)
+
+
+def score(parse, fuzzed):
+    outcomes = {}
+    elapsed = 0.0
+    for case, doc, text, expected in fuzzed:
+        default = [] if isinstance(doc, list) else {}
+        start = time.perf_counter()
+        result = parse(text, default)
+        elapsed += time.perf_counter() - start
+
+        counts = outcomes.setdefault(case, Counter())
+        counts["answers"] += 1
+        counts["parsed"] += result != default
+        counts["expected"] += expected
+        if isinstance(doc, list) and isinstance(result, list):
+            counts["recovered"] += sum(1 for element in result if element in doc)
+            counts["altered"] += sum(1 for element in result if element not in doc)
+        elif isinstance(doc, dict) and isinstance(result, dict):
+            # A member list cut short keeps its first elements
+            counts["altered"] += sum(
+                1 for key, value in result.items()
+                if value != doc.get(key)
+                and not (isinstance(value, list) and value == doc.get(key, [])[:len(value)])
+            )
+    return outcomes, elapsed / len(fuzzed) * 1e6
+
+
+# -----------------------------
+# Streaming
+# -----------------------------
+
+def first_element(text):
+    """Fraction of the stream chunks read before the first element is handed over."""
+    chunks = _chunks(text)
+    parser = JSONStreamParser()
+    for i, chunk in enumerate(chunks, 1):
+        if parser.feed(chunk):
+            return i / len(chunks)
+    return 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=200)
+    parser.add_argument("--cuts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    docs = answers(args.answers, rng)
+    fuzzed = list(cases(docs, args.cuts, rng))
+    print(f"{len(docs)} answers, {len(fuzzed)} fuzzed outputs")
+
+    print(f"{'parser':<20} {'case':<15} {'parsed':>12}  {'elements kept':>15}  {'altered':>7}")
+    for name, parse in PARSERS.items():
+        outcomes, us = score(parse, fuzzed)
+        for case, counts in outcomes.items():
+            kept = f"{counts['recovered']}/{counts['expected']}" if counts["expected"] else "-"
+            print(
+                f"{name:<20} {case:<15} {counts['parsed']:5d}/{counts['answers']:<6d}  "
+                f"{kept:>15}  {counts['altered']:7d}"
+            )
+        print(f"{name:<20} {'':<15} {us:.0f} us/answer")
+
+    texts = [json.dumps(doc, indent=2) for kind, doc in docs if kind == "experience"]
+    fractions = sorted(first_element(text) for text in texts)
+    chars = sum(len(text) for text in texts)
+    start = time.perf_counter()
+    for text in texts:
+        stream = JSONStreamParser()
+        for chunk in _chunks(text):
+            stream.feed(chunk)
+        stream.close()
+    streamed = time.perf_counter() - start
+    start = time.perf_counter()
+    for text in texts:
+        json.loads(text)
+    whole = time.perf_counter() - start
+    print(
+        f"\nstreamed experience answers: first role after {fractions[len(fractions) // 2]:.0%} of the "
+        f"stream (median), {fractions[-1]:.0%} worst; "
+        f"parser {chars / streamed / 1e6:.1f} MB/s fed word chunks vs json.loads {chars / whole / 1e6:.0f} MB/s whole"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Synthetic resume PDFs for ingestion benchmarks.
+
+Writes minimal, valid PDF 1.4 files by hand (Helvetica text, one content
+stream per page), so no PDF-writing dependency is needed.
+"""
+
+import os
+import random
+from typing import List, Optional
+
+SKILLS = [
+    "Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "pandas", "NumPy",
+    "scikit-learn", "PyTorch", "TensorFlow", "Tableau", "AWS", "GCP", "Terraform", "Kafka",
+]
+
+
+def resume_lines(i: int, pages: int, rng: random.Random, skills_first: bool = False) -> List[List[str]]:
+    """Text lines per page of one synthetic resume (Skills last, or right after the summary)."""
+    lines = [
+        f"Candidate {i}",
+        f"candidate{i}@example.com | +1 555 {i % 1000:03d} {rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        "Data professional with experience in analytics, ML and data platforms.",
+        "",
+        *(["Skills", ", ".join(rng.sample(SKILLS, 8)), ""] if skills_first else []),
+        "Experience",
+    ]
+    for role in range(pages * 4):
+        start = 2010 + role
+        lines += [
+            f"Company {i}-{role} - Senior Engineer, 01/{start} - 12/{start + 1}",
+            *[
+                f"- Built {rng.choice(['pipelines', 'models', 'dashboards', 'services'])} using "
+                f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 90)} teams"
+                for _ in range(6)
+            ],
+            "",
+        ]
+    lines += ["Education", "BSc Computer Science, Example University, 2010"]
+    if not skills_first:
+        lines += ["", "Skills", ", ".join(rng.sample(SKILLS, 8))]
+    per_page = -(-len(lines) // pages)
+    return [lines[p * per_page:(p + 1) * per_page] for p in range(pages)]
+
+
+def make_pdf(pages: List[List[str]], sidebar: Optional[List[str]] = None, padding: int = 0) -> bytes:
+    """
+    One PDF page per list of lines; `sidebar` lines go in a right-hand
+    column of page 1. `padding` adds an unreferenced binary stream of that
+    many bytes, standing in for embedded images and fonts.
+    """
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        body = "BT /F1 10 Tf 12 TL 50 800 Td\n" + "".join(
+            f"({escape(line)}) '\n" for line in lines
+        ) + "ET"
+        if sidebar and not page_ids:
+            body += "\nBT /F1 9 Tf 12 TL 430 800 Td\n" + "".join(
+                f"({escape(line)}) '\n" for line in sidebar
+            ) + "ET"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    if padding:
+        blob = random.Random(padding).randbytes(padding)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(blob) + blob + b"\nendstream")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_corpus(
+    directory: str,
+    n: int,
+    pages: int = 2,
+    seed: int = 0,
+    mixed: bool = False
+) -> List[str]:
+    """
+    Write n resumes of `pages` pages. mixed=True varies the page count
+    (1-4) and gives every fifth resume a two-column first page.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(n):
+        doc_pages = rng.randint(1, 4) if mixed else pages
+        sidebar = None
+        if mixed and i % 5 == 0:
+            sidebar = ["Skills", *rng.sample(SKILLS, 6), "", "Languages", "English", "German"]
+        path = os.path.join(directory, f"resume_{i:05d}.pdf")
+        with open(path, "wb") as f:
+            f.write(make_pdf(resume_lines(i, doc_pages, rng), sidebar))
+        paths.append(path)
+    return paths
+
+
+def make_pathological_pdf(glyphs: int = 60000) -> bytes:
+    """One page of individually positioned glyphs: pathological for layout analysis."""
+    ops = "".join(
+        f"1 0 0 1 {20 + (k * 7) % 555} {20 + (k * 13) % 800} Tm (x) Tj\n" for k in range(glyphs)
+    )
+    stream = ("BT /F1 4 Tf\n" + ops + "ET").encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [5 0 R] /Count 1 >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
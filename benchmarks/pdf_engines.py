@@ -0,0 +1,86 @@
+"""
+PDF text engines: per-page latency and line-level output equivalence of
+pypdfium2 vs pdfplumber, and which engine "auto" picks, over a generated
+corpus (mixed page counts, every fifth resume with a two-column page).
+
+Usage:
+    python -m benchmarks.pdf_engines --files 100 --show-diff
+"""
+
+import argparse
+import contextlib
+import difflib
+import io
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+from app.core.ingestion import extract_document
+from benchmarks.pdf_corpus import write_corpus
+
+
+def timed(paths, engine):
+    documents, per_page = [], []
+    for path in paths:
+        start = time.perf_counter()
+        document = extract_document(path, engine=engine)
+        per_page.append((time.perf_counter() - start) / document.pages)
+        documents.append(document)
+    return documents, per_page
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--show-diff", action="store_true", help="print the first differing document's diff")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.files, mixed=True)
+        results = {engine: timed(paths, engine) for engine in ("pdfium", "pdfplumber")}
+        with contextlib.redirect_stdout(io.StringIO()):
+            auto, _ = timed(paths, "auto")
+
+    pages = sum(d.pages for d in results["pdfium"][0])
+    print(f"{len(paths)} PDFs, {pages} pages")
+    for engine, (_, per_page) in results.items():
+        quantiles = statistics.quantiles(per_page, n=20)
+        print(
+            f"{engine:<11} per page: mean {statistics.mean(per_page) * 1000:6.2f}ms  "
+            f"p50 {quantiles[9] * 1000:6.2f}ms  p95 {quantiles[18] * 1000:6.2f}ms"
+        )
+    speedup = statistics.mean(results["pdfplumber"][1]) / statistics.mean(results["pdfium"][1])
+    print(f"pdfium speedup: {speedup:.1f}x")
+
+    identical = same_lines = 0
+    changed_lines = total_lines = 0
+    first_diff = None
+    for fast, slow, path in zip(results["pdfium"][0], results["pdfplumber"][0], paths):
+        a, b = slow.text.splitlines(), fast.text.splitlines()
+        total_lines += len(a)
+        if a == b:
+            identical += 1
+            continue
+        if Counter(a) == Counter(b):
+            same_lines += 1
+        matcher = difflib.SequenceMatcher(a=a, b=b, autojunk=False)
+        changed_lines += sum(i2 - i1 for tag, i1, i2, _, _ in matcher.get_opcodes() if tag != "equal")
+        first_diff = first_diff or (path, a, b)
+
+    print(
+        f"line-level equivalence: {identical}/{len(paths)} documents identical, "
+        f"{same_lines} more with the same lines in a different order; "
+        f"{changed_lines}/{total_lines} pdfplumber lines differ"
+    )
+    print(f"auto engine choices: {dict(Counter(d.engine for d in auto))}")
+
+    if args.show_diff and first_diff:
+        path, a, b = first_diff
+        print(f"\n--- pdfplumber vs pdfium: {path.rsplit('/', 1)[-1]}")
+        for line in list(difflib.unified_diff(a, b, "pdfplumber", "pdfium", lineterm="", n=0))[:30]:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+PDF text-extraction throughput: in-process threads vs the ingestion
+process pool at several sizes, over a generated corpus.
+
+Also reports how badly extraction starves the rest of the process: a
+"heartbeat" thread sleeps 5ms in a loop and records how late it wakes up,
+which is what every other request in an API worker experiences while
+pdfplumber holds the GIL. With --pathological, one extra file that takes
+several seconds to lay out is mixed in, and the pool's per-file timeout
+kills its worker instead of letting it hang.
+
+--engine picks the PDF text engine (PDF_TEXT_ENGINE); the GIL stall and
+pathological-file behaviour are pdfplumber's, so that is the default here.
+
+Usage:
+    python -m benchmarks.pdf_ingestion --files 100 --processes 1 4 8
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.ingestion import PDF_ENGINES, extract_document
+from app.core.ingestion_pool import IngestionPool, IngestionTimeout
+from benchmarks.pdf_corpus import make_pathological_pdf, write_corpus
+
+
+class Heartbeat:
+    """Measures scheduling lag of a thread that wants to run every 5ms."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            time.sleep(self.interval)
+            self.lags.append(time.perf_counter() - start - self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def p99_ms(self) -> float:
+        if len(self.lags) < 2:
+            return 0.0
+        return statistics.quantiles(self.lags, n=100)[98] * 1000
+
+
+def run(paths, extract, concurrency: int):
+    ok = timeouts = 0
+
+    def one(path):
+        nonlocal ok, timeouts
+        try:
+            extract(path)
+            ok += 1
+        except IngestionTimeout:
+            timeouts += 1
+
+    with Heartbeat() as heartbeat:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(one, paths))
+        elapsed = time.perf_counter() - start
+    return elapsed, ok, timeouts, heartbeat.p99_ms()
+
+
+def report(label, paths, elapsed, ok, timeouts, lag_p99):
+    print(
+        f"{label:<24} {elapsed:7.2f}s  {len(paths) / elapsed:7.1f} files/s  "
+        f"ok={ok} timeouts={timeouts}  heartbeat p99 lag {lag_p99:7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--pathological", action="store_true")
+    parser.add_argument("--engine", choices=PDF_ENGINES, default="pdfplumber")
+    args = parser.parse_args()
+    # Inherited by the spawned pool workers
+    os.environ["PDF_TEXT_ENGINE"] = args.engine
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.files, pages=args.pages)
+        if args.pathological:
+            slow = os.path.join(directory, "pathological.pdf")
+            with open(slow, "wb") as f:
+                f.write(make_pathological_pdf())
+            paths.insert(len(paths) // 2, slow)
+
+        print(f"{len(paths)} PDFs x {args.pages} pages, {args.engine}, {os.cpu_count()} CPU(s)")
+        if not args.pathological:
+            # In-process extraction has no timeout: a pathological file just takes as long as it takes
+            extract = functools.partial(extract_document, engine=args.engine)
+            report("in-process threads=4", paths, *run(paths, extract, 4))
+
+        for processes in args.processes:
+            pool = IngestionPool(processes=processes, timeout=args.timeout, max_pages=20)
+            pool.start()  # returns once every worker has imported pdfplumber
+            # The pool logs each worker replacement
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run(paths, pool.extract_text, processes)
+            pool.close()
+            report(f"pool processes={processes}", paths, *result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Prompt sizes with and without the per-call token budget, for resumes of
+1 to N pages, plus the per-call-site ledger that shows which stage
+dominates token spend.
+
+Resume text comes from the synthetic PDF corpus generator (no PDF is
+written); "no headers" resumes fall back to sending the whole text as
+experience. Extraction runs against the stub LLM backend. Tokens are
+prompt_budget.estimate_tokens estimates.
+
+Usage:
+    python -m benchmarks.prompt_budget --pages 1 5 10 20 40 --budget 4000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import time
+
+from app.core import prompt_budget
+from app.core.extraction import aextract_resume_structured
+from app.core.prompt_budget import estimate_tokens, prompt_ledger
+from app.core.segmentation import segment_resume
+from app.core.stub_llm import StubLLMBackend
+from benchmarks.pdf_corpus import resume_lines
+
+HEADERS = {"Summary", "Experience", "Education", "Skills"}
+
+
+def resume_text(i, pages, headers=True):
+    lines = [line for page in resume_lines(i, pages, random.Random(i)) for line in page]
+    if not headers:
+        lines = [line for line in lines if line not in HEADERS]
+    return "\n".join(lines)
+
+
+async def extract(texts, budget):
+    prompt_budget.PROMPT_TOKEN_BUDGET = budget
+    prompt_ledger.reset()
+    llm = StubLLMBackend()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in texts:
+            await aextract_resume_structured(segment_resume(text), llm)
+    return prompt_ledger.stats()["sites"]
+
+
+def summarize(sites, resumes):
+    calls = sum(site["calls"] for site in sites.values())
+    tokens = sum(site["prompt_tokens"] for site in sites.values())
+    largest = max(site["max_prompt_tokens"] for site in sites.values())
+    return calls / resumes, tokens / resumes, largest
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 20, 40])
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=4000)
+    args = parser.parse_args()
+
+    sample = "\n".join(resume_text(i, 10) for i in range(args.resumes))
+    start = time.perf_counter()
+    estimate_tokens(sample)
+    elapsed = time.perf_counter() - start
+    print(
+        f"estimate_tokens: {len(sample) / elapsed / 1e6:.1f} M chars/s, "
+        f"{len(sample) / estimate_tokens(sample):.2f} chars/token on resume text"
+    )
+
+    print(f"{'layout':<11} {'pages':>5}  {'budget':>6}  {'calls/resume':>12}  {'prompt tok/resume':>17}  {'largest prompt':>14}")
+    for headers in (True, False):
+        for pages in args.pages:
+            texts = [resume_text(i, pages, headers) for i in range(args.resumes)]
+            for budget in (0, args.budget):
+                sites = asyncio.run(extract(texts, budget))
+                calls, tokens, largest = summarize(sites, args.resumes)
+                print(
+                    f"{'headers' if headers else 'no headers':<11} {pages:>5}  {budget or 'none':>6}  "
+                    f"{calls:12.2f}  {tokens:17.0f}  {largest:14d}"
+                )
+
+    print(f"\ntoken spend by call site, {max(args.pages)}-page resumes with headers, budget {args.budget}:")
+    texts = [resume_text(i, max(args.pages)) for i in range(args.resumes)]
+    sites = asyncio.run(extract(texts, args.budget))
+    for site, counts in sorted(sites.items(), key=lambda item: -item[1]["share"]):
+        print(
+            f"  {site:<18} share {counts['share']:5.1%}  calls {counts['calls']:4d}  "
+            f"prompt {counts['prompt_tokens']:7d}  response {counts['response_tokens']:6d}  "
+            f"chunked {counts['chunked']:3d}  trimmed {counts['trimmed']:3d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
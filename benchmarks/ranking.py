@@ -0,0 +1,76 @@
+"""
+Benchmark ranking one job against N stored profiles.
+
+Usage:
+    python -m benchmarks.ranking --profiles 100000
+"""
+
+import argparse
+import random
+import time
+
+from app.core.models import ProfessionalProfile, JobRequirement, Skill
+from app.core.scoring import score_profile_against_job, rank_profiles_against_job
+
+
+SKILL_POOL = [f"skill_{i}" for i in range(500)] + [
+    "python", "sql", "machine learning", "pytorch", "aws", "docker", "spark",
+]
+
+
+def make_profiles(n: int, skills_per_profile: int = 12, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        ProfessionalProfile(
+            candidate_id=f"candidate_{i}",
+            title=None,
+            total_experience_years=rng.randint(0, 15),
+            skills=[Skill(name=s) for s in rng.sample(SKILL_POOL, skills_per_profile)],
+            experiences=[],
+        )
+        for i in range(n)
+    ]
+
+
+JOB = JobRequirement(
+    job_id="job_1",
+    title="Data Scientist",
+    required_skills=["Python", "SQL", "Machine Learning", "skill_1"],
+    preferred_skills=["PyTorch", "AWS", "Docker"],
+    min_experience_years=3,
+    domain=None,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    profiles = make_profiles(args.profiles)
+
+    start = time.perf_counter()
+    for profile in profiles:
+        score_profile_against_job(profile, JOB)
+    per_pair = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, ranked = rank_profiles_against_job(profiles, JOB, limit=args.top_k)
+    page = [score_profile_against_job(p, JOB) for _, p in ranked]
+    single_pass = time.perf_counter() - start
+
+    print(f"profiles:                  {args.profiles}")
+    print(f"per-pair compare loop:     {per_pair:.3f}s")
+    print(f"single-pass rank + top-{args.top_k}: {single_pass:.3f}s")
+    print(f"best: {page[0].candidate_id} ({page[0].fit_score})")
+
+    # Ranked scores must match the per-pair scorer exactly
+    _, full = rank_profiles_against_job(profiles, JOB)
+    assert all(
+        score == score_profile_against_job(p, JOB).fit_score for score, p in full
+    )
+
+
+if __name__ == "__main__":
+    main()
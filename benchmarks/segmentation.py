@@ -0,0 +1,121 @@
+"""
+Section segmentation throughput and per-line header-matching cost:
+the previous matcher (re.sub + a loop over every header per line) vs the
+precompiled HeaderMatcher, over a synthetic corpus of resumes with mixed
+header styles ("Experience", "EXPERIENCE:", "Skills: Python, SQL",
+"== Education ==") and languages.
+
+Usage:
+    python -m benchmarks.segmentation --resumes 10000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from app.core.segmentation import (
+    LANGUAGE_HEADERS,
+    SECTION_HEADERS,
+    IncrementalSegmenter,
+    build_header_matcher,
+)
+
+SKILLS = ["Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "pandas", "AWS", "Tableau"]
+
+
+class LegacyMatcher:
+    """The previous _match_section_header, behind the HeaderMatcher interface."""
+
+    def match(self, line):
+        clean = re.sub(r"[^a-zA-Z ]", "", line).lower().strip()
+        for section, headers in SECTION_HEADERS.items():
+            for header in headers:
+                if clean == header:
+                    return section, ""
+        return None
+
+
+def header_line(rng, section):
+    language = rng.choice(["en", "en", "en", "de", "fr", "es"])
+    text = rng.choice(LANGUAGE_HEADERS[language][section])
+    style = rng.randrange(4)
+    if style == 0:
+        return text.title()
+    if style == 1:
+        return text.upper() + ":"
+    if style == 2:
+        return f"== {text.title()} =="
+    return text.title()
+
+
+def resume(i, rng):
+    lines = [f"Candidate {i}", f"candidate{i}@example.com | +1 555 {rng.randint(1000, 9999)}", ""]
+    lines += [header_line(rng, "summary"), "Data professional with experience in analytics and ML.", ""]
+    lines.append(header_line(rng, "experience"))
+    for role in range(rng.randint(2, 8)):
+        lines.append(f"Company {i}-{role} - Senior Engineer, 01/{2010 + role} - 12/{2011 + role}")
+        lines += [
+            f"- Built {rng.choice(['pipelines', 'models', 'services'])} using {rng.choice(SKILLS)} "
+            f"and {rng.choice(SKILLS)} for {rng.randint(2, 90)} teams"
+            for _ in range(rng.randint(3, 6))
+        ]
+        lines.append("")
+    lines += [header_line(rng, "education"), "BSc Computer Science, Example University, 2010", ""]
+    skills = ", ".join(rng.sample(SKILLS, 5))
+    if rng.random() < 0.3:
+        lines.append(f"Skills: {skills}")
+    else:
+        lines += [header_line(rng, "skills"), skills]
+    return "\n".join(lines)
+
+
+def segment_all(texts, matcher):
+    start = time.perf_counter()
+    found = 0
+    for text in texts:
+        segmenter = IncrementalSegmenter(matcher)
+        segmenter.feed(text)
+        found += len(segmenter._sections)
+        segmenter.sections()
+    return time.perf_counter() - start, found
+
+
+def per_line_ns(matcher, lines, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            matcher.match(line)
+        best = min(best, time.perf_counter() - start)
+    return best / len(lines) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [resume(i, rng) for i in range(args.resumes)]
+    lines = [line for text in texts[:1000] for line in text.split("\n")]
+    # The corpus mixes languages: match every bundled one
+    new = build_header_matcher(",".join(LANGUAGE_HEADERS))
+    headers = [line for line in lines if new.match(line)]
+    content = [line for line in lines if not new.match(line)]
+
+    total_lines = sum(text.count("\n") + 1 for text in texts)
+    print(f"{args.resumes} resumes, {total_lines} lines, {len(new.index)} headers in the index")
+    for label, matcher in (("previous", LegacyMatcher()), ("HeaderMatcher", new)):
+        elapsed, found = segment_all(texts, matcher)
+        print(
+            f"{label:<14} {args.resumes / elapsed:9.0f} resumes/s  "
+            f"{elapsed / total_lines * 1e9:6.0f} ns/line  "
+            f"header line {per_line_ns(matcher, headers):6.0f} ns  "
+            f"content line {per_line_ns(matcher, content):6.0f} ns  "
+            f"sections found {found / args.resumes:.2f}/resume (of 4)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Worker cold-start cost: import time of app.main and time to first
+response from a fresh uvicorn process (no GEMINI_API_KEY set).
+
+Usage:
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.pop("GEMINI_API_KEY", None)
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+
+def import_time(module: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+        capture_output=True, text=True, env=_env(), check=True,
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(timeout: float = 30.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=_env(),
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/jobs/", timeout=1)
+                return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("server did not answer")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in ("fastapi", "google.generativeai", "app.main"):
+        times = [import_time(module) for _ in range(args.runs)]
+        print(f"import {module:<20} median {statistics.median(times):.3f}s")
+
+    times = [time_to_first_response() for _ in range(args.runs)]
+    print(f"time to first /jobs/ response: median {statistics.median(times):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Read/write throughput of the store backends under concurrent workers.
+
+The sqlite backend is driven by separate processes (like uvicorn workers)
+sharing one database file; the in-memory backend by threads in one process.
+
+Usage:
+    python -m benchmarks.store_throughput --workers 1 4 8 --ops 2000
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.models import ProfessionalProfile, Skill
+from app.store.memory import InMemoryStore
+from app.store.sqlite import SqliteStore
+from benchmarks.ranking import SKILL_POOL
+
+
+def _profile(worker: int, i: int, rng: random.Random) -> ProfessionalProfile:
+    return ProfessionalProfile(
+        candidate_id=f"w{worker}_c{i}",
+        title=None,
+        total_experience_years=rng.randint(0, 15),
+        skills=[Skill(name=s) for s in rng.sample(SKILL_POOL, 12)],
+        experiences=[],
+    )
+
+
+def _run_ops(store, worker: int, ops: int, batch: int) -> None:
+    rng = random.Random(worker)
+    written = 0
+    while written < ops:
+        store.save_profiles([_profile(worker, written + k, rng) for k in range(batch)])
+        written += batch
+        for _ in range(batch):
+            store.get_profile(f"w{worker}_c{rng.randrange(written)}")
+
+
+def _sqlite_worker(path: str, worker: int, ops: int, batch: int) -> None:
+    _run_ops(SqliteStore(path, pool_size=2), worker, ops, batch)
+
+
+def bench_sqlite(workers: int, ops: int, batch: int) -> float:
+    path = os.path.join(tempfile.mkdtemp(), "store.sqlite")
+    SqliteStore(path)  # create schema up front
+
+    procs = [
+        multiprocessing.Process(target=_sqlite_worker, args=(path, w, ops, batch))
+        for w in range(workers)
+    ]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - start
+
+    # A fresh worker sees every write through the shared file
+    store = SqliteStore(path)
+    store.sync()
+    assert len(store.profile_matrix) == workers * ops
+    return elapsed
+
+
+def bench_memory(workers: int, ops: int, batch: int) -> float:
+    store = InMemoryStore()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(lambda w: _run_ops(store, w, ops, batch), range(workers)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--ops", type=int, default=2000, help="writes (and reads) per worker")
+    parser.add_argument("--batch", type=int, default=50, help="profiles per bulk insert")
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        total = 2 * workers * args.ops
+        for name, bench in (("memory", bench_memory), ("sqlite", bench_sqlite)):
+            elapsed = bench(workers, args.ops, args.batch)
+            print(
+                f"{name:>6} | {workers} workers | {total} ops in {elapsed:6.2f}s "
+                f"| {total / elapsed:9.0f} ops/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Streaming ingestion: whole-file parse-then-extract vs page-by-page
+parsing with section extraction starting as soon as a section closes.
+
+Runs both ResumeExtractionPipeline paths in-process against the stub LLM
+backend, over generated PDFs read with pdfplumber (the slow engine, where
+parsing is long enough to overlap with LLM calls). The stub charges
+--token-latency per response token, so like a real model the long
+experience answer is the slowest call. "skills last" puts the Skills
+section at the end; "skills first" puts it right after the summary.
+The personal-info prompt reads every section, so it always starts after
+the last page.
+
+Also reports peak Python heap while reading one large PDF: whole-text
+extraction vs streaming pages through IncrementalSegmenter.
+
+Usage:
+    python -m benchmarks.streaming_ingestion --pages 2 6 12 --latency 0.3 --token-latency 0.03
+"""
+
+import os
+
+# Parse in-process with pdfplumber; both are read when the app modules load
+os.environ["INGEST_PROCESSES"] = "0"
+os.environ["PDF_TEXT_ENGINE"] = "pdfplumber"
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import pdfplumber
+
+from app.core.ingestion import DocumentStream
+from app.core.segmentation import IncrementalSegmenter, segment_resume
+from app.core.stub_llm import StubLLMBackend
+from app.pipelines.resume_pipeline import ResumeExtractionPipeline
+from benchmarks.pdf_corpus import make_pdf, resume_lines
+
+
+async def parse_then_extract(pipeline: ResumeExtractionPipeline, path: str):
+    sections = await asyncio.to_thread(pipeline.parse, path)
+    return await pipeline.astructure(sections)
+
+
+async def timed(run, pipeline, paths):
+    latencies, results = [], []
+    for path in paths:
+        start = time.perf_counter()
+        results.append(await run(pipeline, path))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def write_pdfs(directory, files, pages, skills_first):
+    rng = random.Random(0)
+    paths = []
+    for i in range(files):
+        path = os.path.join(directory, f"{'first' if skills_first else 'last'}_{pages}_{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(make_pdf(resume_lines(i, pages, rng, skills_first=skills_first)))
+        paths.append(path)
+    return paths
+
+
+def peak_memory(read):
+    tracemalloc.start()
+    read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 6, 12])
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.03)
+    parser.add_argument("--memory-pages", type=int, default=20)
+    args = parser.parse_args()
+
+    llm = StubLLMBackend(latency=args.latency, token_latency=args.token_latency, seed=0)
+    pipeline = ResumeExtractionPipeline(llm)
+    print(
+        f"stub LLM {args.latency:.2f}s + {args.token_latency * 1000:.0f}ms/token per call, "
+        f"pdfplumber, mean of {args.files} resumes"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        for skills_first in (False, True):
+            for pages in args.pages:
+                paths = write_pdfs(directory, args.files, pages, skills_first)
+                # Per-section progress logging would dominate the output
+                with contextlib.redirect_stdout(io.StringIO()):
+                    before, batch = asyncio.run(timed(parse_then_extract, pipeline, paths))
+                    after, streamed = asyncio.run(timed(ResumeExtractionPipeline.arun, pipeline, paths))
+                assert batch == streamed
+                label = "skills first" if skills_first else "skills last"
+                print(
+                    f"{label:<13} {pages:>2} pages: parse-then-extract {statistics.mean(before):6.2f}s  "
+                    f"streaming {statistics.mean(after):6.2f}s  (same output)"
+                )
+
+        path = write_pdfs(directory, 1, args.memory_pages, False)[0]
+
+        def whole():
+            # The previous read path: every page's layout objects stay cached until the file closes
+            with pdfplumber.open(path) as pdf:
+                text = "\n".join(page.extract_text() for page in pdf.pages)
+            segment_resume(text)
+
+        def streamed():
+            segmenter = IncrementalSegmenter()
+            for chunk in DocumentStream(path):
+                segmenter.feed(chunk)
+            segmenter.sections()
+
+        print(
+            f"peak heap reading one {args.memory_pages}-page PDF: "
+            f"whole document {peak_memory(whole):6.1f} MiB, page by page {peak_memory(streamed):6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Time-to-first-byte of /compare_v3/{job}/{candidate}/ask (buffered) vs
+/ask/stream (SSE) against a streaming stub backend, over real HTTP.
+
+The app runs under uvicorn in a background thread; the stub waits
+--first-token seconds before the first chunk and --token-latency per
+further chunk, so a buffered answer takes roughly
+first_token + n_chunks * token_latency.
+
+Usage:
+    python -m benchmarks.streaming_ttfb --requests 10 --first-token 0.4 --token-latency 0.01
+"""
+
+import argparse
+import http.client
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+
+from app.api import compare_v3
+from app.core.models import JobRequirement, ProfessionalProfile, Skill
+from app.core.stub_llm import StubLLMBackend
+from app.main import app
+from app.store import get_store
+
+
+ANSWER = " ".join(
+    ["- The candidate covers Python, SQL and data visualisation; machine learning "
+     "is implied by pandas experience, while cloud deployment is a gap."] * 6
+)
+
+
+def _serve() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def _request(port: int, path: str):
+    """(seconds to first body byte, seconds to first answer token, total seconds)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    start = time.perf_counter()
+    conn.request("POST", path)
+    response = conn.getresponse()
+
+    first_byte = first_token = None
+    while True:
+        line = response.readline()
+        if not line:
+            break
+        now = time.perf_counter() - start
+        if first_byte is None:
+            first_byte = now
+        if first_token is None and (line.startswith(b"event: token") or b'"answer"' in line):
+            first_token = now
+    total = time.perf_counter() - start
+    conn.close()
+    return first_byte, first_token, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--first-token", type=float, default=0.4)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    stub = StubLLMBackend(
+        rules=[("explaining how a candidate aligns", ANSWER)],
+        latency=args.first_token,
+        token_latency=args.token_latency,
+    )
+    compare_v3.get_llm_backend = lambda: stub
+
+    store = get_store()
+    store.save_job(JobRequirement(
+        job_id="bench_job", title="Data Scientist",
+        required_skills=["python", "machine learning", "sql"],
+        preferred_skills=["aws"], min_experience_years=2, domain=None,
+    ))
+    store.save_profile(ProfessionalProfile(
+        candidate_id="bench_candidate", title=None, total_experience_years=4,
+        skills=[Skill(name=s) for s in ["Python", "SQL", "pandas", "Tableau"]],
+        experiences=[],
+    ))
+
+    port = _serve()
+    base = "/compare_v3/bench_job/bench_candidate/ask"
+    query = "?question=What%20am%20I%20missing%3F"
+
+    print(f"stub: first token {args.first_token:.3f}s, {args.token_latency:.3f}s/chunk, "
+          f"{len(ANSWER.split())} chunks")
+    for label, path in (("buffered /ask", base + query), ("SSE /ask/stream", base + "/stream" + query)):
+        runs = [_request(port, path) for _ in range(args.requests)]
+        first_byte = statistics.median(r[0] for r in runs)
+        first_token = statistics.median(r[1] for r in runs)
+        total = statistics.median(r[2] for r in runs)
+        print(f"{label:<17} first byte {first_byte * 1000:8.1f} ms | "
+              f"first answer token {first_token * 1000:8.1f} ms | complete {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
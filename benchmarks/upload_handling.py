@@ -0,0 +1,125 @@
+"""
+Upload handling for /resume/extract: copying each upload to a named temp
+file and parsing it by path (the previous handler) vs parsing the upload
+buffer in memory.
+
+Uploads are wrapped in a SpooledTemporaryFile with Starlette's 1 MB
+threshold, as the multipart parser does, so uploads above it hit disk once
+in both modes. Bytes written are this process's write() syscalls
+(/proc/self/io wchar) per upload; leaked files are what is left behind in
+the temp directory. Runs in-process against a zero-latency stub LLM, so
+latency is ingestion + pipeline overhead.
+
+Usage:
+    python -m benchmarks.upload_handling --uploads 50
+"""
+
+import os
+
+# Parse in-process so all file I/O is this process's
+os.environ["INGEST_PROCESSES"] = "0"
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from docx import Document
+
+from app.core.stub_llm import StubLLMBackend
+from app.pipelines.resume_pipeline import ResumeExtractionPipeline
+from benchmarks.pdf_corpus import make_pdf, resume_lines
+
+SPOOL_MAX_SIZE = 1024 * 1024  # starlette.formparsers.MultiPartParser.max_file_size
+
+
+def _docx() -> bytes:
+    doc = Document()
+    for page in resume_lines(0, 2, random.Random(0)):
+        for line in page:
+            doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _written_bytes() -> int:
+    with open("/proc/self/io") as f:
+        return int(next(line for line in f if line.startswith("wchar:")).split()[1])
+
+
+def _spooled(content: bytes) -> tempfile.SpooledTemporaryFile:
+    upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    upload.write(content)
+    upload.seek(0)
+    return upload
+
+
+async def via_temp_file(pipeline, upload, suffix):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(upload, tmp)
+    return await pipeline.arun(tmp.name)
+
+
+async def in_memory(pipeline, upload, suffix):
+    return await pipeline.arun(upload, suffix=suffix)
+
+
+async def measure(handler, pipeline, content, suffix, uploads):
+    latencies, written = [], []
+    for _ in range(uploads):
+        before = _written_bytes()
+        start = time.perf_counter()
+        upload = _spooled(content)
+        try:
+            await handler(pipeline, upload, suffix)
+        finally:
+            upload.close()
+        latencies.append(time.perf_counter() - start)
+        written.append(_written_bytes() - before)
+    return statistics.mean(latencies), statistics.mean(written)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cases = [
+        ("docx", ".docx", _docx()),
+        ("2-page pdf", ".pdf", make_pdf(resume_lines(0, 2, rng))),
+        ("pdf + 3 MB images", ".pdf", make_pdf(resume_lines(1, 2, rng), padding=3_000_000)),
+    ]
+    pipeline = ResumeExtractionPipeline(StubLLMBackend(latency=0, seed=0))
+
+    scratch = tempfile.mkdtemp(prefix="upload_bench_")
+    tempfile.tempdir = scratch  # so leaked temp files can be counted
+    try:
+        print(f"{args.uploads} uploads per case, stub LLM with no latency")
+        for label, suffix, content in cases:
+            for mode, handler in (("temp file", via_temp_file), ("in memory", in_memory)):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    latency, written = asyncio.run(
+                        measure(handler, pipeline, content, suffix, args.uploads)
+                    )
+                leaked = len(os.listdir(scratch))
+                for name in os.listdir(scratch):
+                    os.remove(os.path.join(scratch, name))
+                print(
+                    f"{label:<18} {len(content) / 1024:7.0f} KiB  {mode:<10} "
+                    f"{latency * 1000:7.2f} ms/upload  {written / 1024:8.1f} KiB written/upload  "
+                    f"{leaked} files leaked"
+                )
+    finally:
+        tempfile.tempdir = None
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import io
+import shutil
+import zipfile
+
+import pytest
+
+from app.pipelines import bulk
+
+
+def _zip(members) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_batch_stops_staging_at_the_total_bytes_limit(monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_BATCH_BYTES", 250)
+    uploads = [
+        ("a.pdf", io.BytesIO(b"x" * 100)),
+        ("resumes.zip", _zip([("b.pdf", b"x" * 100), ("c.pdf", b"x" * 100)])),
+        ("d.pdf", io.BytesIO(b"x" * 100)),
+        ("e.docx", io.BytesIO(b"x" * 50)),
+    ]
+
+    staging_dir, staged, skipped = bulk.stage_uploads(uploads)
+    try:
+        assert [name for name, _ in staged] == ["a.pdf", "b.pdf", "e.docx"]
+        assert [item["filename"] for item in skipped] == ["c.pdf", "d.pdf"]
+        assert all("bytes reached" in item["reason"] for item in skipped)
+    finally:
+        shutil.rmtree(staging_dir)
+
+
+def test_upload_is_refused_when_the_disk_is_full(monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_DISK_USAGE", 0.0)
+
+    with pytest.raises(bulk.StagingDiskFull):
+        bulk.stage_uploads([("a.pdf", io.BytesIO(b"x"))])
+
+
+class _FailingUpload(io.BytesIO):
+    def read(self, size=-1):
+        raise OSError("connection reset")
+
+
+def test_failed_staging_leaves_no_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(bulk.tempfile, "tempdir", str(tmp_path))
+
+    with pytest.raises(OSError):
+        bulk.stage_uploads([("a.pdf", io.BytesIO(b"x" * 10)), ("b.pdf", _FailingUpload())])
+    assert list(tmp_path.iterdir()) == []
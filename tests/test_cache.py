@@ -0,0 +1,104 @@
+import time
+
+from app.core.cache import LRUCache, SqliteCache, TieredCache, make_cache_key
+
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache(ttl=0.05)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+    time.sleep(0.06)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+    assert cache.info()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.info()["evictions"] == 1
+
+
+def test_max_bytes_bounds_the_total_size():
+    cache = LRUCache(max_bytes=10)
+    cache.set("a", "x" * 4)
+    cache.set("b", "x" * 4)
+    cache.set("c", "x" * 4)
+
+    assert cache.get("a") is None
+    assert cache.info()["bytes"] == 8
+    # A value larger than the whole budget is not cached at all
+    cache.set("big", "x" * 11)
+    assert cache.get("big") is None
+    assert len(cache) == 2
+
+    # Overwriting a key frees its old size
+    cache.set("b", "x")
+    assert cache.info()["bytes"] == 5
+
+
+def test_counters_track_hits_and_misses():
+    cache = LRUCache()
+    cache.set("k", "v")
+    cache.get("k")
+    cache.get("k")
+    cache.get("missing")
+
+    info = cache.info()
+    assert (info["hits"], info["misses"]) == (2, 1)
+
+
+def test_sqlite_tier_survives_a_new_instance(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    SqliteCache(path).set("k", "v")
+
+    reopened = SqliteCache(path)
+    assert reopened.get("k") == "v"
+    assert len(reopened) == 1
+    assert SqliteCache(path, ttl=1e-9).get("k") is None
+
+
+def test_sqlite_tier_evicts_the_oldest_entries(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.sqlite", max_entries=2)
+    for key in "abc":
+        cache.set(key, key)
+        time.sleep(0.001)
+
+    assert cache.get("a") is None
+    assert len(cache) == 2
+    assert cache.info()["evictions"] == 1
+
+
+def test_disk_hits_back_fill_memory(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    TieredCache(LRUCache(), SqliteCache(path)).set("k", "v")
+
+    # A fresh process: empty memory tier over the same file
+    memory, disk = LRUCache(), SqliteCache(path)
+    cache = TieredCache(memory, disk)
+    assert cache.get("k") == "v"
+    assert cache.get("k") == "v"
+
+    assert memory.get("k") == "v"
+    assert disk.info()["hits"] == 1
+    assert cache.get("missing", "default") == "default"
+    assert [tier["misses"] for tier in cache.info()["tiers"]] == [2, 1]
+
+
+def test_cache_key_depends_on_every_input():
+    key = make_cache_key("model", {"temperature": 0}, "prompt")
+
+    assert key == make_cache_key("model", {"temperature": 0}, "prompt")
+    assert len({
+        key,
+        make_cache_key("other", {"temperature": 0}, "prompt"),
+        make_cache_key("model", {"temperature": 1}, "prompt"),
+        make_cache_key("model", {"temperature": 0}, "prompt!"),
+    }) == 4
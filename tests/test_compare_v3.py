@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.llm_backend import get_llm_backend
+from app.core.models import JobRequirement, ProfessionalProfile, Skill
+from app.main import app
+from app.store import get_store
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "stub")
+    monkeypatch.setenv("LLM_STUB_TOKEN_LATENCY", "0.001")
+    # Injected errors fail at once instead of being retried
+    monkeypatch.setattr(rate_limit, "llm_scheduler", rate_limit.LLMScheduler(max_attempts=1))
+    get_llm_backend.cache_clear()
+    store = get_store()
+    store.save_job(JobRequirement(
+        job_id="sse-job", title="Data Scientist", required_skills=["python", "machine learning"],
+        preferred_skills=["docker"], min_experience_years=1, domain=None,
+    ))
+    store.save_profile(ProfessionalProfile(
+        candidate_id="sse-candidate", title=None, total_experience_years=3,
+        skills=[Skill(name="Python")], experiences=[],
+    ))
+    yield TestClient(app)
+    get_llm_backend.cache_clear()
+
+
+def _events(body: str):
+    """(event, data) pairs of an SSE body, checking each frame's layout."""
+    assert body.endswith("\n\n")
+    events = []
+    for frame in body[:-2].split("\n\n"):
+        event, data = frame.split("\n")
+        assert event.startswith("event: ") and data.startswith("data: ")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_streamed_answer_is_framed_as_context_tokens_done(client):
+    response = client.post("/compare_v3/sse-job/sse-candidate/ask/stream", params={"question": "What am I missing?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "context" and names[-1] == "done"
+    assert set(names[1:-1]) == {"token"} and len(names) > 3
+
+    assert events[0][1]["question"] == "What am I missing?"
+    assert "alignment_context" in events[0][1]
+    tokens = "".join(data["text"] for name, data in events if name == "token")
+    assert tokens == events[-1][1]["answer"]
+
+
+def test_failed_generation_ends_with_an_error_event(client, monkeypatch):
+    monkeypatch.setenv("LLM_STUB_ERROR_RATE", "1")
+    get_llm_backend.cache_clear()
+
+    response = client.post("/compare_v3/sse-job/sse-candidate/ask/stream", params={"question": "q"})
+
+    assert response.status_code == 200
+    events = _events(response.text)
+    assert [name for name, _ in events] == ["context", "error"]
+    assert "stub injected error" in events[1][1]["detail"]
+
+
+def test_unknown_pair_is_a_404_before_streaming(client):
+    response = client.post("/compare_v3/sse-job/nobody/ask/stream", params={"question": "q"})
+
+    assert response.status_code == 404
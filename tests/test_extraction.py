@@ -0,0 +1,74 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core import extraction
+from app.core.rate_limit import llm_scheduler
+from app.core.stub_llm import StubLLMBackend
+from app.core.segmentation import segment_resume
+from benchmarks.experience_chunking import resume
+
+
+def _experience(n_roles: int) -> str:
+    return segment_resume(resume(n_roles, random.Random(n_roles)))["experience"]
+
+
+def test_ordinary_experience_is_one_call():
+    for n_roles in (3, 6):
+        assert len(extraction._fit_input("experience", extraction.EXPERIENCE_PROMPT, _experience(n_roles))[0]) == 1
+
+
+def test_long_experience_is_split_into_whole_roles_within_the_answer_budget():
+    text = _experience(30)
+    pieces, changed = extraction._fit_input("experience", extraction.EXPERIENCE_PROMPT, text)
+
+    assert changed and len(pieces) > 1
+    assert all(extraction._answer_tokens(piece) <= extraction.EXPERIENCE_ANSWER_TOKENS for piece in pieces)
+    assert sum(piece.count("Company ") for piece in pieces) == text.count("Company ")
+    assert all(piece.startswith("Company ") for piece in pieces)
+
+
+class _CountingStub(StubLLMBackend):
+    """A slow stub that counts the extract() calls still running."""
+
+    def __init__(self, **kwargs):
+        super().__init__(latency=5, **kwargs)
+        self.running = 0
+        self._lock = threading.Lock()
+
+    def extract(self, prompt, input_text):
+        with self._lock:
+            self.running += 1
+        try:
+            return super().extract(prompt, input_text)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.mark.parametrize("scheduler", [None, llm_scheduler])
+def test_timed_out_calls_stop_instead_of_holding_pool_threads(scheduler):
+    llm = _CountingStub(scheduler=scheduler)
+    started = time.monotonic()
+
+    result = extraction.extract_resume_structured(segment_resume(resume(3, random.Random(3))), llm, section_timeout=0.2)
+    time.sleep(0.1)
+
+    assert time.monotonic() - started < 1
+    assert result["experience"] == [] and result["education"] == []
+    assert llm.running == 0
+
+
+def test_section_deadline_starts_when_its_worker_does(monkeypatch):
+    # One worker: sections run one after another, each well within the timeout
+    monkeypatch.setattr(extraction, "_extraction_pool", ThreadPoolExecutor(max_workers=1))
+    llm = StubLLMBackend(latency=0.1)
+    sections = segment_resume(resume(3, random.Random(3)))
+
+    result = extraction.extract_resume_structured(sections, llm, section_timeout=0.3)
+
+    assert llm.calls >= 3
+    assert result == extraction.extract_resume_structured(sections, StubLLMBackend(), concurrent=False)
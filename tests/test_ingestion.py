@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from app.core import ingestion, ingestion_pool
+from app.core.ingestion import DocumentStream, _text_problem, extract_document
+from app.core.ingestion_pool import IngestionPool, IngestionWorkerCrashed
+from app.pipelines.resume_pipeline import ResumeExtractionPipeline
+from benchmarks.pdf_corpus import make_pdf, resume_lines
+
+
+@pytest.fixture
+def in_process(monkeypatch):
+    monkeypatch.setenv("INGEST_PROCESSES", "0")
+    monkeypatch.setenv("INGEST_MAX_PAGES", "2")
+    for factory in (ingestion_pool.get_ingestion_pool, ingestion_pool.get_max_pages):
+        factory.cache_clear()
+    yield
+    for factory in (ingestion_pool.get_ingestion_pool, ingestion_pool.get_max_pages):
+        factory.cache_clear()
+
+
+def test_max_pages_applies_without_the_pool(in_process):
+    pdf = make_pdf(resume_lines(0, 5, random.Random(0)))
+
+    assert ResumeExtractionPipeline.extract(pdf, ".pdf").pages == 2
+    stream = ResumeExtractionPipeline.iter_document(pdf, ".pdf")
+    list(stream)
+    assert stream.pages == 2
+
+
+PAGES = [["Page one text", "Experience"], ["Page two text"], ["Page three text"]]
+
+
+def test_garbled_text_is_detected():
+    assert _text_problem("Plain résumé text, 2020 – 2023") is None
+    assert _text_problem("  \n ") == "no text"
+    assert "garbled" in _text_problem("ab\ufffd\ufffd\x01cd")
+
+
+@pytest.mark.parametrize("garbled_page, engine", [(0, "pdfplumber"), (1, "pdfium+pdfplumber")])
+def test_garbled_pdfium_page_falls_back_to_pdfplumber(monkeypatch, garbled_page, engine):
+    pdfium_text = ingestion._pdfium_page_text
+
+    def garble(pdf, index):
+        text = pdfium_text(pdf, index)
+        return "\ufffd" * len(text) if index == garbled_page else text
+    monkeypatch.setattr(ingestion, "_pdfium_page_text", garble)
+
+    stream = DocumentStream(make_pdf(PAGES), suffix=".pdf")
+    chunks = list(stream)
+
+    assert [chunk.split("\n")[0] for chunk in chunks] == ["Page one text", "Page two text", "Page three text"]
+    assert (stream.engine, stream.pages) == (engine, 3)
+
+
+def test_failed_pdfium_parse_falls_back_to_pdfplumber(monkeypatch):
+    def broken(source):
+        raise ingestion.pdfium.PdfiumError("Failed to load document")
+    monkeypatch.setattr(ingestion.pdfium, "PdfDocument", broken)
+    pdf = make_pdf(PAGES)
+
+    document = extract_document(pdf, suffix=".pdf")
+    assert (document.engine, document.pages) == ("pdfplumber", 3)
+    assert "Page three text" in document.text
+    # Only "auto" falls back
+    with pytest.raises(ingestion.pdfium.PdfiumError):
+        extract_document(pdf, engine="pdfium", suffix=".pdf")
+
+
+def test_pdfium_without_text_falls_back_to_pdfplumber(monkeypatch):
+    monkeypatch.setattr(ingestion, "_pdfium_page_text", lambda pdf, index: "")
+
+    document = extract_document(make_pdf(PAGES), suffix=".pdf")
+    assert (document.engine, document.pages) == ("pdfplumber", 3)
+
+
+class _BrokenConn:
+    def send(self, message):
+        raise BrokenPipeError
+
+    def close(self):
+        pass
+
+
+class _DeadWorker:
+    """A worker whose process is gone: sending it a file fails."""
+
+    def __init__(self):
+        self.conn = _BrokenConn()
+        self.ready = True
+        self.process = type("Process", (), {"pid": 0})()
+
+    def wait_ready(self):
+        pass
+
+    def kill(self):
+        pass
+
+
+def test_failed_restart_keeps_the_slot(monkeypatch):
+    pool = IngestionPool(processes=1)
+    pool._started = True
+    pool._idle.put(_DeadWorker())
+
+    def no_spawn(ctx):
+        raise OSError("cannot spawn")
+    monkeypatch.setattr(ingestion_pool, "_Worker", no_spawn)
+
+    with pytest.raises(IngestionWorkerCrashed):
+        pool.extract_text(b"%PDF", ".pdf")
+    assert pool._idle.qsize() == 1
+
+    # The next caller retries the start instead of waiting forever
+    with pytest.raises(OSError):
+        pool.extract_text(b"%PDF", ".pdf")
+    assert pool._idle.qsize() == 1
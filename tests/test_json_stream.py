@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core import transferable
+from app.core.json_stream import JSONStreamParser, salvage_json
+from app.core.stub_llm import _chunks
+from app.core.transferable import TransferableSkillEngine, _add_inference as add_inference
+from app.store.skill_pairs import SkillPairStore
+
+ROLES = [
+    {"company": "Acme", "role": "Engineer", "years": 3, "remote": True, "tags": ["python", "sql"]},
+    {"company": "Say \"hi\" \\ Co", "role": "Lead\nEngineer", "years": 1.5, "remote": None, "tags": []},
+    {"company": "Initech", "role": "Analyst", "years": -2e1, "remote": False, "tags": [["nested"]]},
+]
+TEXT = json.dumps(ROLES)
+
+
+def _feed(chunks):
+    parser = JSONStreamParser()
+    emitted = []
+    for chunk in chunks:
+        emitted.extend(parser.feed(chunk))
+    return parser, emitted
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_tokens_split_across_chunks(size):
+    parser, emitted = _feed(TEXT[i:i + size] for i in range(0, len(TEXT), size))
+
+    assert emitted == ROLES
+    assert parser.close() == ROLES
+    assert parser.intact
+
+
+def test_elements_are_emitted_as_they_close():
+    parser = JSONStreamParser()
+    first_end = TEXT.index("}") + 1
+
+    assert parser.feed(TEXT[:first_end - 1]) == []
+    assert parser.feed(TEXT[first_end - 1:first_end + 1]) == [ROLES[0]]
+    assert parser.feed(TEXT[first_end + 1:]) == ROLES[1:]
+
+
+@pytest.mark.parametrize("text", ['["a\\"b", "c"]', '["\\\\", "\\"\\""]', '[{"k": "x\\\\\\"y"}]'])
+def test_escaped_quotes_split_at_every_point(text):
+    for cut in range(1, len(text)):
+        parser, emitted = _feed([text[:cut], text[cut:]])
+        assert emitted == json.loads(text), cut
+        assert parser.close() == json.loads(text)
+
+
+def test_truncated_nested_arrays_keep_their_complete_elements():
+    text = json.dumps([[1, [2, 3]], [4, [5, 6]], {"a": [7, [8, 9]]}])
+
+    for cut in range(1, len(text)):
+        value, intact = salvage_json(text[:cut])
+        assert not intact
+        # Every element kept is one of the answer's, in order, unaltered
+        assert value == json.loads(text)[:len(value)], cut
+
+    parser, emitted = _feed([text[:text.index("[5")]])
+    assert emitted == [[1, [2, 3]]]
+    assert parser.close() == [[1, [2, 3]]]
+    assert parser.truncated
+
+
+def test_object_members_survive_truncation():
+    value, intact = salvage_json('```json\n{"name": "Jane", "skills": ["python", "sq')
+
+    assert value == {"name": "Jane", "skills": ["python"]}
+    assert not intact
+
+
+def test_no_document_is_an_error():
+    with pytest.raises(ValueError):
+        salvage_json("I could not find anything")
+
+
+class _StreamingLLM:
+    """Streams `answer` word by word, counting the chunks sent so far."""
+
+    def __init__(self, answer: str):
+        self.chunks = _chunks(answer)
+        self.sent = 0
+
+    async def agenerate_stream(self, prompt):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def test_streamed_transferable_entries_are_validated_before_the_answer_ends(monkeypatch):
+    answer = json.dumps([
+        {"source_skill": "sql", "target_skill": "dbt", "justification": "x", "confidence": 0.7},
+        {"source_skill": "sql", "target_skill": "spark", "justification": "y", "confidence": "high"},
+        {"source_skill": "sql", "target_skill": "airflow", "justification": "z", "confidence": 0.4},
+    ])
+    llm = _StreamingLLM(answer[:-40])
+    engine = TransferableSkillEngine(llm=llm, pair_store=SkillPairStore())
+    validated_at = []
+
+    def spy(inferences, entry):
+        validated_at.append(llm.sent)
+        return add_inference(inferences, entry)
+    monkeypatch.setattr(transferable, "_add_inference", spy)
+
+    inferences = asyncio.run(engine.ainfer(["sql"], ["dbt", "spark", "airflow"]))
+
+    assert [(inf.source_skill, inf.target_skill) for inf in inferences] == [("sql", "dbt")]
+    assert validated_at[0] < len(llm.chunks)
+    # Cut short, with an invalid entry: only the answered pair is recorded, nothing is memoized
+    assert len(engine.pair_store) == 1
+    assert len(engine.cache) == 0
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core import llm_client
+from app.core.cache import LRUCache
+from app.core.rate_limit import llm_deadline
+
+
+class _Response:
+    text = "ok"
+
+
+class _SlowModel:
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        await asyncio.sleep(10)
+        return _Response()
+
+
+@pytest.mark.parametrize("scheduler", [None, llm_client.llm_scheduler])
+def test_cancelled_call_leaves_no_call_in_flight(scheduler):
+    async def main():
+        client = llm_client.GeminiClient(pool_size=1, scheduler=scheduler, cache=LRUCache(16))
+        client._model = _SlowModel()
+        call = asyncio.create_task(client.agenerate("prompt"))
+        await asyncio.sleep(0.05)
+        assert client.health.in_flight == 1
+
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0.01)
+
+        assert client.health.in_flight == 0
+        assert client.health.failures == 0
+        assert not client._async_slot().locked()
+
+    asyncio.run(main())
+
+
+class _TimeoutError(Exception):
+    code = 504
+
+
+class _TimedModel:
+    """Answers after 0.2s, or fails with a 504 at the request timeout if that is sooner."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        self.calls += 1
+        timeout = (request_options or {}).get("timeout", 10)
+        time.sleep(min(timeout, 0.2))
+        if timeout < 0.2:
+            raise _TimeoutError("deadline exceeded")
+        return _Response()
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False, request_options=None):
+        self.calls += 1
+        timeout = (request_options or {}).get("timeout", 10)
+        await asyncio.sleep(min(timeout, 0.2))
+        if timeout < 0.2:
+            raise _TimeoutError("deadline exceeded")
+        return _Response()
+
+
+def test_coalesced_async_caller_outlives_the_leaders_deadline():
+    async def main():
+        client = llm_client.GeminiClient(scheduler=None, cache=LRUCache(16))
+        client._model = _TimedModel()
+
+        async def leader():
+            with llm_deadline(time.monotonic() + 0.05):
+                return await client.agenerate("prompt")
+
+        first = asyncio.create_task(leader())
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(client.agenerate("prompt"))
+
+        with pytest.raises(_TimeoutError):
+            await first
+        assert await follower == "ok"
+        assert client._model.calls == 2
+
+    asyncio.run(main())
+
+
+def test_coalesced_thread_outlives_the_leaders_deadline():
+    client = llm_client.GeminiClient(scheduler=None, cache=LRUCache(16))
+    client._model = _TimedModel()
+    results = {}
+
+    def call(name, deadline):
+        with llm_deadline(deadline):
+            try:
+                results[name] = client.generate("prompt")
+            except _TimeoutError as e:
+                results[name] = e
+
+    leader = threading.Thread(target=call, args=("leader", time.monotonic() + 0.05))
+    leader.start()
+    time.sleep(0.01)
+    # A later deadline than the leader's, and an earlier one
+    followers = [
+        threading.Thread(target=call, args=("later", time.monotonic() + 5)),
+        threading.Thread(target=call, args=("earlier", time.monotonic() + 0.03)),
+    ]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert isinstance(results["leader"], _TimeoutError)
+    assert isinstance(results["earlier"], _TimeoutError)
+    assert results["later"] == "ok"
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from app.core.matching import SkillMatrix
+from app.core.models import JobRequirement, ProfessionalProfile, Skill
+from app.core.scoring import rank_profiles_against_job, score_profile_against_job
+
+SKILL_POOL = ["Python", "SQL", "Spark", "Tableau", "Airflow", "Docker", "AWS", "dbt", "pandas", "Kafka"]
+
+
+def _profile(candidate_id: str, skills) -> ProfessionalProfile:
+    return ProfessionalProfile(
+        candidate_id=candidate_id, title=None, total_experience_years=None,
+        skills=[Skill(name=s) for s in skills], experiences=[],
+    )
+
+
+def _random_skill(rng: random.Random) -> str:
+    skill = rng.choice(SKILL_POOL)
+    return skill.swapcase() if rng.random() < 0.3 else skill
+
+
+def _job(required, preferred=()) -> JobRequirement:
+    return JobRequirement(
+        job_id="j1", title="Data Engineer", required_skills=list(required),
+        preferred_skills=list(preferred), min_experience_years=None, domain=None,
+    )
+
+
+PROFILES = [
+    _profile("empty", []),
+    _profile("duplicates", ["Python", "Python", "SQL", "SQL", "SQL"]),
+    _profile("case", ["PYTHON", "python", "Sql", "spark"]),
+    _profile("unknown", ["COBOL", "Fortran"]),
+    _profile("both", ["Python", "Spark", "Docker"]),
+]
+
+JOBS = [
+    _job(["python", "sql"], ["spark", "docker"]),
+    # Duplicated and case-variant job skills count once
+    _job(["Python", "PYTHON", "sql", "SQL"], ["Spark", "spark"]),
+    # A skill both required and preferred counts as exact and partial
+    _job(["python"], ["python", "docker"]),
+    _job([], []),
+    _job(["rust"], ["go"]),
+]
+
+
+@pytest.mark.parametrize("job", JOBS)
+def test_matrix_counts_and_scores_match_the_per_pair_scorer(job):
+    matrix = SkillMatrix()
+    matrix.upsert_many(PROFILES)
+    exact, partial = matrix.match_counts(job)
+    scores = matrix.score(job)
+
+    for row, profile in enumerate(PROFILES):
+        expected = score_profile_against_job(profile, job)
+        assert exact[row] == len(expected.breakdown.exact_skill_matches), profile.candidate_id
+        assert partial[row] == len(expected.breakdown.partial_skill_matches), profile.candidate_id
+        assert scores[row] == expected.fit_score, profile.candidate_id
+
+
+def test_matrix_ranking_matches_the_reference_after_overwrites():
+    rng = random.Random(0)
+    matrix = SkillMatrix()
+    latest = {}
+    # Enough overwrites to trigger compaction several times
+    for _ in range(6):
+        batch = [
+            _profile(f"c{i}", [_random_skill(rng) for _ in range(rng.randint(0, 8))])
+            for i in range(500)
+        ]
+        matrix.upsert_many(batch)
+        latest.update((p.candidate_id, p) for p in batch)
+    matrix.upsert(_profile("c0", []))
+    latest["c0"] = _profile("c0", [])
+
+    for job in JOBS + [_job(SKILL_POOL[:4], SKILL_POOL[4:7])]:
+        for limit, min_score in ((None, 0.0), (25, 0.0), (10, 50.0)):
+            total, ranked = matrix.rank(job, limit=limit, min_score=min_score)
+            expected_total, expected = rank_profiles_against_job(latest.values(), job, limit=limit, min_score=min_score)
+            assert total == expected_total
+            assert [(score, p.candidate_id) for score, p in ranked] == [
+                (score, p.candidate_id) for score, p in expected
+            ]
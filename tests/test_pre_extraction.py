@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.pre_extraction import find_personal
+from app.core.segmentation import HEADER_SECTION, segment_resume
+
+
+@pytest.mark.parametrize("header", [
+    "Product Owner\njane@example.com",
+    "Machine Learning\ncontact@example.com | +1 555 010 0000",
+])
+def test_titles_are_not_taken_for_names(header):
+    assert find_personal(header)["name"] is None
+
+
+def test_name_needs_a_label_or_the_email_to_back_it():
+    assert find_personal("Jane Doe\njane.doe@example.com")["name"] == "Jane Doe"
+    assert find_personal("Name: Jane Doe")["name"] == "Jane Doe"
+    assert find_personal("Jane Doe\ncontact@example.com")["name"] is None
+
+
+@pytest.mark.parametrize("line, location", [
+    ("Python, SQL | jane@example.com", None),
+    ("Berlin, Germany | +1 555 010 0000", "Berlin, Germany"),
+    ("Austin, TX", "Austin, TX"),
+    ("Location: Austin TX", "Austin TX"),
+])
+def test_location_needs_a_known_region_or_a_label(line, location):
+    assert find_personal(f"Jane Doe\n{line}")["location"] == location
+
+
+def test_single_block_fallback_does_not_repeat_the_contact_block():
+    text = "Jane Doe\njane@example.com\n\nExperience\nAcme - Analyst, 2019 - 2021"
+    sections = segment_resume(text)
+
+    assert HEADER_SECTION not in sections
+    assert "\n\n".join(value for value in sections.values() if value).count("jane@example.com") == 1
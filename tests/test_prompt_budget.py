@@ -0,0 +1,42 @@
+import asyncio
+
+from app.core import llm_client
+from app.core.cache import LRUCache
+from app.core.prompt_budget import PromptLedger, estimate_tokens, prompt_site
+
+
+class _Response:
+    text = "an answer"
+
+
+class _Model:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return _Response()
+
+
+def test_only_model_calls_spend_tokens(monkeypatch):
+    ledger = PromptLedger()
+    monkeypatch.setattr(llm_client, "prompt_ledger", ledger)
+    client = llm_client.GeminiClient(cache=LRUCache(16), scheduler=None)
+    client._model = _Model()
+
+    async def main():
+        with prompt_site("site"):
+            # The second call coalesces onto the first, the third hits the cache
+            await asyncio.gather(client.agenerate("prompt"), client.agenerate("prompt"))
+            await client.agenerate("prompt")
+        # Outside any site: not accounted
+        await client.agenerate("another prompt")
+
+    asyncio.run(main())
+    counts = ledger.stats()["sites"]["site"]
+
+    assert client._model.calls == 2
+    assert list(ledger.stats()["sites"]) == ["site"]
+    assert (counts["calls"], counts["cached"]) == (1, 1)
+    assert counts["response_tokens"] == estimate_tokens(_Response.text)
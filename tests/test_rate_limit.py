@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.rate_limit import (
+    BATCH,
+    INTERACTIVE,
+    LLMDeadlineExceeded,
+    LLMScheduler,
+    TokenBucket,
+    llm_deadline,
+)
+from app.core.stub_llm import StubLLMError
+
+
+def _failing(status: int, failures: int):
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise StubLLMError("injected", status=status)
+        return "ok"
+    return fn, calls
+
+
+def test_interactive_waiters_are_served_before_batch():
+    async def main():
+        bucket = TokenBucket(rate=20, burst=1)
+        await bucket.aacquire()
+        order = []
+
+        async def take(name, priority):
+            await bucket.aacquire(priority)
+            order.append(name)
+
+        # Batch callers queue first, yet the interactive one gets the next token
+        batch = [asyncio.create_task(take(f"batch{i}", BATCH)) for i in range(2)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(take("interactive", INTERACTIVE))
+        await asyncio.gather(*batch, interactive)
+        return order
+
+    assert asyncio.run(main()) == ["interactive", "batch0", "batch1"]
+
+
+def test_throttling_halves_the_rate_and_successes_recover_it():
+    scheduler = LLMScheduler(rate=10, burst=5, base_delay=0.001)
+    fn, calls = _failing(429, failures=1)
+
+    assert scheduler.run(fn) == "ok"
+    assert len(calls) == 2
+    assert (scheduler.throttled, scheduler.retries) == (1, 1)
+    # Halved on the 429, then one additive step back up on the success
+    assert scheduler.bucket.rate == pytest.approx(5 + 10 / 20)
+
+    for _ in range(20):
+        scheduler.bucket.on_throttled()
+    assert scheduler.bucket.rate == scheduler.bucket.min_rate
+    for _ in range(40):
+        scheduler.bucket.on_success()
+    assert scheduler.bucket.rate == scheduler.bucket.max_rate
+
+
+def test_deadline_expires_while_queued_for_a_token():
+    bucket = TokenBucket(rate=0.1, burst=1)
+    bucket.acquire()
+
+    started = time.monotonic()
+    with llm_deadline(started + 0.1), pytest.raises(LLMDeadlineExceeded):
+        bucket.acquire()
+    assert time.monotonic() - started < 1
+
+    async def queued():
+        with llm_deadline(time.monotonic() + 0.1):
+            await bucket.aacquire()
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(queued())
+    # Expired waiters leave the queue
+    assert sum(bucket.stats()["queue_depth"].values()) == 0
+
+
+def test_scheduler_does_not_call_the_model_past_the_deadline():
+    scheduler = LLMScheduler(rate=0.1, burst=1)
+    scheduler.bucket.acquire()
+    fn, calls = _failing(503, failures=0)
+
+    with llm_deadline(time.monotonic() + 0.1), pytest.raises(LLMDeadlineExceeded):
+        scheduler.run(fn)
+    assert calls == []
+
+
+def test_gives_up_when_the_backoff_outlasts_the_deadline(monkeypatch):
+    scheduler = LLMScheduler(base_delay=10)
+    monkeypatch.setattr(scheduler._rng, "uniform", lambda low, high: high)
+    fn, calls = _failing(503, failures=1)
+
+    started = time.monotonic()
+    with llm_deadline(started + 1), pytest.raises(StubLLMError):
+        scheduler.run(fn)
+    assert len(calls) == 1
+    assert (scheduler.gave_up, scheduler.retries) == (1, 0)
+    assert time.monotonic() - started < 1
+
+    # Without a deadline the same failure is retried
+    fn, calls = _failing(503, failures=1)
+    monkeypatch.setattr(scheduler._rng, "uniform", lambda low, high: 0.01)
+    assert scheduler.run(fn) == "ok"
+    assert scheduler.retries == 1
@@ -0,0 +1,148 @@
+import random
+
+import pytest
+
+from app.core.segmentation import (
+    HEADER_SECTION,
+    IncrementalSegmenter,
+    build_header_matcher,
+    segment_resume,
+    split_roles,
+)
+from benchmarks.pdf_corpus import resume_lines
+
+ROLE_BULLETS = [
+    "- Built demand forecasting models serving 40 markets across Europe",
+    "- Led the migration of nightly batch pipelines to Spark on Kubernetes",
+    "- Designed KPI dashboards used by operations and finance teams",
+]
+
+# Every role lists its own skills and projects on "Header: content" lines
+RESUME = "\n".join([
+    "Jane Doe",
+    "jane.doe@example.com | +1 555 010 0000",
+    "",
+    "Summary",
+    "Data scientist with eight years of experience in forecasting and analytics.",
+    "",
+    "Experience",
+    "Acme Analytics - Senior Data Scientist, 01/2020 - Present",
+    *ROLE_BULLETS,
+    "Skills: Python, Spark, SQL",
+    "Projects: Demand forecasting platform",
+    "Globex - Data Analyst, 06/2017 - 12/2019",
+    *ROLE_BULLETS,
+    "Skills: SQL, Tableau",
+    "",
+    "Education",
+    "MSc Statistics, TU Munich, 2017",
+    "",
+    "Skills",
+    "Python, SQL, Spark, Tableau",
+])
+
+
+@pytest.mark.parametrize("inline", [False, True])
+def test_inline_headers_inside_experience_stay_with_the_role(inline):
+    sections = segment_resume(RESUME, build_header_matcher(inline=inline))
+
+    assert set(sections) == {HEADER_SECTION, "summary", "experience", "education", "skills"}
+    assert "Globex - Data Analyst" in sections["experience"]
+    assert "Skills: Python, Spark, SQL" in sections["experience"]
+    assert "Projects: Demand forecasting platform" in sections["experience"]
+    assert sections["skills"] == "Python, SQL, Spark, Tableau"
+
+
+def test_inline_header_outside_experience_opens_section():
+    text = RESUME.replace("Skills\nPython, SQL, Spark, Tableau", "Skills: Python, SQL, Spark, Tableau")
+
+    assert segment_resume(text, build_header_matcher(inline=True))["skills"] == "Python, SQL, Spark, Tableau"
+    assert "skills" not in segment_resume(text, build_header_matcher(inline=False))
+
+
+def test_roles_start_only_at_dated_lines_with_a_heading():
+    experience = "\n".join([
+        "Acme Corp",
+        "Senior Engineer, 2021 - Present",
+        "- Led the platform team",
+        "Engineer, 2019 - 2021",
+        "- Built the billing service",
+        "Forecasting platform (2020 - 2021)",
+        "- Shipped demand forecasts",
+        "Globex - Data Analyst, 2017 - 2019",
+        "- Designed KPI dashboards",
+        "Initech",
+        "Data Analyst",
+        "2015 - 2017",
+        "- Reported weekly sales",
+    ])
+
+    roles = split_roles(experience)
+
+    assert [role.split("\n")[0] for role in roles] == ["Acme Corp", "Globex - Data Analyst, 2017 - 2019", "Initech"]
+    assert "Forecasting platform (2020 - 2021)" in roles[0]
+
+
+def test_english_resume_segments_as_before_by_default():
+    # Words that are section headers in other bundled languages
+    text = "\n".join([
+        "Jane Doe", "Profil",
+        "", "Summary", "Pilot turned engineer.", "Formation",
+        "", "Experience", "Acme - Engineer, 2019 - Present", *ROLE_BULLETS, "Studium", "Projekte",
+        "", "Education", "BSc Physics, 2018", "Opleiding",
+        "", "Skills", "Python, SQL", "Kenntnisse",
+    ])
+
+    assert segment_resume(text) == {
+        HEADER_SECTION: "Jane Doe\nProfil",
+        "summary": "Pilot turned engineer.\nFormation",
+        "experience": "\n".join(["Acme - Engineer, 2019 - Present", *ROLE_BULLETS, "Studium", "Projekte"]),
+        "education": "BSc Physics, 2018\nOpleiding",
+        "skills": "Python, SQL\nKenntnisse",
+    }
+    # Other languages are opt-in
+    assert segment_resume(text, build_header_matcher("en,de,fr"))["summary"] == "Pilot turned engineer."
+
+
+def _segment_by_page(pages):
+    """Final sections of an IncrementalSegmenter fed one page at a time, and what closed early."""
+    segmenter = IncrementalSegmenter()
+    closed = {}
+    for page in pages:
+        closed.update(segmenter.feed("\n".join(page)))
+    return segmenter.sections(), closed
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_page_by_page_segmentation_matches_one_shot(seed):
+    rng = random.Random(seed)
+    pages = resume_lines(seed, rng.randint(1, 4), rng, skills_first=seed % 2 == 1)
+    one_shot = segment_resume("\n".join("\n".join(page) for page in pages))
+
+    sections, closed = _segment_by_page(pages)
+
+    assert sections == one_shot
+    # Every section but the last closes early, with its final text
+    assert set(closed) | {list(one_shot)[-1]} == set(one_shot)
+    assert all(closed[name] == one_shot[name] for name in closed)
+
+
+@pytest.mark.parametrize("cut", range(1, RESUME.count("\n") + 1))
+def test_any_page_break_gives_the_one_shot_sections(cut):
+    lines = RESUME.split("\n")
+
+    sections, closed = _segment_by_page([lines[:cut], lines[cut:]])
+
+    assert sections == segment_resume(RESUME)
+    assert all(closed[name] == sections[name] for name in closed)
+
+
+def test_fallback_drops_only_the_header_section():
+    lines = ["Jane Doe", "jane@example.com", "", "Experience", "Acme - Engineer, 2020 - Present", "Skills", "Python"]
+
+    sections, closed = _segment_by_page([lines[:4], lines[4:]])
+
+    # Too little experience: one block, which already holds the header lines
+    assert sections == segment_resume("\n".join(lines))
+    assert HEADER_SECTION not in sections and "Jane Doe" in sections["experience"]
+    assert closed == {HEADER_SECTION: "Jane Doe\njane@example.com", "experience": "Acme - Engineer, 2020 - Present"}
@@ -0,0 +1,56 @@
+import asyncio
+
+from app.core.singleflight import SingleFlight
+
+
+def _work(runs):
+    async def work(value):
+        runs.append(value)
+        await asyncio.sleep(0.05)
+        return value
+    return work
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def main():
+        flights, runs = SingleFlight(), []
+        leader = asyncio.create_task(flights.ado("k", _work(runs), 1))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.ado("k", _work(runs), 1))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == 1
+        assert leader.cancelled()
+        assert runs == [1]
+
+    asyncio.run(main())
+
+
+def test_work_is_cancelled_when_every_caller_is_and_restarts_on_demand():
+    async def main():
+        flights, runs = SingleFlight(), []
+        caller = asyncio.create_task(flights.ado("k", _work(runs), 1))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.01)
+
+        assert flights.stats()["in_flight"] == 0
+        assert await flights.ado("k", _work(runs), 1) == 1
+        assert runs == [1, 1]
+
+    asyncio.run(main())
+
+
+def test_errors_are_shared():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        flights = SingleFlight()
+        results = await asyncio.gather(flights.ado("k", fail), flights.ado("k", fail), return_exceptions=True)
+        assert [type(r) for r in results] == [ValueError, ValueError]
+        assert flights.stats()["executed"] == 1
+
+    asyncio.run(main())
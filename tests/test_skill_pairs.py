@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import time
+
+from app.core.reasoning_models import TransferableSkillInference
+from app.core.stub_llm import StubLLMBackend
+from app.core.transferable import TransferableSkillEngine
+from app.store.skill_pairs import SkillPairStore
+
+
+def test_negative_verdicts_expire_and_are_tied_to_their_version(tmp_path):
+    path = tmp_path / "pairs.sqlite"
+    store = SkillPairStore(path, version="model:prompt")
+    positive = TransferableSkillInference(source_skill="sql", target_skill="dbt", justification="x", confidence=0.7)
+    store.record([("pandas", "spark"), ("sql", "dbt")], [positive])
+
+    assert store.lookup(["pandas", "sql"], ["spark", "dbt"]) == {("pandas", "spark"): None, ("sql", "dbt"): positive}
+    # Another model/prompt, or an expired verdict: the negative is unknown again
+    assert SkillPairStore(path, version="model:other").lookup(["pandas", "sql"], ["spark", "dbt"]) == {("sql", "dbt"): positive}
+    assert SkillPairStore(path, version="model:prompt", negative_ttl=0).lookup(["pandas"], ["spark"]) == {}
+
+
+def test_answer_with_renamed_skills_records_no_negatives():
+    answer = json.dumps([{"source_skill": "ML", "target_skill": "spark", "justification": "x", "confidence": 0.6}])
+    engine = TransferableSkillEngine(llm=StubLLMBackend(rules=[("", answer)]))
+
+    assert engine.pair_store.path == ":memory:"
+    engine.infer(["machine learning", "sql"], ["spark"])
+    assert len(engine.pair_store) == 0
+
+
+def test_ainfer_reaches_the_pair_store_off_the_event_loop():
+    answer = json.dumps([{"source_skill": "sql", "target_skill": "dbt", "justification": "x", "confidence": 0.7}])
+    engine = TransferableSkillEngine(llm=StubLLMBackend(rules=[("", answer)]))
+    threads = []
+    for name in ("lookup", "record"):
+        method = getattr(engine.pair_store, name)
+        def spy(*args, _method=method, **kwargs):
+            threads.append(threading.current_thread())
+            return _method(*args, **kwargs)
+        setattr(engine.pair_store, name, spy)
+
+    assert [inf.target_skill for inf in asyncio.run(engine.ainfer(["sql"], ["dbt"]))] == ["dbt"]
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+
+def test_answers_about_known_pairs_in_the_prompt_still_complete_the_verdict():
+    store = SkillPairStore()
+    store.record([("sql", "dbt")], [TransferableSkillInference(source_skill="sql", target_skill="dbt", justification="x", confidence=0.7)])
+    # The prompt lists sql and dbt, so the model may answer the known pair too
+    answer = json.dumps([
+        {"source_skill": "sql", "target_skill": "dbt", "justification": "x", "confidence": 0.7},
+        {"source_skill": "pandas", "target_skill": "spark", "justification": "y", "confidence": 0.6},
+    ])
+    llm = StubLLMBackend(rules=[("", answer)])
+    engine = TransferableSkillEngine(llm=llm, pair_store=store)
+
+    first = engine.infer(["sql", "pandas"], ["dbt", "spark"])
+    assert [(inf.source_skill, inf.target_skill) for inf in first] == [("pandas", "spark"), ("sql", "dbt")]
+    # Negatives for the unseen pairs are recorded and the result memoized
+    assert store.lookup(["sql", "pandas"], ["dbt", "spark"])[("pandas", "dbt")] is None
+    assert len(store) == 4
+    assert engine.infer(["sql", "pandas"], ["dbt", "spark"]) == first
+    assert llm.calls == 1
+
+
+def test_results_keep_the_callers_spelling_on_hits_and_misses():
+    answer = json.dumps([{"source_skill": "sql", "target_skill": "DBT", "justification": "x", "confidence": 0.7}])
+    store = SkillPairStore()
+    engine = TransferableSkillEngine(llm=StubLLMBackend(rules=[("", answer)]), pair_store=store)
+
+    def names(inferences):
+        return [(inf.source_skill, inf.target_skill) for inf in inferences]
+
+    assert names(engine.infer(["SQL"], ["dbt"])) == [("SQL", "dbt")]
+    # Memo hit, and a pair-store hit (stored lowercased) in a fresh engine
+    assert names(engine.infer(["sql"], ["Dbt"])) == [("sql", "Dbt")]
+    fresh = TransferableSkillEngine(llm=StubLLMBackend(rules=[("", "[]")]), pair_store=store)
+    assert names(asyncio.run(fresh.ainfer(["SQL"], ["dbt"]))) == [("SQL", "dbt")]
+    assert fresh.llm.calls == 0
+
+
+def test_skill_sets_differing_in_order_or_case_share_one_memo_entry():
+    engine = TransferableSkillEngine(llm=StubLLMBackend(rules=[("", "[]")]), pair_store=SkillPairStore())
+
+    engine.infer(["SQL", "pandas", "sql"], ["Spark", "dbt"])
+    engine.infer([" pandas", "Sql"], ["DBT", "spark", "dbt"])
+    asyncio.run(engine.ainfer(["PANDAS", "sql"], ["dbt", "Spark"]))
+
+    assert len(engine.cache) == 1
+    assert engine.llm.calls == 1
+
+
+def test_memoized_results_expire_with_negative_verdicts():
+    store = SkillPairStore(negative_ttl=0.05)
+    engine = TransferableSkillEngine(llm=StubLLMBackend(rules=[("", "[]")]), pair_store=store)
+
+    engine.infer(["sql"], ["spark"])
+    engine.infer(["sql"], ["spark"])
+    assert engine.llm.calls == 1
+
+    time.sleep(0.06)
+    # The negative verdict is stale: the pair is asked again, not served from the memo
+    engine.infer(["sql"], ["spark"])
+    assert engine.llm.calls == 2
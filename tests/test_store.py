@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from app.core.models import JobRequirement, ProfessionalProfile, Skill
+from app.store.base import Store
+from app.store.memory import InMemoryStore
+
+SKILLS = ["python", "sql", "spark", "tableau", "airflow", "docker"]
+JOB = JobRequirement(
+    job_id="j1", title="Data Engineer", required_skills=["python", "sql"],
+    preferred_skills=["spark"], min_experience_years=None, domain=None,
+)
+
+
+def _profile(i: int, skills) -> ProfessionalProfile:
+    return ProfessionalProfile(
+        candidate_id=f"c{i}", title=None, total_experience_years=3,
+        skills=[Skill(name=s) for s in skills], experiences=[],
+    )
+
+
+def test_backends_must_implement_every_primitive():
+    with pytest.raises(TypeError):
+        Store()
+
+    class Partial(Store):
+        def get_profile(self, candidate_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_rank_never_sees_a_half_synced_matrix():
+    store = InMemoryStore()
+    store.save_profiles(_profile(i, SKILLS) for i in range(200))
+    stop = threading.Event()
+
+    def rewrite():
+        # Overwrites leave dead rows behind, so the matrix keeps compacting
+        n = 0
+        while not stop.is_set():
+            n += 1
+            store.save_profiles(_profile(i, SKILLS[n % 3:]) for i in range(200))
+            store.sync()
+
+    writer = threading.Thread(target=rewrite)
+    writer.start()
+    try:
+        for _ in range(200):
+            total, ranked = store.rank(JOB)
+            assert total == len(ranked) == 200
+            assert len({profile.candidate_id for _, profile in ranked}) == 200
+            assert store.search_candidates(any_of=["docker"]) == {f"c{i}" for i in range(200)}
+    finally:
+        stop.set()
+        writer.join()